@@ -1,7 +1,10 @@
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 from datetime import datetime
+from collections import deque
 import networkx as nx
 from dataclasses import dataclass
+from .impact_index import ImpactIndex
+from .graph_snapshot import DependencyGraphSnapshot
 
 
 @dataclass
@@ -18,9 +21,13 @@ class Dependency:
 class DependencyAnalyzer:
     """Analyzes API dependencies and their impact on monitoring."""
 
-    def __init__(self):
+    def __init__(self, history_size: int = 100):
         self.dependency_graph = nx.DiGraph()
-        self.dependency_history: Dict[str, List[Dependency]] = {}
+        self.history_size = history_size
+        self.dependency_history: Dict[str, Deque[Dependency]] = {}
+        self.impact_index = ImpactIndex()
+        self._graph_version = 0
+        self._snapshot: Optional[DependencyGraphSnapshot] = None
 
     def add_dependency(self, dependency: Dependency) -> None:
         """Add or update a dependency in the graph."""
@@ -32,48 +39,56 @@ class DependencyAnalyzer:
             error_rate=dependency.error_rate,
             last_updated=dependency.last_updated
         )
+        self.impact_index.add_edge(
+            dependency.source,
+            dependency.target,
+            dependency.criticality
+        )
 
-        # Store in history
+        # Invalidate the read snapshot
+        self._graph_version += 1
+
+        # Store in history, collapsing updates that carry no new values
         key = f"{dependency.source}_{dependency.target}"
         if key not in self.dependency_history:
-            self.dependency_history[key] = []
-        self.dependency_history[key].append(dependency)
+            self.dependency_history[key] = deque(maxlen=self.history_size)
+
+        history = self.dependency_history[key]
+        if history and self._same_values(history[-1], dependency):
+            history[-1] = dependency
+        else:
+            history.append(dependency)
+
+    def get_snapshot(self) -> DependencyGraphSnapshot:
+        """Get an immutable array-backed snapshot of the current graph.
+
+        The snapshot is rebuilt lazily after the graph changes; previously
+        returned snapshots stay valid for the readers holding them.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.version != self._graph_version:
+            snapshot = DependencyGraphSnapshot.from_graph(
+                self.dependency_graph,
+                self._graph_version
+            )
+            self._snapshot = snapshot
+        return snapshot
 
     def get_critical_path(self, api_name: str) -> List[str]:
         """Find the most critical dependency path for an API."""
-        try:
-            paths = nx.all_simple_paths(self.dependency_graph, api_name, None)
-            critical_path = max(
-                paths,
-                key=lambda path: self._calculate_path_criticality(path)
-            )
-            return critical_path
-        except (nx.NetworkXNoPath, ValueError):
-            return [api_name]
+        return self.get_snapshot().get_critical_path(api_name)
 
     def get_impact_score(self, api_name: str) -> float:
         """Calculate the overall impact score for an API."""
-        if api_name not in self.dependency_graph:
-            return 0.0
-
-        dependencies = list(self.dependency_graph.edges(api_name, data=True))
-        if not dependencies:
-            return 0.0
-
-        # Calculate weighted impact
-        total_impact = sum(
-            self._calculate_dependency_impact(data)
-            for _, _, data in dependencies
-        )
+        return self.get_snapshot().get_impact_score(api_name)
 
-        return min(total_impact / len(dependencies), 1.0)
+    def get_dependencies(self, api_name: str) -> List[Dict]:
+        """Get the direct dependencies of an API."""
+        return self.get_snapshot().get_dependencies(api_name)
 
     def get_dependent_apis(self, api_name: str) -> List[str]:
         """Get list of APIs that depend on the specified API."""
-        try:
-            return list(nx.ancestors(self.dependency_graph, api_name))
-        except nx.NetworkXError:
-            return []
+        return list(self.impact_index.get_dependents(api_name))
 
     def analyze_cascading_impact(
             self,
@@ -81,20 +96,23 @@ class DependencyAnalyzer:
             threshold: float = 0.5
     ) -> Dict[str, float]:
         """Analyze potential cascading impact of API issues."""
-        impact_map = {}
-        dependents = self.get_dependent_apis(api_name)
+        return {
+            dependent: impact
+            for dependent, impact in self.impact_index.get_cascading_impacts(api_name).items()
+            if impact >= threshold
+        }
 
-        for dependent in dependents:
-            impact = self._calculate_cascading_impact(api_name, dependent)
-            if impact >= threshold:
-                impact_map[dependent] = impact
-
-        return impact_map
+    def analyze_all_cascading_impacts(
+            self,
+            threshold: float = 0.5
+    ) -> Dict[str, Dict[str, float]]:
+        """Analyze cascading impact of every API at once, e.g. for dashboards."""
+        return self.impact_index.get_impact_matrix(threshold)
 
     def get_health_impact_factor(self, api_name: str) -> float:
         """Calculate health impact factor for monitoring."""
         impact_score = self.get_impact_score(api_name)
-        dependent_count = len(self.get_dependent_apis(api_name))
+        dependent_count = self.impact_index.get_dependent_count(api_name)
 
         # Consider both direct impact and number of dependents
         return min(
@@ -102,53 +120,19 @@ class DependencyAnalyzer:
             1.0
         )
 
-    def _calculate_dependency_impact(self, dependency_data: Dict) -> float:
-        """Calculate impact score for a single dependency."""
+    @staticmethod
+    def _same_values(previous: Dependency, current: Dependency) -> bool:
+        """Check whether a dependency update repeats the previous values."""
         return (
-                dependency_data['criticality'] * 0.4 +
-                min(dependency_data['latency_impact'] / 1000, 1.0) * 0.3 +
-                dependency_data['error_rate'] * 0.3
+                previous.criticality == current.criticality and
+                previous.latency_impact == current.latency_impact and
+                previous.error_rate == current.error_rate
         )
 
-    def _calculate_path_criticality(self, path: List[str]) -> float:
-        """Calculate the criticality of a dependency path."""
-        if len(path) < 2:
-            return 0.0
-
-        total_criticality = 0.0
-        for i in range(len(path) - 1):
-            edge_data = self.dependency_graph.get_edge_data(
-                path[i],
-                path[i + 1]
-            )
-            if edge_data:
-                total_criticality += edge_data['criticality']
-
-        return total_criticality / (len(path) - 1)
-
     def _calculate_cascading_impact(
             self,
             source: str,
             target: str
     ) -> float:
-        """Calculate cascading impact between two APIs."""
-        try:
-            path = nx.shortest_path(
-                self.dependency_graph,
-                source=source,
-                target=target,
-                weight='criticality'
-            )
-
-            impact = 1.0
-            for i in range(len(path) - 1):
-                edge_data = self.dependency_graph.get_edge_data(
-                    path[i],
-                    path[i + 1]
-                )
-                if edge_data:
-                    impact *= (1 - edge_data['criticality'])
-
-            return 1 - impact
-        except nx.NetworkXNoPath:
-            return 0.0
\ No newline at end of file
+        """Calculate cascading impact of a source failure on a dependent API."""
+        return self.impact_index.get_impact(source, target)
@@ -0,0 +1,195 @@
+# analysis/context/graph_snapshot.py
+
+from typing import Dict, List, Mapping
+from types import MappingProxyType
+from dataclasses import dataclass
+import numpy as np
+import networkx as nx
+
+# Weights of a single dependency's impact score
+CRITICALITY_WEIGHT = 0.4
+LATENCY_WEIGHT = 0.3
+ERROR_RATE_WEIGHT = 0.3
+LATENCY_SCALE_MS = 1000.0
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True)
+class DependencyGraphSnapshot:
+    """Immutable compressed sparse row view of the dependency graph.
+
+    Row `i` holds the dependencies of API `i` in
+    `indices[indptr[i]:indptr[i + 1]]`, with edge attributes stored in
+    parallel arrays. `dependent_indptr`/`dependent_indices` are the same
+    edges reversed, listing the APIs that depend on each API. Snapshots
+    are never mutated; the analyzer builds a new one when the graph
+    changes, so readers can hold on to theirs.
+    """
+    version: int
+    node_names: tuple
+    node_ids: Mapping[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    criticality: np.ndarray
+    latency_impact: np.ndarray
+    error_rate: np.ndarray
+    last_updated: np.ndarray
+    impact_scores: np.ndarray
+    dependent_indptr: np.ndarray
+    dependent_indices: np.ndarray
+
+    @classmethod
+    def from_graph(cls, graph: nx.DiGraph, version: int) -> 'DependencyGraphSnapshot':
+        """Build a snapshot from the mutable dependency graph."""
+        node_names = tuple(graph.nodes)
+        node_ids = {name: i for i, name in enumerate(node_names)}
+        edge_count = graph.number_of_edges()
+
+        indptr = np.zeros(len(node_names) + 1, dtype=np.int64)
+        indices = np.empty(edge_count, dtype=np.int32)
+        criticality = np.empty(edge_count, dtype=np.float32)
+        latency_impact = np.empty(edge_count, dtype=np.float32)
+        error_rate = np.empty(edge_count, dtype=np.float32)
+        last_updated = np.empty(edge_count, dtype='datetime64[us]')
+
+        position = 0
+        for i, (_, targets) in enumerate(graph.adjacency()):
+            for target, data in targets.items():
+                indices[position] = node_ids[target]
+                criticality[position] = data['criticality']
+                latency_impact[position] = data['latency_impact']
+                error_rate[position] = data['error_rate']
+                last_updated[position] = data['last_updated']
+                position += 1
+            indptr[i + 1] = position
+
+        # Reverse edges: sources grouped by target
+        sources = np.repeat(np.arange(len(node_names), dtype=np.int32), np.diff(indptr))
+        order = np.argsort(indices, kind='stable')
+        dependent_indptr = np.zeros(len(node_names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=len(node_names)), out=dependent_indptr[1:])
+
+        return cls(
+            version=version,
+            node_names=node_names,
+            node_ids=MappingProxyType(node_ids),
+            indptr=_readonly(indptr),
+            indices=_readonly(indices),
+            criticality=_readonly(criticality),
+            latency_impact=_readonly(latency_impact),
+            error_rate=_readonly(error_rate),
+            last_updated=_readonly(last_updated),
+            impact_scores=_readonly(
+                cls._score_nodes(indptr, criticality, latency_impact, error_rate)
+            ),
+            dependent_indptr=_readonly(dependent_indptr),
+            dependent_indices=_readonly(sources[order])
+        )
+
+    @staticmethod
+    def _score_nodes(
+            indptr: np.ndarray,
+            criticality: np.ndarray,
+            latency_impact: np.ndarray,
+            error_rate: np.ndarray
+    ) -> np.ndarray:
+        """Calculate the impact score of every API in one vectorized pass."""
+        edge_impact = (
+                criticality * CRITICALITY_WEIGHT +
+                np.minimum(latency_impact / LATENCY_SCALE_MS, 1.0) * LATENCY_WEIGHT +
+                error_rate * ERROR_RATE_WEIGHT
+        )
+        degrees = np.diff(indptr)
+        rows = np.repeat(np.arange(len(degrees)), degrees)
+        totals = np.bincount(rows, weights=edge_impact, minlength=len(degrees))
+
+        scores = np.zeros(len(degrees), dtype=np.float64)
+        has_edges = degrees > 0
+        scores[has_edges] = totals[has_edges] / degrees[has_edges]
+        return np.minimum(scores, 1.0)
+
+    def get_impact_score(self, api_name: str) -> float:
+        """Get the overall impact score for an API."""
+        node = self.node_ids.get(api_name)
+        if node is None:
+            return 0.0
+        return float(self.impact_scores[node])
+
+    def get_dependencies(self, api_name: str) -> List[Dict]:
+        """Get the direct dependencies of an API with their attributes."""
+        node = self.node_ids.get(api_name)
+        if node is None:
+            return []
+
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return [
+            {
+                'source': api_name,
+                'target': self.node_names[target],
+                'criticality': float(self.criticality[edge]),
+                'latency_impact': float(self.latency_impact[edge]),
+                'error_rate': float(self.error_rate[edge]),
+                'last_updated': self.last_updated[edge].item()
+            }
+            for edge, target in zip(range(start, end), self.indices[start:end])
+        ]
+
+    def get_dependent_apis(self, api_name: str) -> List[str]:
+        """Get all APIs that directly or transitively depend on an API."""
+        node = self.node_ids.get(api_name)
+        if node is None:
+            return []
+
+        indptr = self.dependent_indptr
+        seen = {node}
+        frontier = [node]
+        while frontier:
+            current = frontier.pop()
+            for source in self.dependent_indices[indptr[current]:indptr[current + 1]].tolist():
+                if source not in seen:
+                    seen.add(source)
+                    frontier.append(source)
+        seen.discard(node)
+        return [self.node_names[i] for i in sorted(seen)]
+
+    def get_critical_path(self, api_name: str) -> List[str]:
+        """Find the simple dependency path with the highest mean criticality."""
+        node = self.node_ids.get(api_name)
+        if node is None:
+            return [api_name]
+
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        criticality = self.criticality.tolist()
+
+        best_path, best_score = [node], -1.0
+        path, on_path = [node], {node}
+        # Each frame holds the next edge position to explore and the path criticality sum
+        stack = [(indptr[node], 0.0)]
+
+        while stack:
+            edge, total = stack[-1]
+            current = path[-1]
+            if edge >= indptr[current + 1]:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+
+            stack[-1] = (edge + 1, total)
+            target = indices[edge]
+            if target in on_path:
+                continue
+
+            path_total = total + criticality[edge]
+            path.append(target)
+            on_path.add(target)
+            score = path_total / (len(path) - 1)
+            if score > best_score:
+                best_path, best_score = list(path), score
+            stack.append((indptr[target], path_total))
+
+        return [self.node_names[i] for i in best_path]
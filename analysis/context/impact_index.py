@@ -0,0 +1,156 @@
+# analysis/context/impact_index.py
+
+from typing import Dict, Iterator, List
+import heapq
+
+
+class ImpactIndex:
+    """Precomputed reverse reachability and cascading impact for API dependencies.
+
+    Transitive dependents of every API are stored as integer bitsets and
+    updated incrementally when an edge is added. Cascading impacts of a
+    failing API are computed for all of its dependents in one traversal
+    and cached until an edge that can reach that API changes.
+    """
+
+    def __init__(self):
+        self.node_ids: Dict[str, int] = {}
+        self.node_names: List[str] = []
+        self._ancestors: List[int] = []  # bitset of APIs depending on node
+        self._descendants: List[int] = []  # bitset of APIs node depends on
+        self._dependents_of: List[Dict[int, float]] = []  # target -> {source: criticality}
+        self._dependent_lists: Dict[int, List[str]] = {}
+        self._dependent_counts: Dict[int, int] = {}
+        self._impact_cache: Dict[int, Dict[str, float]] = {}
+
+    def __contains__(self, api_name: str) -> bool:
+        return api_name in self.node_ids
+
+    def add_edge(self, source: str, target: str, criticality: float) -> None:
+        """Add or update the edge `source` -> `target` (source depends on target)."""
+        u = self._intern(source)
+        v = self._intern(target)
+        self._dependents_of[v][u] = criticality
+
+        new_ancestors = self._ancestors[u] | (1 << u)
+        new_descendants = self._descendants[v] | (1 << v)
+
+        # Everything reachable from the target gains the source and its dependents
+        for node in self._iter_bits(new_descendants):
+            merged = self._ancestors[node] | new_ancestors
+            if merged != self._ancestors[node]:
+                self._ancestors[node] = merged
+                self._dependent_lists.pop(node, None)
+                self._dependent_counts.pop(node, None)
+
+        for node in self._iter_bits(new_ancestors):
+            self._descendants[node] |= new_descendants
+
+        # Propagated impacts can only change for APIs the target reaches
+        for node in self._iter_bits(new_descendants):
+            self._impact_cache.pop(node, None)
+
+    def get_dependents(self, api_name: str) -> List[str]:
+        """Get all APIs that directly or transitively depend on an API."""
+        node = self.node_ids.get(api_name)
+        if node is None:
+            return []
+
+        dependents = self._dependent_lists.get(node)
+        if dependents is None:
+            mask = self._ancestors[node] & ~(1 << node)
+            dependents = [self.node_names[i] for i in self._iter_bits(mask)]
+            self._dependent_lists[node] = dependents
+        return dependents
+
+    def get_dependent_count(self, api_name: str) -> int:
+        """Get the number of transitive dependents of an API."""
+        node = self.node_ids.get(api_name)
+        if node is None:
+            return 0
+
+        count = self._dependent_counts.get(node)
+        if count is None:
+            count = bin(self._ancestors[node] & ~(1 << node)).count('1')
+            self._dependent_counts[node] = count
+        return count
+
+    def get_cascading_impacts(self, api_name: str) -> Dict[str, float]:
+        """Get propagated impact of an API failure on each of its dependents."""
+        node = self.node_ids.get(api_name)
+        if node is None:
+            return {}
+
+        impacts = self._impact_cache.get(node)
+        if impacts is None:
+            impacts = self._propagate_impact(node)
+            self._impact_cache[node] = impacts
+        return impacts
+
+    def get_impact(self, source: str, dependent: str) -> float:
+        """Get propagated impact of a `source` failure on `dependent`."""
+        return self.get_cascading_impacts(source).get(dependent, 0.0)
+
+    def get_impact_matrix(self, threshold: float = 0.0) -> Dict[str, Dict[str, float]]:
+        """Get cascading impacts of every API on its dependents."""
+        matrix = {}
+        for api_name in self.node_names:
+            impacts = {
+                dependent: impact
+                for dependent, impact in self.get_cascading_impacts(api_name).items()
+                if impact >= threshold
+            }
+            if impacts:
+                matrix[api_name] = impacts
+        return matrix
+
+    def _propagate_impact(self, source: int) -> Dict[str, float]:
+        """Compute impacts on all dependents with one traversal of reverse edges.
+
+        Follows the least-criticality path to every dependent, as the
+        per-pair shortest path did, and accumulates the product of
+        `1 - criticality` along it.
+        """
+        distances = {source: 0.0}
+        survival = {source: 1.0}
+        visited = set()
+        heap = [(0.0, source)]
+
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in visited:
+                continue
+            visited.add(node)
+
+            for dependent, criticality in self._dependents_of[node].items():
+                candidate = distance + criticality
+                if dependent not in distances or candidate < distances[dependent]:
+                    distances[dependent] = candidate
+                    survival[dependent] = survival[node] * (1 - criticality)
+                    heapq.heappush(heap, (candidate, dependent))
+
+        return {
+            self.node_names[node]: 1 - remaining
+            for node, remaining in survival.items()
+            if node != source
+        }
+
+    def _intern(self, api_name: str) -> int:
+        """Get the integer id of an API, registering it if needed."""
+        node = self.node_ids.get(api_name)
+        if node is None:
+            node = len(self.node_names)
+            self.node_ids[api_name] = node
+            self.node_names.append(api_name)
+            self._ancestors.append(0)
+            self._descendants.append(0)
+            self._dependents_of.append({})
+        return node
+
+    @staticmethod
+    def _iter_bits(mask: int) -> Iterator[int]:
+        """Iterate over the positions of set bits in a bitset."""
+        while mask:
+            lowest = mask & -mask
+            yield lowest.bit_length() - 1
+            mask ^= lowest
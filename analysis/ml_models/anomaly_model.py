@@ -1,5 +1,7 @@
 import pandas as pd
 from datetime import datetime, timedelta
+from core.utils.frames import ColumnarBuffer, frame_datetimes
+from core.utils.tracing import tracer
 
 class AnomalyDetectionSystem:
     def __init__(self):
@@ -11,34 +13,37 @@ class AnomalyDetectionSystem:
         """Process new metric data point"""
         # Store feature
         if metric_name not in self.feature_store:
-            self.feature_store[metric_name] = []
-        self.feature_store[metric_name].append({
-            'timestamp': timestamp,
-            'value': value
-        })
+            self.feature_store[metric_name] = ColumnarBuffer()
+        self.feature_store[metric_name].append(timestamp, value)
 
         # Generate predictions and detect anomalies
         self.analyze_metric(metric_name)
 
+    @tracer.traced('anomaly.analyze_metric')
     def analyze_metric(self, metric_name: str):
         """Analyze metric using multiple models"""
-        data = pd.DataFrame(self.feature_store[metric_name])
+        with tracer.span('anomaly.build_frame'):
+            data = self.feature_store[metric_name].frame()
 
         # Prophet Analysis
-        prophet_prediction = self._prophet_forecast(data)
+        with tracer.span('anomaly.prophet'):
+            prophet_prediction = self._prophet_forecast(data)
 
         # Isolation Forest Analysis
-        isolation_forest_prediction = self._isolation_forest_detect(data)
+        with tracer.span('anomaly.isolation_forest'):
+            isolation_forest_prediction = self._isolation_forest_detect(data)
 
         # LSTM Analysis
-        lstm_prediction = self._lstm_predict(data)
+        with tracer.span('anomaly.lstm'):
+            lstm_prediction = self._lstm_predict(data)
 
         # Ensemble results
-        anomaly_score = self._ensemble_predictions(
-            prophet_prediction,
-            isolation_forest_prediction,
-            lstm_prediction
-        )
+        with tracer.span('anomaly.ensemble'):
+            anomaly_score = self._ensemble_predictions(
+                prophet_prediction,
+                isolation_forest_prediction,
+                lstm_prediction
+            )
 
         return anomaly_score
 
@@ -47,9 +52,9 @@ class AnomalyDetectionSystem:
         model = self.orchestrator.registry.models['prophet']['instance']
 
         # Prepare data for Prophet
-        prophet_data = data.rename(columns={
-            'timestamp': 'ds',
-            'value': 'y'
+        prophet_data = pd.DataFrame({
+            'ds': frame_datetimes(data),
+            'y': data['value']
         })
 
         # Fit and predict
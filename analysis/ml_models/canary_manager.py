@@ -286,11 +286,16 @@ class CanaryDeployment:
         }
 
         try:
-            with open(history_file, 'w') as f:
-                json.dump(history, f, indent=2)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write_history, history_file, history)
         except Exception as e:
             self.logger.error(f"Failed to save deployment history: {str(e)}")
 
+    @staticmethod
+    def _write_history(history_file: str, history: Dict):
+        with open(history_file, 'w') as f:
+            json.dump(history, f, indent=2)
+
     def get_deployment_status(self) -> Dict:
         """Get current deployment status."""
         return {
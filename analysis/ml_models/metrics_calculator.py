@@ -1,9 +1,11 @@
 # analysis/ml_models/metrics_calculator.py
 
-from typing import Dict, List
+from typing import Dict, Sequence, Union
 import numpy as np
-from scipy import stats
-from datetime import datetime, timedelta
+from .seasonality_analyzer import TimestampsLike, to_epoch_seconds
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+SECONDS_PER_HOUR = 3600
 
 
 class ValidationMetricsCalculator:
@@ -14,57 +16,119 @@ class ValidationMetricsCalculator:
 
     def calculate_validation_metrics(
             self,
-            predictions: List[float],
-            actuals: List[float],
-            timestamps: List[datetime]
+            predictions: ArrayLike,
+            actuals: ArrayLike,
+            timestamps: TimestampsLike
     ) -> Dict:
         """Calculate comprehensive validation metrics."""
+        predictions = np.asarray(predictions, dtype=np.float64)
+        actuals = np.asarray(actuals, dtype=np.float64)
+        true_positive, false_positive, false_negative = self._confusion_counts(
+            predictions, actuals
+        )
+
         return {
             'accuracy': self._calculate_accuracy(predictions, actuals),
-            'precision': self._calculate_precision(predictions, actuals),
-            'recall': self._calculate_recall(predictions, actuals),
+            'precision': self._calculate_precision(true_positive, false_positive),
+            'recall': self._calculate_recall(true_positive, false_negative),
+            **self._calculate_errors(predictions, actuals),
             'stability': self._calculate_stability(predictions, timestamps),
             'drift': self._calculate_drift(predictions, actuals),
             'confidence': self._calculate_confidence(predictions)
         }
 
-    def _calculate_accuracy(self, predictions: List[float],
-                            actuals: List[float]) -> float:
+    def _calculate_accuracy(self, predictions: np.ndarray,
+                            actuals: np.ndarray) -> float:
         """Calculate prediction accuracy."""
-        correct = sum(1 for p, a in zip(predictions, actuals)
-                      if abs(p - a) <= self.config['max_deviation'])
-        return correct / len(predictions) if predictions else 0
-
-    def _calculate_stability(self, predictions: List[float],
-                             timestamps: List[datetime]) -> float:
-        """Calculate prediction stability over time."""
-        if len(predictions) < 2:
+        if predictions.size == 0:
             return 0.0
+        within = np.abs(predictions - actuals) <= self.config['max_deviation']
+        return float(np.count_nonzero(within) / predictions.size)
+
+    def _confusion_counts(self, predictions: np.ndarray,
+                          actuals: np.ndarray) -> tuple:
+        """Count true positives, false positives and false negatives."""
+        threshold = self.config.get('positive_threshold', 0.5)
+        predicted = predictions >= threshold
+        actual = actuals >= threshold
+
+        true_positive = int(np.count_nonzero(predicted & actual))
+        false_positive = int(np.count_nonzero(predicted)) - true_positive
+        false_negative = int(np.count_nonzero(actual)) - true_positive
+        return true_positive, false_positive, false_negative
 
-        # Calculate variation over time windows
-        window_size = timedelta(hours=1)
-        windows = self._group_by_window(predictions, timestamps, window_size)
+    def _calculate_precision(self, true_positive: int,
+                             false_positive: int) -> float:
+        """Calculate precision from confusion counts."""
+        predicted_positive = true_positive + false_positive
+        return true_positive / predicted_positive if predicted_positive else 0.0
 
-        variations = []
-        for window_predictions in windows.values():
-            if len(window_predictions) >= 2:
-                variations.append(np.std(window_predictions))
+    def _calculate_recall(self, true_positive: int,
+                          false_negative: int) -> float:
+        """Calculate recall from confusion counts."""
+        actual_positive = true_positive + false_negative
+        return true_positive / actual_positive if actual_positive else 0.0
 
-        return 1.0 - (np.mean(variations) if variations else 0.0)
+    def _calculate_errors(self, predictions: np.ndarray,
+                          actuals: np.ndarray) -> Dict[str, float]:
+        """Calculate MAPE (in percent), RMSE and MAE."""
+        if predictions.size == 0:
+            return {'mape': 0.0, 'rmse': 0.0, 'mae': 0.0}
 
-    def _calculate_drift(self, predictions: List[float],
-                         actuals: List[float]) -> float:
+        errors = predictions - actuals
+        absolute_errors = np.abs(errors)
+
+        # Zero actuals have no defined percentage error
+        nonzero = actuals != 0
+        mape = (
+            float(np.mean(absolute_errors[nonzero] / np.abs(actuals[nonzero])) * 100)
+            if nonzero.any() else 0.0
+        )
+
+        return {
+            'mape': mape,
+            'rmse': float(np.sqrt(np.mean(errors * errors))),
+            'mae': float(np.mean(absolute_errors))
+        }
+
+    def _calculate_stability(self, predictions: np.ndarray,
+                             timestamps: TimestampsLike) -> float:
+        """Calculate prediction stability over hourly windows."""
+        if predictions.size < 2:
+            return 0.0
+
+        # Map each timestamp to a dense hourly bucket id
+        hours = to_epoch_seconds(timestamps) // SECONDS_PER_HOUR
+        _, bucket_ids = np.unique(hours, return_inverse=True)
+
+        counts = np.bincount(bucket_ids)
+        means = np.bincount(bucket_ids, weights=predictions) / counts
+        deviations = predictions - means[bucket_ids]
+        variances = np.bincount(bucket_ids, weights=deviations * deviations) / counts
+
+        populated = counts >= 2
+        if not populated.any():
+            return 1.0
+        return float(1.0 - np.mean(np.sqrt(variances[populated])))
+
+    def _calculate_drift(self, predictions: np.ndarray,
+                         actuals: np.ndarray) -> float:
         """Calculate concept drift between predictions and actuals."""
-        if len(predictions) < self.config['min_samples']:
+        if predictions.size < self.config['min_samples'] or actuals.size == 0:
             return 0.0
 
-        # Use Kolmogorov-Smirnov test to detect distribution drift
-        ks_statistic, p_value = stats.ks_2samp(predictions, actuals)
-        return ks_statistic
+        # Two-sample Kolmogorov-Smirnov statistic from the sorted samples
+        sorted_predictions = np.sort(predictions)
+        sorted_actuals = np.sort(actuals)
+        points = np.concatenate([sorted_predictions, sorted_actuals])
+
+        cdf_predictions = np.searchsorted(sorted_predictions, points, side='right') / sorted_predictions.size
+        cdf_actuals = np.searchsorted(sorted_actuals, points, side='right') / sorted_actuals.size
+        return float(np.max(np.abs(cdf_predictions - cdf_actuals)))
 
-    def _calculate_confidence(self, predictions: List[float]) -> float:
+    def _calculate_confidence(self, predictions: np.ndarray) -> float:
         """Calculate prediction confidence scores."""
-        if not predictions:
+        if predictions.size == 0:
             return 0.0
 
         # Calculate confidence based on prediction variance
@@ -72,19 +136,5 @@ class ValidationMetricsCalculator:
         prediction_mean = np.mean(predictions)
 
         # Normalize confidence score
-        return 1.0 - min(prediction_std / prediction_mean
-                         if prediction_mean != 0 else 1.0, 1.0)
-
-    def _group_by_window(self, values: List[float],
-                         timestamps: List[datetime],
-                         window_size: timedelta) -> Dict:
-        """Group values by time windows."""
-        windows = {}
-        for value, timestamp in zip(values, timestamps):
-            window_start = timestamp.replace(
-                minute=0, second=0, microsecond=0
-            )
-            if window_start not in windows:
-                windows[window_start] = []
-            windows[window_start].append(value)
-        return windows
\ No newline at end of file
+        return float(1.0 - min(prediction_std / prediction_mean
+                               if prediction_mean != 0 else 1.0, 1.0))
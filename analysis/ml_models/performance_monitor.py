@@ -1,20 +1,45 @@
+from typing import Dict, List, Optional
 from .registry import ModelRegistry
-import numpy as np
+from .performance_tracker import PerformanceTracker
 
 
 class ModelPerformanceMonitor:
-    def __init__(self, model_registry: ModelRegistry):
+    def __init__(self, model_registry: ModelRegistry,
+                 config: Optional[Dict] = None,
+                 state_file: Optional[str] = None):
         self.registry = model_registry
-        self.performance_history = {}
+        self.tracker = PerformanceTracker(config, state_file)
+        self.retraining_queue: List[str] = []
 
     def update_model_performance(self, model_name: str, actual: float, predicted: float):
-        error = abs(actual - predicted) / actual
+        error = self.tracker.update(model_name, actual, predicted)
         self.registry.update_performance(model_name, error)
 
         if self._should_retrain(model_name):
             self._trigger_model_retraining(model_name)
 
+        self.tracker.maybe_persist()
+
     def _should_retrain(self, model_name: str) -> bool:
-        recent_performance = self.registry.model_performance[model_name][-10:]
-        avg_error = np.mean(recent_performance)
-        return avg_error > 0.2
\ No newline at end of file
+        return self.tracker.should_retrain(model_name)
+
+    def _trigger_model_retraining(self, model_name: str):
+        """Queue a model for retraining and debounce further triggers."""
+        self.tracker.mark_retraining(model_name)
+        # A retrain that timed out is triggered again while still queued
+        if model_name not in self.retraining_queue:
+            self.retraining_queue.append(model_name)
+
+    def complete_model_retraining(self, model_name: str):
+        """Record that a queued model has been retrained."""
+        self.tracker.mark_retrained(model_name)
+        self._dequeue(model_name)
+
+    def fail_model_retraining(self, model_name: str):
+        """Record that a queued model failed to retrain, so it can be retried."""
+        self.tracker.mark_retrain_failed(model_name)
+        self._dequeue(model_name)
+
+    def _dequeue(self, model_name: str):
+        if model_name in self.retraining_queue:
+            self.retraining_queue.remove(model_name)
@@ -0,0 +1,305 @@
+# analysis/ml_models/performance_tracker.py
+
+from typing import Dict, Optional, Sequence
+from pathlib import Path
+import json
+import os
+import time
+import numpy as np
+
+DEFAULT_RETRAIN_COOLDOWN = 900
+DEFAULT_RETRAIN_TIMEOUT = 3600
+
+
+class RollingErrorStats:
+    """Rolling error statistics for one model kept in fixed-size ring buffers.
+
+    Window sums are maintained incrementally, so MAE, RMSE, MAPE and the
+    recent relative error used for retrain decisions are O(1) to read.
+    Quantiles are computed from the ring on demand.
+    """
+
+    def __init__(self, window_size: int = 1000, recent_size: int = 10,
+                 ewma_alpha: float = 0.1):
+        self.window_size = window_size
+        self.recent_size = recent_size
+        self.ewma_alpha = ewma_alpha
+
+        self.abs_errors = np.zeros(window_size)
+        self.relative_errors = np.zeros(window_size)
+        self.pct_valid = np.zeros(window_size, dtype=bool)
+        self.position = 0
+        self.count = 0
+        self.total_count = 0
+        self.samples_since_retrain = 0
+        self.ewma: Optional[float] = None
+
+        self._abs_sum = 0.0
+        self._sq_sum = 0.0
+        self._pct_sum = 0.0
+        self._pct_count = 0
+        self._recent = np.zeros(recent_size)
+        self._recent_position = 0
+        self._recent_count = 0
+        self._recent_sum = 0.0
+
+    def update(self, actual: float, predicted: float) -> float:
+        """Add a prediction outcome and return its relative error."""
+        abs_error = abs(actual - predicted)
+        relative_error = abs_error / abs(actual) if actual else abs_error
+
+        if self.count == self.window_size:
+            self._evict(self.position)
+        else:
+            self.count += 1
+
+        self.abs_errors[self.position] = abs_error
+        self.relative_errors[self.position] = relative_error
+        self.pct_valid[self.position] = actual != 0
+        self._abs_sum += abs_error
+        self._sq_sum += abs_error * abs_error
+        if actual != 0:
+            self._pct_sum += relative_error
+            self._pct_count += 1
+        self.position = (self.position + 1) % self.window_size
+
+        if self._recent_count == self.recent_size:
+            self._recent_sum -= self._recent[self._recent_position]
+        else:
+            self._recent_count += 1
+        self._recent[self._recent_position] = relative_error
+        self._recent_sum += relative_error
+        self._recent_position = (self._recent_position + 1) % self.recent_size
+
+        self.ewma = (
+            relative_error if self.ewma is None
+            else self.ewma_alpha * relative_error + (1 - self.ewma_alpha) * self.ewma
+        )
+        self.total_count += 1
+        self.samples_since_retrain += 1
+
+        # Re-derive the running sums once per window to cancel float drift
+        if self.total_count % self.window_size == 0:
+            self._resync()
+
+        return relative_error
+
+    def _evict(self, position: int):
+        """Remove the oldest ring entry from the running sums."""
+        abs_error = self.abs_errors[position]
+        self._abs_sum -= abs_error
+        self._sq_sum -= abs_error * abs_error
+        if self.pct_valid[position]:
+            self._pct_sum -= self.relative_errors[position]
+            self._pct_count -= 1
+
+    def _resync(self):
+        """Recompute running sums from the ring contents."""
+        view = slice(0, self.count)
+        abs_errors = self.abs_errors[view]
+        valid = self.pct_valid[view]
+        self._abs_sum = float(abs_errors.sum())
+        self._sq_sum = float(np.dot(abs_errors, abs_errors))
+        self._pct_sum = float(self.relative_errors[view][valid].sum())
+        self._pct_count = int(np.count_nonzero(valid))
+        self._recent_sum = float(self._recent[:self._recent_count].sum())
+
+    @property
+    def mae(self) -> float:
+        return self._abs_sum / self.count if self.count else 0.0
+
+    @property
+    def rmse(self) -> float:
+        return float(np.sqrt(max(self._sq_sum, 0.0) / self.count)) if self.count else 0.0
+
+    @property
+    def mape(self) -> float:
+        """Mean absolute percentage error over the window, in percent."""
+        return self._pct_sum / self._pct_count * 100 if self._pct_count else 0.0
+
+    @property
+    def recent_error(self) -> float:
+        """Mean relative error of the most recent predictions."""
+        return self._recent_sum / self._recent_count if self._recent_count else 0.0
+
+    def quantiles(self, qs: Sequence[float] = (0.5, 0.95, 0.99)) -> Dict[float, float]:
+        """Get quantiles of the windowed relative error."""
+        if not self.count:
+            return {q: 0.0 for q in qs}
+        values = np.quantile(self.relative_errors[:self.count], qs)
+        return {q: float(v) for q, v in zip(qs, values)}
+
+    def summary(self) -> Dict[str, float]:
+        """Get a summary of the current rolling statistics."""
+        quantiles = self.quantiles((0.5, 0.95))
+        return {
+            'count': self.count,
+            'total_count': self.total_count,
+            'mae': self.mae,
+            'rmse': self.rmse,
+            'mape': self.mape,
+            'ewma_error': self.ewma if self.ewma is not None else 0.0,
+            'recent_error': self.recent_error,
+            'mean_error': float(self.relative_errors[:self.count].mean()) if self.count else 0.0,
+            'p50_error': quantiles[0.5],
+            'p95_error': quantiles[0.95]
+        }
+
+    def to_state(self) -> Dict:
+        """Serialize the ring contents in chronological order."""
+        order = np.roll(np.arange(self.count), -self.position) if self.count == self.window_size \
+            else np.arange(self.count)
+        return {
+            'abs_errors': self.abs_errors[order].tolist(),
+            'relative_errors': self.relative_errors[order].tolist(),
+            'pct_valid': self.pct_valid[order].tolist(),
+            'ewma': self.ewma,
+            'total_count': self.total_count,
+            'samples_since_retrain': self.samples_since_retrain
+        }
+
+    def load_state(self, state: Dict):
+        """Restore ring contents saved with `to_state`."""
+        abs_errors = state['abs_errors'][-self.window_size:]
+        relative_errors = state['relative_errors'][-self.window_size:]
+        pct_valid = state['pct_valid'][-self.window_size:]
+
+        self.count = len(abs_errors)
+        self.position = self.count % self.window_size
+        self.abs_errors[:self.count] = abs_errors
+        self.relative_errors[:self.count] = relative_errors
+        self.pct_valid[:self.count] = pct_valid
+        self.ewma = state.get('ewma')
+        self.total_count = state.get('total_count', self.count)
+        # Older state files have no retrain marker; count every sample as since the last one
+        self.samples_since_retrain = state.get('samples_since_retrain', self.total_count)
+
+        recent = relative_errors[-self.recent_size:]
+        self._recent_count = len(recent)
+        self._recent[:self._recent_count] = recent
+        self._recent_position = self._recent_count % self.recent_size
+        self._resync()
+
+
+class PerformanceTracker:
+    """Streaming per-model performance tracking with debounced retrain decisions."""
+
+    def __init__(self, config: Optional[Dict] = None,
+                 state_file: Optional[str] = None):
+        config = config or {}
+        tracking = config.get('model_registry', {}).get('performance_tracking', {})
+        retraining = config.get('performance_monitoring', {}).get('retraining', {})
+
+        self.history_length = tracking.get('history_length', 1000)
+        self.save_interval = tracking.get('save_interval', 3600)
+        self.error_threshold = retraining.get('error_threshold', 0.2)
+        self.retrain_window = retraining.get('window_size', 10)
+        self.min_samples = retraining.get('min_samples', 100)
+        self.cooldown_seconds = retraining.get('cooldown_seconds', DEFAULT_RETRAIN_COOLDOWN)
+        self.retrain_timeout = retraining.get('timeout_seconds', DEFAULT_RETRAIN_TIMEOUT)
+
+        self.stats: Dict[str, RollingErrorStats] = {}
+        self.retraining_in_progress: Dict[str, bool] = {}
+        self.last_retrain_trigger: Dict[str, float] = {}
+        self.state_file = Path(state_file) if state_file else None
+        self._last_save = time.monotonic()
+
+        if self.state_file and self.state_file.exists():
+            self.load()
+
+    def update(self, model_name: str, actual: float, predicted: float) -> float:
+        """Record a prediction outcome and return its relative error."""
+        return self._get_stats(model_name).update(actual, predicted)
+
+    def should_retrain(self, model_name: str, now: Optional[float] = None) -> bool:
+        """Decide in O(1) whether a model should be retrained.
+
+        Requires enough samples since the last retrain, no retrain already
+        running and the cooldown to have passed, so a burst of bad
+        predictions only triggers once. A retrain that never reported back
+        within `retrain_timeout` is treated as failed.
+        """
+        stats = self.stats.get(model_name)
+        if stats is None:
+            return False
+
+        now = time.monotonic() if now is None else now
+        last_trigger = self.last_retrain_trigger.get(model_name)
+        if self.retraining_in_progress.get(model_name):
+            if last_trigger is None or now - last_trigger < self.retrain_timeout:
+                return False
+            self.retraining_in_progress[model_name] = False
+
+        if stats.samples_since_retrain < self.min_samples:
+            return False
+
+        if last_trigger is not None and now - last_trigger < self.cooldown_seconds:
+            return False
+
+        return stats.recent_error > self.error_threshold
+
+    def mark_retraining(self, model_name: str, now: Optional[float] = None):
+        """Record that a retrain was triggered for a model."""
+        self.retraining_in_progress[model_name] = True
+        self.last_retrain_trigger[model_name] = time.monotonic() if now is None else now
+
+    def mark_retrained(self, model_name: str):
+        """Record that a model finished retraining."""
+        self.retraining_in_progress[model_name] = False
+        if model_name in self.stats:
+            self.stats[model_name].samples_since_retrain = 0
+
+    def mark_retrain_failed(self, model_name: str):
+        """Record that a retrain failed; the cooldown still applies before the next."""
+        self.retraining_in_progress[model_name] = False
+
+    def get_summary(self, model_name: str) -> Dict[str, float]:
+        """Get rolling statistics for a model."""
+        stats = self.stats.get(model_name)
+        return stats.summary() if stats else {}
+
+    def get_all_summaries(self) -> Dict[str, Dict[str, float]]:
+        """Get rolling statistics for every tracked model."""
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+    def maybe_persist(self, now: Optional[float] = None) -> bool:
+        """Save tracked statistics if `save_interval` has elapsed."""
+        if not self.state_file:
+            return False
+
+        now = time.monotonic() if now is None else now
+        if now - self._last_save < self.save_interval:
+            return False
+
+        self.save()
+        self._last_save = now
+        return True
+
+    def save(self):
+        """Write tracked statistics to the state file atomically."""
+        state = {
+            name: {'summary': stats.summary(), 'window': stats.to_state()}
+            for name, stats in self.stats.items()
+        }
+        temp_file = self.state_file.with_suffix(self.state_file.suffix + '.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_file, self.state_file)
+
+    def load(self):
+        """Restore tracked statistics from the state file."""
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for name, model_state in state.items():
+            self._get_stats(name).load_state(model_state['window'])
+
+    def _get_stats(self, model_name: str) -> RollingErrorStats:
+        stats = self.stats.get(model_name)
+        if stats is None:
+            stats = RollingErrorStats(self.history_length, self.retrain_window)
+            self.stats[model_name] = stats
+        return stats
@@ -1,11 +1,13 @@
-from typing import Dict, List
+from typing import Deque, Dict
+from collections import deque
 from datetime import datetime
 
 
 class ModelRegistry:
-    def __init__(self):
+    def __init__(self, history_length: int = 1000):
         self.models: Dict[str, Dict] = {}
-        self.model_performance: Dict[str, List[float]] = {}
+        self.history_length = history_length
+        self.model_performance: Dict[str, Deque[float]] = {}
 
     def register_model(self, model_name: str, model_type: str, model_instance: any):
         self.models[model_name] = {
@@ -17,5 +19,5 @@ class ModelRegistry:
 
     def update_performance(self, model_name: str, performance_metric: float):
         if model_name not in self.model_performance:
-            self.model_performance[model_name] = []
-        self.model_performance[model_name].append(performance_metric)
\ No newline at end of file
+            self.model_performance[model_name] = deque(maxlen=self.history_length)
+        self.model_performance[model_name].append(performance_metric)
@@ -1,37 +1,64 @@
 # analysis/ml_models/seasonality_analyzer.py
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Union
 import numpy as np
-from scipy import signal
-from datetime import datetime, timedelta
-import pandas as pd
+from datetime import datetime
+from core.calculators.seasonal_profile import HOURS_PER_DAY, SeasonalProfile, week_index
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+TimestampsLike = Union[Sequence[datetime], np.ndarray]
+
+
+def to_epoch_seconds(timestamps: TimestampsLike) -> np.ndarray:
+    """Convert datetimes or datetime64 values to int64 seconds, keeping wall-clock time."""
+    values = np.asarray(timestamps)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(np.int64)
+    return values.astype('datetime64[s]').astype(np.int64)
 
 
 class SeasonalityAnalyzer:
     def __init__(self, config: Dict):
         self.config = config
+        self.profile = SeasonalProfile()
+        # Per calendar week value sums and counts, for the weekly pattern
+        self.week_sums: Dict[int, float] = {}
+        self.week_counts: Dict[int, int] = {}
+        self.last_epoch: Optional[int] = None
         self.patterns = {}
         self.current_analysis = {}
 
     async def analyze_seasonality(
             self,
-            values: List[float],
-            timestamps: List[datetime]
+            values: Union[List[float], np.ndarray],
+            timestamps: TimestampsLike
     ) -> Dict:
-        """Analyze time series for seasonal patterns."""
-        df = pd.DataFrame({
-            'value': values,
-            'timestamp': timestamps
-        }).set_index('timestamp')
+        """Analyze time series for seasonal patterns.
+
+        Only points newer than every point seen before are added, so calls
+        with overlapping windows count each point once. All three patterns
+        are detected over every point added so far.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        epoch_seconds = to_epoch_seconds(timestamps)
+        if self.last_epoch is not None:
+            new = epoch_seconds > self.last_epoch
+            values, epoch_seconds = values[new], epoch_seconds[new]
+        if len(values):
+            self.last_epoch = int(epoch_seconds.max())
+            self.profile.add_points(values, epoch_seconds)
+            self._add_weeks(values, epoch_seconds)
+        profiles = self.profile.get_profiles()
 
         patterns = {
-            'hourly': self._detect_hourly_pattern(df),
-            'daily': self._detect_daily_pattern(df),
-            'weekly': self._detect_weekly_pattern(df)
+            'hourly': self._detect_hourly_pattern(profiles['hourly']),
+            'daily': self._detect_daily_pattern(profiles['daily']),
+            'weekly': self._detect_weekly_pattern()
         }
 
         # Calculate confidence scores
-        confidences = self._calculate_pattern_confidence(patterns, df)
+        confidences = self._calculate_pattern_confidence(patterns)
 
         # Store significant patterns
         self.patterns = {
@@ -43,53 +70,77 @@ class SeasonalityAnalyzer:
         return {
             'patterns': self.patterns,
             'confidences': confidences,
-            'adjustments': self._calculate_adjustments(df)
+            'adjustments': self._calculate_adjustments()
         }
 
-    def _detect_hourly_pattern(self, df: pd.DataFrame) -> Dict:
-        """Detect hourly patterns in the data."""
-        hourly_groups = df.groupby(df.index.hour)['value'].agg(['mean', 'std'])
+    def _detect_hourly_pattern(self, profile: Dict[str, np.ndarray]) -> Dict:
+        """Detect hourly patterns from the hour-of-day profile."""
+        return self._summarize_profile(profile, list(range(HOURS_PER_DAY)), 'hour')
 
-        return {
-            'means': hourly_groups['mean'].to_dict(),
-            'stds': hourly_groups['std'].to_dict(),
-            'peak_hour': hourly_groups['mean'].idxmax(),
-            'trough_hour': hourly_groups['mean'].idxmin()
-        }
+    def _detect_daily_pattern(self, profile: Dict[str, np.ndarray]) -> Dict:
+        """Detect daily patterns from the day-of-week profile."""
+        return self._summarize_profile(profile, DAY_NAMES, 'day')
 
-    def _detect_daily_pattern(self, df: pd.DataFrame) -> Dict:
-        """Detect daily patterns in the data."""
-        daily_groups = df.groupby(df.index.day_name())['value'].agg(['mean', 'std'])
+    @staticmethod
+    def _summarize_profile(profile: Dict[str, np.ndarray], labels: List,
+                           unit: str) -> Dict:
+        """Summarize a profile as label-keyed means/stds with peak and trough."""
+        populated = np.flatnonzero(profile['counts'] > 0)
+        if not len(populated):
+            return {'means': {}, 'stds': {}, f'peak_{unit}': None, f'trough_{unit}': None}
 
+        means = profile['means'][populated]
         return {
-            'means': daily_groups['mean'].to_dict(),
-            'stds': daily_groups['std'].to_dict(),
-            'peak_day': daily_groups['mean'].idxmax(),
-            'trough_day': daily_groups['mean'].idxmin()
+            'means': {labels[i]: float(profile['means'][i]) for i in populated},
+            'stds': {labels[i]: float(profile['stds'][i]) for i in populated},
+            f'peak_{unit}': labels[populated[np.argmax(means)]],
+            f'trough_{unit}': labels[populated[np.argmin(means)]]
         }
 
-    def _detect_weekly_pattern(self, df: pd.DataFrame) -> Dict:
+    def _add_weeks(self, values: np.ndarray, epoch_seconds: np.ndarray):
+        """Add points to the sums and counts of their calendar weeks (starting on Monday)."""
+        weeks, week_ids = np.unique(week_index(epoch_seconds), return_inverse=True)
+        sums = np.bincount(week_ids, weights=values)
+        counts = np.bincount(week_ids)
+        for week, total, count in zip(weeks.tolist(), sums.tolist(), counts.tolist()):
+            self.week_sums[week] = self.week_sums.get(week, 0.0) + total
+            self.week_counts[week] = self.week_counts.get(week, 0) + count
+
+    def _detect_weekly_pattern(self) -> Dict:
         """Detect weekly patterns in the data."""
-        # Calculate weekly averages
-        df['week'] = df.index.isocalendar().week
-        weekly_pattern = df.groupby('week')['value'].agg(['mean', 'std'])
+        weeks = sorted(self.week_counts)
+        weekly_means = np.array([self.week_sums[week] / self.week_counts[week] for week in weeks])
 
         # Detect repetitive patterns
-        values = weekly_pattern['mean'].values
-        if len(values) >= 2:
-            # Use autocorrelation to detect patterns
-            autocorr = signal.correlate(values, values, mode='full')
+        if len(weekly_means) >= 2:
+            autocorr = self.autocorrelation(weekly_means)
+            lags = autocorr[1:]
             return {
-                'strength': float(np.max(autocorr[len(values):]) / autocorr[len(values) - 1]),
-                'period': int(np.argmax(autocorr[len(values):]) + 1)
+                'strength': float(np.max(lags) / autocorr[0]) if autocorr[0] else 0.0,
+                'period': int(np.argmax(lags) + 1)
             }
         return {'strength': 0.0, 'period': 0}
 
-    def _calculate_pattern_confidence(
-            self,
-            patterns: Dict,
-            df: pd.DataFrame
-    ) -> Dict[str, float]:
+    @staticmethod
+    def autocorrelation(values: np.ndarray) -> np.ndarray:
+        """Non-negative-lag autocorrelation computed via FFT in O(n log n)."""
+        n = len(values)
+        size = 1 << (2 * n - 1).bit_length()
+        spectrum = np.fft.rfft(values, size)
+        return np.fft.irfft(spectrum * np.conj(spectrum), size)[:n]
+
+    def detect_period(self, values: np.ndarray, min_lag: int = 2,
+                      max_lag: Optional[int] = None) -> int:
+        """Detect the dominant period of a long, evenly sampled series."""
+        values = np.asarray(values, dtype=np.float64)
+        max_lag = max_lag or len(values) // 2
+        if max_lag <= min_lag:
+            return 0
+
+        autocorr = self.autocorrelation(values - values.mean())
+        return int(min_lag + np.argmax(autocorr[min_lag:max_lag + 1]))
+
+    def _calculate_pattern_confidence(self, patterns: Dict) -> Dict[str, float]:
         """Calculate confidence scores for detected patterns."""
         confidences = {}
 
@@ -98,34 +149,27 @@ class SeasonalityAnalyzer:
                 # Calculate coefficient of variation
                 means = np.array(list(pattern['means'].values()))
                 stds = np.array(list(pattern['stds'].values()))
-                cv = np.mean(stds) / np.mean(means) if np.mean(means) != 0 else 0
-                confidences[period] = 1.0 - min(cv, 1.0)
+                if not len(means) or np.all(np.isnan(stds)):
+                    confidences[period] = 0.0
+                    continue
+                mean_level = np.mean(means)
+                cv = np.nanmean(stds) / mean_level if mean_level != 0 else 0
+                confidences[period] = float(1.0 - min(cv, 1.0))
             else:  # weekly
                 confidences[period] = pattern['strength']
 
         return confidences
 
-    def _calculate_adjustments(self, df: pd.DataFrame) -> Dict:
-        """Calculate adjustment factors based on patterns."""
+    def _calculate_adjustments(self, timestamp: Optional[datetime] = None) -> Dict:
+        """Look up adjustment factors of significant patterns for a point in time."""
+        timestamp = timestamp or datetime.now()
+        profiles = self.profile.get_profiles()
         adjustments = {}
 
-        # Current time components
-        current_hour = datetime.now().hour
-        current_day = datetime.now().strftime('%A')
-        current_week = datetime.now().isocalendar()[1]
-
-        # Apply pattern-based adjustments
-        for period, pattern in self.patterns.items():
-            if period == 'hourly' and current_hour in pattern['means']:
-                adjustments['hourly'] = (
-                        pattern['means'][current_hour] /
-                        np.mean(list(pattern['means'].values()))
-                )
-            elif period == 'daily' and current_day in pattern['means']:
-                adjustments['daily'] = (
-                        pattern['means'][current_day] /
-                        np.mean(list(pattern['means'].values()))
-                )
+        if 'hourly' in self.patterns:
+            adjustments['hourly'] = float(profiles['hourly']['factors'][timestamp.hour])
+        if 'daily' in self.patterns:
+            adjustments['daily'] = float(profiles['daily']['factors'][timestamp.weekday()])
 
         return adjustments
 
@@ -134,5 +178,5 @@ class SeasonalityAnalyzer:
         if not self.patterns:
             return 1.0
 
-        adjustments = self._calculate_adjustments(None)  # Current time only
-        return np.prod(list(adjustments.values()))
\ No newline at end of file
+        adjustments = self._calculate_adjustments()
+        return float(np.prod(list(adjustments.values())))
@@ -1,17 +1,29 @@
 from typing import Dict, Optional, List
 import pandas as pd
-from prophet import Prophet
-from sklearn.ensemble import IsolationForest
 from datetime import datetime, timedelta
+from core.utils.lazy_imports import import_attr
 
 class TrafficForecaster:
     def __init__(self, config: Dict):
-        self.prophet_model = Prophet(
+        self.config = config
+        self._prophet_model = None
+        self.historical_data = {}
+
+    @property
+    def prophet_model(self):
+        """Prophet model, built (and prophet imported) on first use."""
+        if self._prophet_model is None:
+            self._prophet_model = self._create_prophet_model(self.config)
+        return self._prophet_model
+
+    @staticmethod
+    def _create_prophet_model(config: Dict):
+        Prophet = import_attr('prophet', 'Prophet', 'prophet')
+        return Prophet(
             changepoint_prior_scale=config.get('changepoint_prior_scale', 0.05),
             seasonality_prior_scale=config.get('seasonality_prior_scale', 10),
             seasonality_mode=config.get('seasonality_mode', 'multiplicative')
         )
-        self.historical_data = {}
 
     def forecast_traffic(self, api_name: str, horizon: int = 24) -> pd.DataFrame:
         """Forecast traffic for the next 'horizon' hours."""
@@ -1,16 +1,27 @@
 import numpy as np
 from typing import Dict, Optional
 from datetime import datetime, timedelta
-from sklearn.ensemble import RandomForestRegressor
+from core.utils.lazy_imports import import_attr
 
 class ThresholdPredictor:
     def __init__(self, config: Dict):
-        self.model = RandomForestRegressor(
-            n_estimators=config.get('n_estimators', 100),
-            random_state=42
-        )
+        self.config = config
+        self._model = None
         self.feature_importance = {}
 
+    @property
+    def model(self):
+        """Regression model, built (and sklearn imported) on first use."""
+        if self._model is None:
+            RandomForestRegressor = import_attr(
+                'sklearn.ensemble', 'RandomForestRegressor', 'scikit-learn'
+            )
+            self._model = RandomForestRegressor(
+                n_estimators=self.config.get('n_estimators', 100),
+                random_state=42
+            )
+        return self._model
+
     def predict_thresholds(self, api_name: str,
                           context: Dict,
                           forecast: Dict) -> Dict:
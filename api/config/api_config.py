@@ -1,8 +1,12 @@
 # api/config/api_config.py
 
-from typing import Dict
-import yaml
+from typing import Dict, Optional
+from functools import lru_cache
 from pathlib import Path
+import os
+import yaml
+
+API_KEY_ENV = 'SMART_API_KEY'
 
 
 class APIConfig:
@@ -18,7 +22,7 @@ class APIConfig:
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
 
         with open(self.config_path, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.safe_load(f) or {}
 
     @property
     def rate_limits(self) -> Dict:
@@ -38,4 +42,15 @@ class APIConfig:
     @property
     def cors(self) -> Dict:
         """Get CORS configuration."""
-        return self.config.get('cors', {})
\ No newline at end of file
+        return self.config.get('cors', {})
+
+    @property
+    def api_key(self) -> Optional[str]:
+        """Key clients send as X-API-Key; the SMART_API_KEY environment variable wins."""
+        return os.environ.get(API_KEY_ENV) or self.auth.get('api_key')
+
+
+@lru_cache(maxsize=None)
+def get_api_config() -> APIConfig:
+    """The API configuration, loaded once."""
+    return APIConfig()
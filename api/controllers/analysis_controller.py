@@ -1,18 +1,39 @@
 # api/controllers/analysis_controller.py
 
-from typing import Dict, Optional
-from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+from datetime import datetime, timedelta
+import asyncio
+import numpy as np
 from fastapi import HTTPException
-from analysis.ml_models.orchestrator import MLModelOrchestrator
 from analysis.context.context_collector import ContextCollector
+from core.calculators.batch_detection import grouped_trend_slopes
+from core.storage.history_store import DEFAULT_HISTORY_ROOT, HistoryStore
+from core.utils.batch_queries import resolve_api_names, run_chunks
+from core.utils.lazy_imports import import_attr
 
 
 class AnalysisController:
     """Controller for analysis-related operations."""
 
-    def __init__(self):
-        self.ml_orchestrator = MLModelOrchestrator()
+    def __init__(self, history_store: Optional[HistoryStore] = None):
+        self._ml_orchestrator = None
         self.context_collector = ContextCollector()
+        self.history_store = history_store or HistoryStore()
+
+    @property
+    def ml_orchestrator(self):
+        """Built on first analysis, so serving history and trends never loads model libraries."""
+        if self._ml_orchestrator is None:
+            self._ml_orchestrator = import_attr(
+                'analysis.ml_models.orchestrator', 'MLModelOrchestrator'
+            )()
+        return self._ml_orchestrator
+
+    def configure(self, config: Optional[Dict] = None):
+        """Read history from `batch_processing.history_path` of the monitoring
+        config, where the batch processor writes it."""
+        history_path = (config or {}).get('batch_processing', {}).get('history_path')
+        self.history_store = HistoryStore(history_path or DEFAULT_HISTORY_ROOT)
 
     async def analyze_metrics(self, api_name: str, metrics: Dict) -> Dict:
         """Analyze metrics using ML models."""
@@ -48,15 +69,107 @@ class AnalysisController:
             start_time: datetime,
             end_time: datetime
     ) -> Dict:
-        """Get historical analysis results."""
+        """Get historical analysis results from the rolled-up metric history."""
         try:
-            return await self.ml_orchestrator.get_historical_analysis(
+            loop = asyncio.get_running_loop()
+            history = await loop.run_in_executor(
+                None,
+                self.history_store.query_frame,
                 api_name,
                 start_time,
                 end_time
             )
+            counts = history['count'].to_numpy()
+            total = int(counts.sum())
+
+            return {
+                'api_name': api_name,
+                'start_time': start_time.isoformat(),
+                'end_time': end_time.isoformat(),
+                'summary': {
+                    'count': total,
+                    'mean': float(np.dot(counts, history['mean'].to_numpy()) / total) if total else None,
+                    'min': float(history['min'].min()) if total else None,
+                    'max': float(history['max'].max()) if total else None,
+                    'p95_max': float(history['p95'].max()) if total else None
+                },
+                'rollups': [
+                    {
+                        'timestamp': datetime.fromtimestamp(row.timestamp / 1e9).isoformat(),
+                        'count': int(row.count),
+                        'mean': float(row.mean),
+                        'std': float(row.std),
+                        'min': float(row.min),
+                        'max': float(row.max),
+                        'p95': float(row.p95)
+                    }
+                    for row in history.itertuples(index=False)
+                ]
+            }
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Historical analysis failed: {str(e)}"
-            )
\ No newline at end of file
+            )
+
+    async def get_trend_analysis(self, api_name: str, window_hours: int = 24) -> Dict:
+        """Get the rollup trend of an API over the last `window_hours`."""
+        try:
+            records = await self._trend_chunk([api_name], window_hours, datetime.now())
+            return records[0]
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Trend analysis failed: {str(e)}"
+            )
+
+    def get_trend_analysis_batch(
+            self,
+            api_names: List[str],
+            window_hours: int = 24
+    ) -> AsyncIterator[Dict]:
+        """Trends of many APIs (names or globs), yielded chunk by chunk as they finish."""
+        names = resolve_api_names(api_names, self.history_store.list_apis())
+        end_time = datetime.now()
+        return run_chunks(
+            names,
+            lambda chunk: self._trend_chunk(chunk, window_hours, end_time)
+        )
+
+    async def _trend_chunk(self, api_names: List[str], window_hours: int,
+                           end_time: datetime) -> List[Dict]:
+        """Read a chunk's rollups off the loop, then fit every trend in one pass."""
+        start_time = end_time - timedelta(hours=window_hours)
+        loop = asyncio.get_running_loop()
+        frames = await loop.run_in_executor(
+            None,
+            lambda: [
+                self.history_store.query_frame(name, start_time, end_time, ['count', 'mean'])
+                for name in api_names
+            ]
+        )
+
+        rollups = np.array([len(frame) for frame in frames], dtype=np.int64)
+        epoch_seconds = np.concatenate(
+            [frame['timestamp'].to_numpy(dtype=np.int64) / 1e9 for frame in frames]
+        )
+        means = np.concatenate([frame['mean'].to_numpy(dtype=np.float64) for frame in frames])
+        weights = np.concatenate([frame['count'].to_numpy(dtype=np.float64) for frame in frames])
+        trends = grouped_trend_slopes(rollups, epoch_seconds, means)
+        groups = np.repeat(np.arange(len(api_names)), rollups)
+        points = np.bincount(groups, weights, len(api_names))
+        weighted_means = np.bincount(groups, weights * means, len(api_names))
+
+        return [
+            {
+                'api_name': name,
+                'window_hours': window_hours,
+                'start_time': start_time.isoformat(),
+                'end_time': end_time.isoformat(),
+                'rollups': int(rollups[i]),
+                'points': int(points[i]),
+                'mean': float(weighted_means[i] / points[i]) if points[i] else None,
+                'trend': {key: float(values[i]) for key, values in trends.items()}
+            }
+            for i, name in enumerate(api_names)
+        ]
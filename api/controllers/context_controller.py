@@ -1,10 +1,13 @@
 # api/controllers/context_controller.py
 
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime
+import asyncio
 from fastapi import HTTPException
 from analysis.context.context_collector import ContextCollector
 from analysis.context.dependency_analyzer import DependencyAnalyzer
+from analysis.context.graph_snapshot import DependencyGraphSnapshot
+from core.utils.batch_queries import resolve_api_names, run_chunks
 
 
 class ContextController:
@@ -17,28 +20,69 @@ class ContextController:
     async def get_api_context(self, api_name: str) -> Dict:
         """Get current context for an API."""
         try:
-            context = await self.context_collector.collect_context(
-                api_name,
-                datetime.now()
+            # Dependency information from one consistent snapshot
+            snapshot = self.dependency_analyzer.get_snapshot()
+            records = await self._context_chunk([api_name], snapshot)
+            return records[0]
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Context collection failed: {str(e)}"
             )
 
-            # Enhance with dependency information
-            dependencies = {
-                'impact_score': self.dependency_analyzer.get_impact_score(api_name),
-                'critical_path': self.dependency_analyzer.get_critical_path(api_name),
-                'dependent_apis': self.dependency_analyzer.get_dependent_apis(api_name)
+    def get_api_context_batch(self, api_names: List[str]) -> AsyncIterator[Dict]:
+        """Context of many APIs (names or globs), yielded chunk by chunk as they finish.
+
+        Every chunk reads the same dependency snapshot, so the batch is
+        consistent even if the graph changes while it runs.
+        """
+        snapshot = self.dependency_analyzer.get_snapshot()
+        names = resolve_api_names(api_names, snapshot.node_names)
+        return run_chunks(names, lambda chunk: self._context_chunk(chunk, snapshot))
+
+    async def _context_chunk(self, api_names: List[str],
+                             snapshot: DependencyGraphSnapshot) -> List[Dict]:
+        timestamp = datetime.now()
+        loop = asyncio.get_running_loop()
+        # Context collection and the graph walks are CPU-bound; keep them off the loop
+        return await loop.run_in_executor(
+            None,
+            lambda: [self._context_record(name, snapshot, timestamp) for name in api_names]
+        )
+
+    def _context_record(self, api_name: str, snapshot: DependencyGraphSnapshot,
+                        timestamp: datetime) -> Dict:
+        return {
+            'api_name': api_name,
+            'timestamp': timestamp.isoformat(),
+            'context': self.context_collector.collect_context(api_name, timestamp),
+            'dependencies': {
+                'impact_score': snapshot.get_impact_score(api_name),
+                'critical_path': snapshot.get_critical_path(api_name),
+                'dependent_apis': snapshot.get_dependent_apis(api_name)
             }
+        }
 
+    async def get_dependency_info(self, api_name: str) -> Dict:
+        """Get dependency information for an API."""
+        try:
+            snapshot = self.dependency_analyzer.get_snapshot()
             return {
                 'api_name': api_name,
                 'timestamp': datetime.now().isoformat(),
-                'context': context,
-                'dependencies': dependencies
+                'dependencies': snapshot.get_dependencies(api_name),
+                'impact_score': snapshot.get_impact_score(api_name),
+                'health_impact_factor': self.dependency_analyzer.get_health_impact_factor(
+                    api_name
+                ),
+                'cascading_impact': self.dependency_analyzer.analyze_cascading_impact(
+                    api_name
+                )
             }
         except Exception as e:
             raise HTTPException(
                 status_code=500,
-                detail=f"Context collection failed: {str(e)}"
+                detail=f"Dependency lookup failed: {str(e)}"
             )
 
     async def update_api_context(
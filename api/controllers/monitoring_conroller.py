@@ -1,29 +0,0 @@
-from datetime import datetime
-from typing import Dict, Optional
-from ..schemas.monitoring_schemas import MetricData, AnalysisResponse
-from core.system.monitoring_system import MonitoringSystem
-
-class MonitoringController:
-    def __init__(self):
-        self.monitoring_system = MonitoringSystem()
-
-    async def process_metrics(self, metric_data: MetricData) -> AnalysisResponse:
-        """Process incoming metrics and return analysis."""
-        result = self.monitoring_system.process_metrics(
-            api_name=metric_data.api_name,
-            timestamp=metric_data.timestamp,
-            latency=metric_data.latency,
-            error_rate=metric_data.error_rate,
-            traffic=metric_data.traffic
-        )
-
-        return AnalysisResponse(**result)
-
-    async def get_api_health(self, api_name: str) -> Dict:
-        """Get current health status for an API."""
-        pass
-
-    async def update_thresholds(self, api_name: str,
-                              config: ThresholdConfig) -> Dict:
-        """Update threshold configuration for an API."""
-        pass
\ No newline at end of file
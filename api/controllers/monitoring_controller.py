@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+import numpy as np
+from ..schemas.monitoring_schemas import MetricData, AnalysisResponse, ThresholdConfig
+from core.processors.stream_processor import StreamProcessor
+from core.processors.threshold_processor import RealTimeMonitor
+from core.storage.metric_buffer_mgmt import MetricBuffer
+from core.storage.rollup_tiers import TieredMetricStore, tiers_from_config
+from core.system.broadcast_hub import BroadcastHub
+from core.system.fleet_snapshot import FleetMonitor, FleetSnapshot, health_statuses
+from core.utils.batch_queries import resolve_api_names
+
+class MonitoringController:
+    def __init__(self):
+        self.metric_buffer = MetricBuffer()
+        self.metric_store = TieredMetricStore()
+        self.hub = BroadcastHub()
+        self.fleet = FleetMonitor(self.metric_buffer, hub=self.hub)
+        # Scores and spike-checks each point into metric_buffer and streams spikes to the hub
+        self.stream_processor = StreamProcessor({}, hub=self.hub, metric_buffer=self.metric_buffer)
+        # Adaptive per-API metric thresholds, streamed as threshold:<api>.<metric>
+        self.thresholds = RealTimeMonitor(hub=self.hub)
+
+    def configure(self, config: Optional[Dict] = None):
+        """Apply the monitoring config; call before metrics are ingested."""
+        config = config or {}
+        self.hub.configure(config.get('streaming'))
+        self.fleet.configure(config)
+        self.stream_processor = StreamProcessor(config, hub=self.hub, metric_buffer=self.metric_buffer)
+        if config.get('rollup_tiers'):
+            self.metric_store = TieredMetricStore(tiers_from_config(config['rollup_tiers']))
+
+    async def process_metrics(self, metric_data: MetricData) -> AnalysisResponse:
+        """Process incoming metrics and return analysis."""
+        metrics = {
+            'latency': metric_data.latency,
+            'error_rate': metric_data.error_rate,
+            'traffic': metric_data.traffic
+        }
+        processed = await self.stream_processor.process_metric(metric_data.api_name, {
+            'timestamp': metric_data.timestamp,
+            'metrics': metrics
+        })
+        thresholds = self.thresholds.process_api_metrics(
+            metric_data.api_name, metric_data.timestamp, metrics
+        )
+        self.metric_store.add_metrics(metric_data.api_name, metric_data.timestamp, metrics)
+
+        health = processed['health_score']
+        status = str(health_statuses(
+            np.array([np.nan if health is None else health]), self.fleet.status_thresholds
+        )[0])
+        current_threshold = thresholds['latency']
+        breached = 0 < current_threshold < metric_data.latency
+        return AnalysisResponse(
+            timestamp=metric_data.timestamp,
+            current_threshold=current_threshold,
+            is_spike=processed['is_spike'],
+            health_score=health,
+            status=status,
+            needs_attention=processed['is_spike'] or breached or status == 'critical',
+            details={'thresholds': thresholds}
+        )
+
+    async def get_api_health(self, api_name: str) -> Optional[Dict]:
+        """Get current health status for an API from the latest fleet snapshot."""
+        return self.fleet.snapshot.api(api_name)
+
+    def get_api_health_batch(self, api_names: List[str]) -> AsyncIterator[Dict]:
+        """Health of many APIs (names or globs), all read from one snapshot."""
+        snapshot = self.fleet.snapshot
+        names = resolve_api_names(api_names, snapshot.api_names)
+
+        async def records():
+            for api_name in names:
+                health = snapshot.api(api_name)
+                yield health if health is not None else {
+                    'api_name': api_name,
+                    'error': f"No metrics for API {api_name}"
+                }
+        return records()
+
+    def get_fleet_snapshot(self) -> FleetSnapshot:
+        """Latest statistics and health of every monitored API."""
+        return self.fleet.snapshot
+
+    async def update_thresholds(self, api_name: str,
+                              config: ThresholdConfig) -> Dict:
+        """Update threshold configuration for an API."""
+        pass
\ No newline at end of file
@@ -1,7 +1,12 @@
+import yaml
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routes import monitoring_routes, analysis_routes
-from .middleware.rate_limiter import RateLimiterMiddleware
+from .routes import monitoring_routes, analysis_routes, context_routes, debug_routes
+from .middleware.rate_limiter import RateLimiter
+from .middleware.logging_middleware import LoggingMiddleware
+from core.utils.tracing import tracer
+from core.utils.profiler import profiler
+from core.utils.loop_watchdog import watchdog
 
 app = FastAPI(
     title="Smart API Monitor",
@@ -18,12 +23,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add rate limiting middleware
-app.add_middleware(RateLimiterMiddleware)
+# Add rate limiting and request logging middleware
+app.middleware("http")(RateLimiter())
+app.middleware("http")(LoggingMiddleware())
 
 # Include routers
 app.include_router(monitoring_routes.router)
+app.include_router(monitoring_routes.websocket_router, prefix=monitoring_routes.router.prefix)
 app.include_router(analysis_routes.router)
+app.include_router(context_routes.router)
+app.include_router(debug_routes.router)
+
+def _monitoring_config() -> dict:
+    with open("config/default/monitoring_config.yaml", 'r') as f:
+        config = yaml.safe_load(f) or {}
+    return config.get('monitoring', {})
+
+@app.on_event("startup")
+async def configure_diagnostics():
+    """Apply the tracing, profiling and loop watchdog settings of the monitoring config."""
+    monitoring = _monitoring_config()
+    tracer.configure(monitoring.get('tracing'))
+    profiler.configure(monitoring.get('profiling'))
+    watchdog.configure(monitoring.get('loop_watchdog'))
+    watchdog.start()
+
+@app.on_event("startup")
+async def configure_integrations():
+    """Expose integration provider configs, unless a harness already injected its own."""
+    if getattr(app.state, 'integrations', None) is None:
+        app.state.integrations = _monitoring_config().get('integrations') or {}
+
+@app.on_event("startup")
+async def configure_history():
+    """Point the analysis history endpoints at the batch processor's rollups."""
+    analysis_routes.controller.configure(_monitoring_config())
+
+@app.on_event("startup")
+async def start_fleet_snapshot():
+    """Start refreshing the fleet snapshot served to dashboards and streams."""
+    monitoring_routes.controller.configure(_monitoring_config())
+    monitoring_routes.controller.fleet.start()
+
+@app.on_event("shutdown")
+async def stop_diagnostics():
+    await watchdog.stop()
+
+@app.on_event("shutdown")
+async def stop_fleet_snapshot():
+    await monitoring_routes.controller.fleet.stop()
 
 @app.get("/health")
 async def health_check():
@@ -6,6 +6,7 @@ import logging
 import time
 import uuid
 from datetime import datetime
+from core.utils.tracing import set_trace_id, tracer
 
 
 class LoggingMiddleware:
@@ -33,13 +34,15 @@ class LoggingMiddleware:
         # Generate trace ID
         trace_id = str(uuid.uuid4())
         request.state.trace_id = trace_id
+        set_trace_id(trace_id)
 
         # Log request
         await self._log_request(request, trace_id)
 
         # Process request and measure timing
         start_time = time.time()
-        response = await call_next(request)
+        with tracer.span('http.request', method=request.method, path=request.url.path):
+            response = await call_next(request)
         duration = time.time() - start_time
 
         # Log response
@@ -84,6 +87,30 @@ class LoggingMiddleware:
         """Safely get request body content."""
         try:
             body = await request.body()
-            return body.decode()
         except Exception:
-            return ""
\ No newline at end of file
+            return ""
+        self._replay_body(request, body)
+        return body.decode(errors='replace')
+
+    @staticmethod
+    def _replay_body(request: Request, body: bytes):
+        """Hand the already-read body to the downstream app.
+
+        call_next forwards the request's receive channel, whose body
+        messages were consumed above; without this the endpoint waits
+        forever for a body that never comes. Newer Starlette replays a
+        body read in dispatch itself.
+        """
+        if hasattr(request, 'wrapped_receive'):
+            return
+        receive = request.receive
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        request._receive = replay
@@ -1,11 +1,13 @@
 # api/routes/analysis_routes.py
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Dict, Optional
 from datetime import datetime
 from ..controllers.analysis_controller import AnalysisController
 from ..middleware.auth_middleware import verify_api_key
-from ..schemas.monitoring_schemas import MetricData, AnalysisResponse
+from ..schemas.monitoring_schemas import BatchQuery, MetricData, AnalysisResponse
+from core.utils.batch_queries import ndjson
 
 router = APIRouter(prefix="/v1/analysis", tags=["analysis"])
 controller = AnalysisController()
@@ -39,6 +41,19 @@ async def get_historical_analysis(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/trends/batch")
+async def get_trend_analysis_batch(
+    query: BatchQuery,
+    window_hours: Optional[int] = 24,
+    api_key: str = Depends(verify_api_key)
+):
+    """Get trend analysis for many APIs as NDJSON, streamed as results complete."""
+    try:
+        records = controller.get_trend_analysis_batch(query.apis, window_hours)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(ndjson(records), media_type="application/x-ndjson")
+
 @router.get("/trends/{api_name}")
 async def get_trend_analysis(
     api_name: str,
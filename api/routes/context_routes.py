@@ -1,14 +1,29 @@
 # api/routes/context_routes.py
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Dict
 from ..controllers.context_controller import ContextController
 from ..middleware.auth_middleware import verify_api_key
-from ..schemas.monitoring_schemas import ContextUpdate
+from ..schemas.context_schemas import ContextUpdate
+from ..schemas.monitoring_schemas import BatchQuery
+from core.utils.batch_queries import ndjson
 
 router = APIRouter(prefix="/v1/context", tags=["context"])
 controller = ContextController()
 
+@router.post("/batch")
+async def get_api_context_batch(
+    query: BatchQuery,
+    api_key: str = Depends(verify_api_key)
+):
+    """Get current context for many APIs as NDJSON, streamed as results complete."""
+    try:
+        records = controller.get_api_context_batch(query.apis)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(ndjson(records), media_type="application/x-ndjson")
+
 @router.get("/{api_name}")
 async def get_api_context(
     api_name: str,
@@ -0,0 +1,62 @@
+# api/routes/debug_routes.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Dict, List, Optional
+from core.utils.loop_watchdog import watchdog
+from core.utils.profiler import profiler
+from core.utils.tracing import tracer
+from ..middleware.auth_middleware import verify_api_key
+
+router = APIRouter(prefix="/v1/debug", tags=["debug"])
+
+@router.get("/traces/slowest")
+async def get_slowest_traces(
+    limit: int = 20,
+    name: Optional[str] = None,
+    api_key: str = Depends(verify_api_key)
+) -> List[Dict]:
+    """Get the slowest recently completed traces with their spans."""
+    return tracer.slowest_traces(limit, name)
+
+@router.get("/traces/stages")
+async def get_stage_latencies(
+    api_key: str = Depends(verify_api_key)
+) -> Dict:
+    """Get per-stage latency histogram summaries."""
+    return {
+        'enabled': tracer.enabled,
+        'stages': tracer.stage_summary()
+    }
+
+@router.get("/loop")
+async def get_loop_lag(
+    buckets: bool = False,
+    api_key: str = Depends(verify_api_key)
+) -> Dict:
+    """Get event loop lag statistics and recently caught blocking calls."""
+    summary = watchdog.summary()
+    if buckets:
+        summary['buckets'] = watchdog.histogram_buckets()
+    return summary
+
+@router.get("/profile")
+async def get_profile(
+    seconds: float = Query(10.0, gt=0),
+    format: str = Query("json", regex="^(json|collapsed)$"),
+    api_key: str = Depends(verify_api_key)
+):
+    """Sample all thread stacks and event loop lag for the given duration.
+
+    `format=collapsed` returns only the folded stacks, ready for
+    flamegraph.pl or speedscope.
+    """
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if profiler.running:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    result = await profiler.profile(seconds)
+    if format == "collapsed":
+        return PlainTextResponse(result['collapsed'])
+    return result
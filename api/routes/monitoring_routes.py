@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional
+import asyncio
+from core.system.broadcast_hub import HEARTBEAT, HubFull
+from core.utils.batch_queries import ndjson
 from ..schemas.monitoring_schemas import (
+    BatchQuery,
     MetricData,
     ThresholdConfig,
     AnalysisResponse
 )
 from ..controllers.monitoring_controller import MonitoringController
-from ..middleware.auth_middleware import verify_api_key
+from ..middleware.auth_middleware import is_valid_api_key, verify_api_key
 
 router = APIRouter(prefix="/v1/monitoring", tags=["monitoring"])
+# FastAPI 0.68 ignores a router's own prefix for websocket routes; include with prefix=router.prefix
+websocket_router = APIRouter(tags=["monitoring"])
 controller = MonitoringController()
 
 @router.post("/metrics", response_model=AnalysisResponse)
@@ -22,6 +29,18 @@ async def process_metrics(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/health/batch")
+async def get_health_batch(
+    query: BatchQuery,
+    api_key: str = Depends(verify_api_key)
+):
+    """Get current health of many APIs as NDJSON, one line per API."""
+    try:
+        records = controller.get_api_health_batch(query.apis)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(ndjson(records), media_type="application/x-ndjson")
+
 @router.get("/health/{api_name}")
 async def get_health(
     api_name: str,
@@ -29,9 +48,22 @@ async def get_health(
 ):
     """Get current health status for an API."""
     try:
-        return await controller.get_api_health(api_name)
+        health = await controller.get_api_health(api_name)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if health is None:
+        raise HTTPException(status_code=404, detail=f"No metrics for API {api_name}")
+    return health
+
+@router.get("/fleet")
+async def get_fleet(
+    api_key: str = Depends(verify_api_key)
+):
+    """Get statistics, health and status of every monitored API.
+
+    Served from the periodically refreshed snapshot, already encoded.
+    """
+    return Response(content=controller.get_fleet_snapshot().body, media_type="application/json")
 
 @router.put("/thresholds/{api_name}")
 async def update_thresholds(
@@ -43,4 +75,86 @@ async def update_thresholds(
     try:
         return await controller.update_thresholds(api_name, config)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _api_set(apis: Optional[str]):
+    """Names from a comma-separated `apis` parameter; None (all APIs) when omitted."""
+    if apis is None:
+        return None
+    names = {name.strip() for name in apis.split(',') if name.strip()}
+    if not names:
+        raise ValueError("apis must name at least one API")
+    return names
+
+@router.get("/stream")
+async def stream_updates(
+    apis: Optional[str] = Query(None, description="Comma-separated API names; all APIs when omitted"),
+    api_key: str = Depends(verify_api_key)
+):
+    """Stream live health, threshold and spike updates as server-sent events.
+
+    The first event is a snapshot of the subscribed APIs; later events
+    carry only the fields that changed. Adaptive thresholds of an API's
+    metrics are keyed `threshold:<api>.<metric>`, e.g.
+    `threshold:payments.latency`.
+    """
+    try:
+        subscription = controller.hub.subscribe(_api_set(apis))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HubFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    async def events():
+        try:
+            async for message in subscription.messages(controller.hub.heartbeat_seconds):
+                yield ": keepalive\n\n" if message == HEARTBEAT else f"data: {message}\n\n"
+        finally:
+            controller.hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@websocket_router.websocket("/ws")
+async def websocket_updates(websocket: WebSocket, apis: Optional[str] = None):
+    """WebSocket variant of /stream; authenticates with the X-API-Key header."""
+    if not is_valid_api_key(websocket.headers.get("x-api-key")):
+        await websocket.close(code=1008)
+        return
+    try:
+        subscription = controller.hub.subscribe(_api_set(apis))
+    except ValueError:
+        await websocket.close(code=1008)
+        return
+    except HubFull:
+        await websocket.close(code=1013)
+        return
+    await websocket.accept()
+
+    async def forward():
+        async for message in subscription.messages(controller.hub.heartbeat_seconds):
+            if message != HEARTBEAT:
+                await websocket.send_text(message)
+
+    async def receive():
+        # Only needed to notice the client going away
+        while True:
+            await websocket.receive_text()
+
+    tasks = [asyncio.ensure_future(forward()), asyncio.ensure_future(receive())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        controller.hub.unsubscribe(subscription)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if subscription.closed:
+        # Dropped as a slow consumer; the client should reconnect for a new snapshot
+        try:
+            await websocket.close(code=1013)
+        except (RuntimeError, WebSocketDisconnect):
+            pass
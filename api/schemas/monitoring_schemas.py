@@ -9,6 +9,9 @@ class MetricData(BaseModel):
     error_rate: float = Field(..., ge=0, le=1)
     traffic: float = Field(..., ge=0)
 
+class BatchQuery(BaseModel):
+    apis: List[str] = Field(..., min_items=1, max_items=1000)  # names or globs like "pay-*"
+
 class ThresholdConfig(BaseModel):
     window_size: int = Field(default=300, gt=0)
     sensitivity: float = Field(default=2.0, gt=0)
@@ -18,7 +21,7 @@ class AnalysisResponse(BaseModel):
     timestamp: datetime
     current_threshold: float
     is_spike: bool
-    health_score: float
+    health_score: Optional[float]  # None when no health component applies
     status: str
     needs_attention: bool
     details: Optional[Dict] = None
\ No newline at end of file
@@ -0,0 +1,373 @@
+# benchmarks/http_load.py
+"""In-process HTTP load harness for the FastAPI app.
+
+    python benchmarks/http_load.py [--app api.main:app] [--mix ingest=60,health=25,...]
+                                   [--requests 5000] [--concurrency 32] [--output report.json]
+
+The app is driven through httpx's ASGI transport (or a running server via
+--url), with its startup and shutdown hooks run around the load. Slack,
+PagerDuty and Splunk are replaced by local stub servers whose provider
+configs are injected as `app.state.integrations` before startup; a server
+run with --url has to be configured with the stub URLs itself.
+
+X-API-Key defaults to the app's configured key (SMART_API_KEY or
+`auth.api_key` of config/default/api_config.yaml), falling back to
+'load-test-key', which an in-process app without a key is given; pass
+--api-key to match a --url server.
+Per route template the report gives request counts, status codes, p50/p99
+latency and RPS. In-process runs also split server time between each HTTP
+middleware, the API key dependency and the handlers.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+import argparse
+import asyncio
+import contextlib
+import functools
+import importlib
+import inspect
+import json
+import os
+import random
+import sys
+import time
+import numpy as np
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from api.config.api_config import API_KEY_ENV  # noqa: E402
+from benchmarks.stub_servers import StubIntegrations  # noqa: E402
+
+DEFAULT_MIX = 'ingest=55,health=25,analysis=15,context=5'
+DEFAULT_API_KEY = 'load-test-key'
+
+
+@dataclass
+class RequestSpec:
+    """One request of the mix: route template plus a concrete request."""
+    route: str
+    method: str
+    path: str
+    body: Optional[Dict] = None
+
+
+def _metric_body(api_name: str, rng: random.Random) -> Dict:
+    return {
+        'api_name': api_name,
+        'timestamp': datetime.now().isoformat(),
+        'latency': rng.gammavariate(4, 30),
+        'error_rate': min(rng.expovariate(50), 1.0),
+        'traffic': float(rng.randint(0, 500))
+    }
+
+
+REQUEST_BUILDERS: Dict[str, Callable[[str, random.Random], RequestSpec]] = {
+    'ingest': lambda api, rng: RequestSpec(
+        'POST /v1/monitoring/metrics', 'POST', '/v1/monitoring/metrics', _metric_body(api, rng)
+    ),
+    'health': lambda api, rng: RequestSpec(
+        'GET /v1/monitoring/health/{api_name}', 'GET', f'/v1/monitoring/health/{api}'
+    ),
+    'analysis': lambda api, rng: RequestSpec(
+        'POST /v1/analysis/metrics/{api_name}', 'POST', f'/v1/analysis/metrics/{api}',
+        _metric_body(api, rng)
+    ),
+    'context': lambda api, rng: RequestSpec(
+        'GET /v1/context/{api_name}', 'GET', f'/v1/context/{api}'
+    ),
+    'root_health': lambda api, rng: RequestSpec('GET /health', 'GET', '/health'),
+}
+
+
+def parse_mix(mix: str) -> List[Tuple[str, float]]:
+    """Parse 'kind=weight,...' into normalized request kind weights."""
+    weights = []
+    for part in mix.split(','):
+        kind, _, weight = part.partition('=')
+        if kind.strip() not in REQUEST_BUILDERS:
+            raise ValueError(f"Unknown request kind '{kind}', expected one of {sorted(REQUEST_BUILDERS)}")
+        weights.append((kind.strip(), float(weight or 1)))
+    total = sum(weight for _, weight in weights)
+    return [(kind, weight / total) for kind, weight in weights]
+
+
+def build_requests(mix: List[Tuple[str, float]], count: int, num_apis: int,
+                   seed: int) -> List[RequestSpec]:
+    """Pre-build a seeded request sequence so client cost stays out of the timings."""
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in mix]
+    weights = [weight for _, weight in mix]
+    api_names = [f"api_{i:03d}" for i in range(num_apis)]
+    return [
+        REQUEST_BUILDERS[rng.choices(kinds, weights)[0]](rng.choice(api_names), rng)
+        for _ in range(count)
+    ]
+
+
+class StageTimer:
+    """Collects self-time per server stage, in nanoseconds."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[int]] = defaultdict(list)
+
+    def record(self, stage: str, duration_ns: int):
+        self.samples[stage].append(duration_ns)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for stage, samples in self.samples.items():
+            values = np.asarray(samples) / 1e6
+            result[stage] = {
+                'count': len(values),
+                'total_ms': round(float(values.sum()), 3),
+                'mean_ms': round(float(values.mean()), 4),
+                'p50_ms': round(float(np.percentile(values, 50)), 4),
+                'p99_ms': round(float(np.percentile(values, 99)), 4)
+            }
+        return result
+
+
+def _probe_dispatch(name: str, dispatch: Callable, timer: StageTimer) -> Callable:
+    """Wrap an HTTP middleware so only its own work (not call_next) is timed."""
+    async def probed(request, call_next):
+        inner_ns = 0
+
+        async def timed_call_next(inner_request):
+            nonlocal inner_ns
+            start = time.perf_counter_ns()
+            try:
+                return await call_next(inner_request)
+            finally:
+                inner_ns += time.perf_counter_ns() - start
+
+        start = time.perf_counter_ns()
+        try:
+            return await dispatch(request, timed_call_next)
+        finally:
+            timer.record(f"middleware:{name}", time.perf_counter_ns() - start - inner_ns)
+    return probed
+
+
+def _probe_dependency(name: str, dependency: Callable, timer: StageTimer) -> Callable:
+    """Wrap an async dependency, keeping its signature for FastAPI."""
+    @functools.wraps(dependency)
+    async def probed(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return await dependency(*args, **kwargs)
+        finally:
+            timer.record(f"dependency:{name}", time.perf_counter_ns() - start)
+    return probed
+
+
+class _TotalTimer:
+    """Outermost ASGI wrapper measuring whole in-app time per HTTP request."""
+
+    def __init__(self, app, timer: StageTimer):
+        self.app = app
+        self.timer = timer
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        start = time.perf_counter_ns()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.timer.record('total', time.perf_counter_ns() - start)
+
+
+def instrument_app(app, timer: StageTimer, lift_rate_limit: bool = True):
+    """Attach timing probes to the app's HTTP middleware and API key dependency."""
+    for middleware in app.user_middleware:
+        options = getattr(middleware, 'options', None) or getattr(middleware, 'kwargs', {})
+        dispatch = options.get('dispatch')
+        if dispatch is None:
+            continue
+        name = getattr(dispatch, '__name__', type(dispatch).__name__)
+        if lift_rate_limit and hasattr(dispatch, 'rate_limit'):
+            # Measure the limiter's bookkeeping without it rejecting the load
+            dispatch.rate_limit = float('inf')
+        options['dispatch'] = _probe_dispatch(name, dispatch, timer)
+
+    try:
+        from api.middleware.auth_middleware import verify_api_key
+    except ImportError:
+        verify_api_key = None
+    if verify_api_key is not None:
+        app.dependency_overrides[verify_api_key] = _probe_dependency(
+            'verify_api_key', verify_api_key, timer
+        )
+
+    app.middleware_stack = app.build_middleware_stack()
+    return _TotalTimer(app, timer)
+
+
+def load_app(target: str):
+    module_name, _, attr = target.partition(':')
+    return getattr(importlib.import_module(module_name), attr or 'app')
+
+
+def app_lifespan(app):
+    """The app's startup/shutdown as an async context manager on any Starlette version."""
+    context = app.router.lifespan_context
+    if inspect.isasyncgenfunction(context):
+        # Starlette < 0.16 keeps a bare async generator
+        context = contextlib.asynccontextmanager(context)
+    return context(app)
+
+
+def configured_api_key() -> str:
+    """The API key the app is configured with, or DEFAULT_API_KEY."""
+    try:
+        from api.config.api_config import APIConfig
+        return APIConfig(str(REPO_ROOT / 'config/default/api_config.yaml')).api_key or DEFAULT_API_KEY
+    except Exception:
+        return DEFAULT_API_KEY
+
+
+async def run_load(client: httpx.AsyncClient, requests: List[RequestSpec],
+                   concurrency: int, api_key: str) -> Tuple[Dict[str, Dict], float]:
+    """Send all requests with `concurrency` workers; return per-route stats and wall time."""
+    latencies: Dict[str, List[int]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    queue = iter(requests)
+
+    async def worker():
+        for spec in queue:
+            start = time.perf_counter_ns()
+            try:
+                response = await client.request(
+                    spec.method, spec.path, json=spec.body, headers={'X-API-Key': api_key}
+                )
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            latencies[spec.route].append(time.perf_counter_ns() - start)
+            statuses[spec.route][status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    routes = {}
+    for route, samples in latencies.items():
+        values = np.asarray(samples) / 1e6
+        routes[route] = {
+            'requests': len(values),
+            'status_codes': dict(statuses[route]),
+            'rps': round(len(values) / elapsed, 1),
+            'p50_ms': round(float(np.percentile(values, 50)), 3),
+            'p99_ms': round(float(np.percentile(values, 99)), 3),
+            'max_ms': round(float(values.max()), 3)
+        }
+    return routes, elapsed
+
+
+def attribute_time(stages: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    """Split total server time into middleware, auth and handler (incl. routing) shares."""
+    total = stages.get('total', {}).get('total_ms', 0.0)
+    if not total:
+        return {}
+    accounted = {
+        stage: summary['total_ms'] for stage, summary in stages.items() if stage != 'total'
+    }
+    shares = {stage: round(ms / total, 4) for stage, ms in accounted.items()}
+    shares['handlers_and_routing'] = round(1 - sum(accounted.values()) / total, 4)
+    return shares
+
+
+async def main_async(args) -> Dict:
+    mix = parse_mix(args.mix)
+    requests = build_requests(mix, args.requests, args.apis, args.seed)
+    report = {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(),
+            'target': args.url or args.app,
+            'mix': dict(mix),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'seed': args.seed
+        }
+    }
+
+    async with StubIntegrations(latency_seconds=args.stub_latency_ms / 1000) as stubs:
+        report['metadata']['integrations'] = stubs.provider_configs()
+        timer = StageTimer()
+
+        if args.url:
+            client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+            lifespan = contextlib.AsyncExitStack()
+        else:
+            # An app without a configured key accepts the one the load sends
+            os.environ.setdefault(API_KEY_ENV, args.api_key)
+            app = load_app(args.app)
+            app.state.integrations = stubs.provider_configs()
+            lifespan = app_lifespan(app)
+            transport = httpx.ASGITransport(app=instrument_app(app, timer, not args.keep_rate_limit))
+            client = httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=args.timeout)
+
+        async with lifespan, client:
+            if args.warmup:
+                await run_load(client, build_requests(mix, args.warmup, args.apis, args.seed + 1),
+                               args.concurrency, args.api_key)
+                timer.samples.clear()
+            routes, elapsed = await run_load(client, requests, args.concurrency, args.api_key)
+
+        report['routes'] = routes
+        report['overall'] = {
+            'seconds': round(elapsed, 3),
+            'rps': round(len(requests) / elapsed, 1)
+        }
+        if not args.url:
+            stages = timer.summary()
+            report['server_stages'] = stages
+            report['time_attribution'] = attribute_time(stages)
+        report['stub_requests'] = dict(stubs.requests)
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--app', default='api.main:app', help='ASGI app as module:attribute')
+    parser.add_argument('--url', help='Load a running server instead of the in-process app')
+    parser.add_argument('--mix', default=DEFAULT_MIX,
+                        help=f"Request kinds and weights, from {sorted(REQUEST_BUILDERS)}")
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--warmup', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--apis', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--api-key', default=configured_api_key(),
+                        help='Value sent as X-API-Key (default: auth.api_key of the API config)')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--stub-latency-ms', type=float, default=0.0)
+    parser.add_argument('--keep-rate-limit', action='store_true',
+                        help='Keep the configured rate limit instead of lifting it')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args(argv)
+
+    try:
+        report = asyncio.run(main_async(args))
+    except ImportError as e:
+        # The app (or one of its routers) could not be imported
+        print(json.dumps({'error': f"Cannot load {args.app}: {type(e).__name__}: {e}"}, indent=2))
+        return 1
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,375 @@
+# benchmarks/run_benchmarks.py
+"""Throughput and latency benchmarks for the ingestion and analysis hot paths.
+
+    python benchmarks/run_benchmarks.py [--scale small|medium|large] [--only NAME ...]
+                                        [--output report.json] [--baseline previous.json]
+
+Each benchmark imports what it measures itself, so a module that fails to
+import is reported as an error for that benchmark only. With --baseline the
+report includes the relative change of every throughput figure, and the
+exit status is non-zero if any benchmark slowed down beyond --tolerance.
+"""
+
+from typing import Callable, Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import traceback
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.synthetic import (  # noqa: E402
+    TrafficProfile, generate_traffic, generate_dependency_graph, to_log_records
+)
+
+SCALES = {
+    'small': {'num_apis': 5, 'hours': 6, 'graph_apis': 100, 'per_point_limit': 20_000},
+    'medium': {'num_apis': 20, 'hours': 24, 'graph_apis': 500, 'per_point_limit': 100_000},
+    'large': {'num_apis': 100, 'hours': 24 * 7, 'graph_apis': 2000, 'per_point_limit': 500_000},
+}
+
+
+@dataclass
+class BenchmarkContext:
+    """Shared, lazily generated inputs for one benchmark run."""
+    scale: str
+    seed: int
+
+    def __post_init__(self):
+        self.settings = SCALES[self.scale]
+        self._traffic = None
+        self._graph = None
+
+    @property
+    def traffic(self):
+        if self._traffic is None:
+            profile = TrafficProfile(
+                num_apis=self.settings['num_apis'],
+                duration=timedelta(hours=self.settings['hours'])
+            )
+            self._traffic = generate_traffic(profile, self.seed)
+        return self._traffic
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            self._graph = generate_dependency_graph(self.settings['graph_apis'], seed=self.seed)
+        return self._graph
+
+    @property
+    def per_point_limit(self) -> int:
+        return self.settings['per_point_limit']
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], Dict]] = {}
+
+
+def benchmark(name: str):
+    def register(func: Callable[[BenchmarkContext], Dict]):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def time_calls(func: Callable, args: List[tuple]) -> Dict[str, float]:
+    """Call `func(*a)` for each argument tuple, timing every call."""
+    durations = np.empty(len(args), dtype=np.int64)
+    clock = time.perf_counter_ns
+    started = clock()
+    for index, call_args in enumerate(args):
+        start = clock()
+        func(*call_args)
+        durations[index] = clock() - start
+    return summarize(len(args), (clock() - started) / 1e9, durations)
+
+
+def time_block(func: Callable[[], object], items: int, repeat: int = 3) -> Dict[str, float]:
+    """Time a whole-batch call, keeping the fastest of `repeat` runs."""
+    best = min(_elapsed(func) for _ in range(repeat))
+    return summarize(items, best)
+
+
+def _elapsed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def summarize(items: int, seconds: float,
+              durations_ns: Optional[np.ndarray] = None) -> Dict[str, float]:
+    result = {
+        'items': items,
+        'seconds': round(seconds, 6),
+        'items_per_second': round(items / seconds, 1) if seconds else None
+    }
+    if durations_ns is not None and len(durations_ns):
+        p50, p99, p999 = np.percentile(durations_ns, [50, 99, 99.9]) / 1000
+        result.update({
+            'p50_us': round(float(p50), 3),
+            'p99_us': round(float(p99), 3),
+            'p999_us': round(float(p999), 3),
+            'max_us': round(float(durations_ns.max()) / 1000, 3)
+        })
+    return result
+
+
+def _metric_points(context: BenchmarkContext):
+    """First `per_point_limit` rows as (metric name, value, datetime) tuples."""
+    frame = context.traffic.head(context.per_point_limit)
+    times = frame['api_start_time'].dt.to_pydatetime()
+    names = (frame['api_source'].astype(str) + '.response_time').tolist()
+    return list(zip(names, frame['response_time'].tolist(), times))
+
+
+@benchmark('stream_processor.process_metric')
+def bench_stream_processor(context: BenchmarkContext) -> Dict:
+    from core.processors.threshold_processor import StreamProcessor
+
+    processor = StreamProcessor()
+    return time_calls(processor.process_metric, _metric_points(context))
+
+
+@benchmark('stream_processor.process_metric_batch')
+def bench_stream_processor_batch(context: BenchmarkContext) -> Dict:
+    from core.processors.threshold_processor import StreamProcessor
+
+    frame = context.traffic
+    batches = [
+        (f"{api}.response_time", group['response_time'].to_numpy(), group['timestamp'].to_numpy())
+        for api, group in frame.groupby('api_source', observed=True)
+    ]
+
+    def run():
+        processor = StreamProcessor()
+        for metric_name, values, seconds in batches:
+            for start in range(0, len(values), 360):
+                processor.process_metric_batch(
+                    metric_name, values[start:start + 360], seconds[start:start + 360]
+                )
+    return time_block(run, len(frame))
+
+
+@benchmark('real_time_monitor.process_log_entry')
+def bench_real_time_monitor(context: BenchmarkContext) -> Dict:
+    from core.processors.threshold_processor import RealTimeMonitor
+
+    monitor = RealTimeMonitor()
+    records = to_log_records(context.traffic.head(context.per_point_limit))
+    return time_calls(monitor.process_log_entry, [(record,) for record in records])
+
+
+@benchmark('real_time_monitor.process_log_frame')
+def bench_real_time_monitor_frame(context: BenchmarkContext) -> Dict:
+    from core.processors.threshold_processor import RealTimeMonitor
+
+    frame = context.traffic[['timestamp', 'response_time', 'error_rate', 'event_count']]
+    return time_block(lambda: RealTimeMonitor().process_log_frame(frame), len(frame))
+
+
+@benchmark('time_series_buffer.add_point')
+def bench_time_series_buffer(context: BenchmarkContext) -> Dict:
+    from core.storage.time_series_data_mgmt import TimeSeriesBuffer
+
+    # Retention is relative to the wall clock, so replay the traffic ending now
+    frame = context.traffic.head(min(context.per_point_limit, 20_000))
+    now = datetime.now()
+    offsets = (frame['timestamp'] - frame['timestamp'].iloc[-1]).to_numpy()
+    points = [
+        (api, now + timedelta(seconds=float(offset)), value)
+        for api, offset, value in zip(frame['api_source'].astype(str), offsets, frame['response_time'])
+    ]
+
+    buffer = TimeSeriesBuffer()
+    result = time_calls(buffer.add_point, points)
+
+    api_names = frame['api_source'].astype(str).unique().tolist()
+    window = (now - timedelta(hours=1), now)
+    result['get_range'] = time_calls(buffer.get_range, [(api, *window) for api in api_names] * 10)
+    return result
+
+
+@benchmark('metric_window.add_point')
+def bench_metric_window(context: BenchmarkContext) -> Dict:
+    from core.processors.threshold_processor import MetricWindow
+
+    window = MetricWindow(timedelta(minutes=30))
+    points = [(value, timestamp) for _, value, timestamp in _metric_points(context)]
+    result = time_calls(window.add_point, points)
+    result['get_statistics'] = time_calls(window.get_statistics, [()] * 1000)
+    return result
+
+
+@benchmark('metric_buffer.add_batch')
+def bench_metric_buffer(context: BenchmarkContext) -> Dict:
+    from core.storage.metric_buffer_mgmt import MetricBuffer
+
+    frame = context.traffic
+    batches = [
+        (str(api), {
+            'latency': group['response_time'].to_numpy(),
+            'error_rate': group['error_rate'].to_numpy(),
+            'traffic': group['event_count'].to_numpy(dtype=np.float64)
+        })
+        for api, group in frame.groupby('api_source', observed=True)
+    ]
+
+    buffer = MetricBuffer()
+
+    def run():
+        for api_name, columns in batches:
+            for start in range(0, len(columns['latency']), 360):
+                buffer.add_batch(
+                    api_name, {name: values[start:start + 360] for name, values in columns.items()}
+                )
+    result = time_block(run, len(frame))
+
+    api_names = [api_name for api_name, _ in batches]
+    result['get_statistics'] = time_calls(
+        buffer.get_statistics, [(api_name, 'latency') for api_name in api_names] * 100
+    )
+    result['get_all_statistics'] = time_calls(buffer.get_all_statistics, [()] * 100)
+    return result
+
+
+@benchmark('spike_detection.perform_spike_analysis')
+def bench_spike_analysis(context: BenchmarkContext) -> Dict:
+    from core.calculators.spike_detection import perform_spike_analysis
+
+    frame = context.traffic[['api_source', 'api_start_time', 'event_count']]
+    return time_block(lambda: perform_spike_analysis(frame.copy()), len(frame))
+
+
+@benchmark('health_analysis.calculate_health_metrics')
+def bench_health_metrics(context: BenchmarkContext) -> Dict:
+    from core.calculators.health_analysis import calculate_health_metrics
+
+    frame = context.traffic[[
+        'api_source', 'api_start_time', 'event_count', 'total_response_time', 'error_rate'
+    ]]
+    return time_block(lambda: calculate_health_metrics(frame.copy()), len(frame))
+
+
+@benchmark('dependency_analyzer')
+def bench_dependency_analyzer(context: BenchmarkContext) -> Dict:
+    from analysis.context.dependency_analyzer import Dependency, DependencyAnalyzer
+
+    now = datetime.now()
+    dependencies = [Dependency(*edge, last_updated=now) for edge in context.graph]
+    api_names = sorted({edge[0] for edge in context.graph} | {edge[1] for edge in context.graph})
+
+    analyzer = DependencyAnalyzer()
+    result = {'add_dependency': time_calls(analyzer.add_dependency, [(d,) for d in dependencies])}
+    result['get_impact_score'] = time_calls(analyzer.get_impact_score, [(api,) for api in api_names])
+    result['get_critical_path'] = time_calls(analyzer.get_critical_path, [(api,) for api in api_names])
+    result['analyze_cascading_impact'] = time_calls(
+        analyzer.analyze_cascading_impact, [(api,) for api in api_names]
+    )
+    result['analyze_all_cascading_impacts'] = time_block(
+        analyzer.analyze_all_cascading_impacts, len(api_names), repeat=1
+    )
+    return result
+
+
+@benchmark('stream_processor_module.import')
+def bench_stream_processor_module(context: BenchmarkContext) -> Dict:
+    start = time.perf_counter()
+    import core.processors.stream_processor  # noqa: F401
+    return summarize(1, time.perf_counter() - start)
+
+
+def run_benchmarks(names: List[str], context: BenchmarkContext) -> Dict[str, Dict]:
+    results = {}
+    for name in names:
+        try:
+            results[name] = {'ok': True, **BENCHMARKS[name](context)}
+        except Exception as e:
+            results[name] = {
+                'ok': False,
+                'error': f"{type(e).__name__}: {e}",
+                'traceback': traceback.format_exc(limit=3)
+            }
+        print(f"{name}: {'ok' if results[name]['ok'] else results[name]['error']}", file=sys.stderr)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> Dict[str, float]:
+    """Relative change of every items_per_second figure against a baseline run."""
+    changes = {}
+
+    def walk(current: Dict, previous: Dict, prefix: str):
+        for key, value in current.items():
+            if isinstance(value, dict) and isinstance(previous.get(key), dict):
+                walk(value, previous[key], f"{prefix}.{key}")
+            elif key == 'items_per_second' and value and previous.get(key):
+                changes[prefix] = round(value / previous[key] - 1, 4)
+
+    for name, result in results.items():
+        if result.get('ok') and baseline.get(name, {}).get('ok'):
+            walk(result, baseline[name], name)
+    return changes
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', nargs='*', choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--baseline', help='Previous JSON report to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Allowed throughput drop against the baseline (fraction)')
+    args = parser.parse_args(argv)
+
+    context = BenchmarkContext(args.scale, args.seed)
+    report = {
+        'metadata': {
+            'revision': _git_revision(),
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'scale': args.scale,
+            'seed': args.seed,
+            'settings': context.settings
+        },
+        'results': run_benchmarks(args.only or list(BENCHMARKS), context)
+    }
+
+    regressions = {}
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        report['comparison'] = compare(report['results'], baseline.get('results', {}))
+        regressions = {
+            name: change for name, change in report['comparison'].items()
+            if change < -args.tolerance
+        }
+        report['regressions'] = regressions
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        Path(args.output).write_text(output)
+    print(output)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
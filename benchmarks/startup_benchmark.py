@@ -0,0 +1,116 @@
+# benchmarks/startup_benchmark.py
+"""Measure cold import time of the service's entry points.
+
+Each module is imported in a fresh interpreter with `python -X importtime`
+and the report lists wall time, the slowest imports and any heavy
+libraries (model, plotting or UI frameworks) that were pulled in.
+
+    python benchmarks/startup_benchmark.py [module ...] [--output report.json]
+"""
+
+from typing import Dict, List, Optional
+from pathlib import Path
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = [
+    'api.main',
+    'api.routes.prediction_routes',
+    'api.routes.context_routes',
+    'core.processors.threshold_processor',
+    'core.processors.stream_processor',
+    'analysis.predictive.forecasting',
+]
+
+HEAVY_PACKAGES = (
+    'prophet', 'sklearn', 'scipy', 'plotly', 'streamlit',
+    'tensorflow', 'torch', 'matplotlib', 'statsmodels'
+)
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """Parse `-X importtime` lines into self/cumulative microseconds per module."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us)
+        })
+    return imports
+
+
+def measure_module(module: str, repeat: int = 3, top: int = 15) -> Dict:
+    """Import a module in fresh interpreters and summarize the best run."""
+    best: Optional[Dict] = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        wall_seconds = time.perf_counter() - start
+        if best is None or wall_seconds < best['wall_seconds']:
+            best = {'wall_seconds': wall_seconds, 'result': result}
+
+    result = best['result']
+    imports = parse_importtime(result.stderr)
+    top_level = {entry['module'].split('.')[0] for entry in imports}
+    error_lines = [
+        line for line in result.stderr.splitlines() if not line.startswith('import time:')
+    ]
+
+    return {
+        'module': module,
+        'ok': result.returncode == 0,
+        'error': error_lines[-1] if result.returncode and error_lines else None,
+        'wall_seconds': round(best['wall_seconds'], 4),
+        'import_seconds': round(
+            sum(entry['cumulative_us'] for entry in imports if entry['depth'] == 0) / 1e6, 4
+        ),
+        'module_count': len(imports),
+        'heavy_packages': sorted(top_level.intersection(HEAVY_PACKAGES)),
+        'slowest': [
+            {'module': entry['module'], 'cumulative_ms': entry['cumulative_us'] / 1000}
+            for entry in sorted(imports, key=lambda e: e['cumulative_us'], reverse=True)[:top]
+        ]
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--max-seconds', type=float,
+                        help='Exit non-zero if any module takes longer to import')
+    args = parser.parse_args(argv)
+
+    report = {
+        'python': sys.version.split()[0],
+        'results': [measure_module(module, args.repeat, args.top) for module in args.modules]
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    print(output)
+
+    if args.max_seconds is not None:
+        slow = [r for r in report['results'] if r['ok'] and r['wall_seconds'] > args.max_seconds]
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
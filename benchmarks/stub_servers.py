@@ -0,0 +1,90 @@
+# benchmarks/stub_servers.py
+"""Local aiohttp stand-ins for Slack, PagerDuty and Splunk HEC.
+
+Load tests point the integration clients at these servers so no traffic
+leaves the machine and third-party latency is a fixed, configurable delay.
+"""
+
+from typing import Dict, Optional
+from collections import Counter
+import asyncio
+from aiohttp import web
+
+
+class StubIntegrations:
+    """Runs the three stub services on one local port."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0,
+                 latency_seconds: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency_seconds = latency_seconds
+        self.requests: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+
+    def _build_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post('/slack/webhook', self._slack)
+        app.router.add_post('/pagerduty/incidents', self._pagerduty)
+        app.router.add_post('/splunk/services/collector/event', self._splunk)
+        return app
+
+    async def start(self) -> 'StubIntegrations':
+        self._runner = web.AppRunner(self._build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Resolve the ephemeral port picked by the OS
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> 'StubIntegrations':
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def provider_configs(self) -> Dict[str, Dict]:
+        """Provider configs that route every integration to the stubs."""
+        return {
+            'slack': {
+                'webhook_url': f"{self.base_url}/slack/webhook",
+                'default_channel': '#load-test'
+            },
+            'pagerduty': {
+                'api_key': 'load-test',
+                'service_id': 'load-test',
+                'api_url': f"{self.base_url}/pagerduty/incidents"
+            },
+            'splunk': {
+                'hec_url': f"{self.base_url}/splunk/services/collector/event",
+                'token': 'load-test'
+            }
+        }
+
+    async def _respond(self, service: str, request: web.Request) -> None:
+        self.requests[service] += 1
+        await request.read()
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+    async def _slack(self, request: web.Request) -> web.Response:
+        await self._respond('slack', request)
+        return web.Response(text='ok')
+
+    async def _pagerduty(self, request: web.Request) -> web.Response:
+        await self._respond('pagerduty', request)
+        return web.json_response({'incident': {'id': 'STUB', 'status': 'triggered'}}, status=201)
+
+    async def _splunk(self, request: web.Request) -> web.Response:
+        await self._respond('splunk', request)
+        return web.json_response({'text': 'Success', 'code': 0})
@@ -0,0 +1,116 @@
+# benchmarks/synthetic.py
+"""Seeded synthetic traffic for benchmarks.
+
+Every generator takes a seed, so the same arguments always produce the
+same data and benchmark runs stay comparable.
+"""
+
+from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+START_TIME = datetime(2024, 1, 1)
+
+
+@dataclass
+class TrafficProfile:
+    """Shape of the generated traffic for one run."""
+    num_apis: int = 20
+    duration: timedelta = timedelta(days=1)
+    interval_seconds: float = 10.0
+    base_events: float = 50.0
+    base_response_time: float = 120.0
+    base_error_rate: float = 0.01
+    diurnal_amplitude: float = 0.6
+    spike_probability: float = 0.002
+    spike_multiplier: float = 6.0
+    error_burst_probability: float = 0.001
+    error_burst_length: int = 30
+    error_burst_rate: float = 0.25
+
+
+def generate_traffic(profile: TrafficProfile = TrafficProfile(), seed: int = 42,
+                     start_time: datetime = START_TIME) -> pd.DataFrame:
+    """Generate per-API traffic rows with diurnal seasonality, spikes and error bursts.
+
+    Columns follow the log format used across the repo: api_source,
+    api_start_time, timestamp (epoch seconds), event_count, response_time,
+    total_response_time, error_rate, plus is_spike/is_error_burst labels.
+    """
+    rng = np.random.default_rng(seed)
+    steps = int(profile.duration.total_seconds() // profile.interval_seconds)
+    offsets = np.arange(steps) * profile.interval_seconds
+    start_epoch = start_time.timestamp()
+
+    # Diurnal load curve peaking mid-afternoon, with a per-API phase jitter
+    day_fraction = (offsets % 86400) / 86400
+    phases = rng.uniform(-0.05, 0.05, profile.num_apis)
+    load = 1 + profile.diurnal_amplitude * np.sin(
+        2 * np.pi * (day_fraction[None, :] - 0.375 + phases[:, None])
+    )
+    scale = rng.lognormal(0, 0.5, profile.num_apis)[:, None]
+
+    shape = (profile.num_apis, steps)
+    is_spike = rng.random(shape) < profile.spike_probability
+    events = rng.poisson(profile.base_events * scale * load * np.where(is_spike, profile.spike_multiplier, 1))
+
+    # Response time grows with load, with gamma-distributed noise
+    response_time = profile.base_response_time * (0.5 + 0.5 * load) * \
+        rng.gamma(8, 1 / 8, shape) * np.where(is_spike, 2.5, 1)
+
+    # Error bursts: a burst start lights up the following `error_burst_length` steps
+    burst_starts = (rng.random(shape) < profile.error_burst_probability).astype(np.int64)
+    burst_window = np.ones(profile.error_burst_length, dtype=np.int64)
+    is_error_burst = np.apply_along_axis(
+        lambda row: np.convolve(row, burst_window)[:steps] > 0, 1, burst_starts
+    )
+    error_rate = np.clip(
+        rng.normal(profile.base_error_rate, profile.base_error_rate / 3, shape), 0, 1
+    )
+    error_rate = np.where(is_error_burst, profile.error_burst_rate, error_rate)
+
+    api_names = [f"api_{i:03d}" for i in range(profile.num_apis)]
+    tiled_offsets = np.tile(offsets, profile.num_apis)
+    frame = pd.DataFrame({
+        'api_source': pd.Categorical(np.repeat(api_names, steps), categories=api_names),
+        'api_start_time': pd.Timestamp(start_time) + pd.to_timedelta(tiled_offsets, unit='s'),
+        'timestamp': start_epoch + tiled_offsets,
+        'event_count': events.ravel(),
+        'response_time': response_time.ravel(),
+        'total_response_time': (response_time * np.maximum(events, 1)).ravel(),
+        'error_rate': error_rate.ravel(),
+        'is_spike': is_spike.ravel(),
+        'is_error_burst': is_error_burst.ravel()
+    })
+    return frame.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def to_log_records(frame: pd.DataFrame) -> List[Dict]:
+    """Convert generated traffic to `RealTimeMonitor.process_log_entry` payloads."""
+    return frame[['timestamp', 'response_time', 'error_rate', 'event_count']].to_dict('records')
+
+
+def generate_dependency_graph(num_apis: int = 200, avg_dependencies: float = 3.0,
+                              seed: int = 42) -> List[Tuple[str, str, float, float, float]]:
+    """Generate an acyclic layered dependency graph.
+
+    Returns (source, target, criticality, latency_impact, error_rate)
+    tuples where sources only depend on APIs in lower layers, like
+    frontends calling services calling datastores.
+    """
+    rng = np.random.default_rng(seed)
+    api_names = [f"api_{i:03d}" for i in range(num_apis)]
+    edges = []
+    for index in range(1, num_apis):
+        count = min(index, rng.poisson(avg_dependencies))
+        for target in rng.choice(index, size=count, replace=False).tolist():
+            edges.append((
+                api_names[index],
+                api_names[target],
+                float(rng.beta(2, 3)),
+                float(rng.gamma(2, 20)),
+                float(rng.beta(1, 50))
+            ))
+    return edges
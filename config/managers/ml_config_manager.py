@@ -3,6 +3,7 @@ import yaml
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 import json
+from core.utils.lazy_imports import import_attr
 
 
 @dataclass
@@ -103,6 +104,7 @@ class ModelInitializer:
 
     def initialize_prophet_model(self):
         config = self.config_manager.get_model_config('prophet')
+        Prophet = import_attr('prophet', 'Prophet', 'prophet')
         return Prophet(**config.parameters)
 
     def initialize_lstm_model(self):
@@ -110,6 +112,9 @@ class ModelInitializer:
         return self._build_lstm_model(config.parameters)
 
     def _build_lstm_model(self, parameters):
+        Sequential = import_attr('tensorflow.keras.models', 'Sequential', 'tensorflow')
+        LSTM = import_attr('tensorflow.keras.layers', 'LSTM', 'tensorflow')
+        Dense = import_attr('tensorflow.keras.layers', 'Dense', 'tensorflow')
         model = Sequential()
         for layer in parameters['layers']:
             if layer['type'] == 'LSTM':
@@ -0,0 +1,243 @@
+# core/calculators/batch_detection.py
+
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Rows of window views processed at once, bounding MAD memory to block * window
+_MAD_BLOCK_ROWS = 1 << 15
+
+
+def rolling_zscores(values: np.ndarray, window: int) -> np.ndarray:
+    """Z-score of each point against the mean/std of the `window` points before it.
+
+    Uses prefix sums, so it is linear in the number of points. The first
+    `window` points have no history and score 0.
+    """
+    scores = np.zeros(values.size)
+    if values.size <= window:
+        return scores
+
+    centred = values - values.mean()
+    sums = np.concatenate(([0.0], np.cumsum(centred)))
+    squares = np.concatenate(([0.0], np.cumsum(centred * centred)))
+    window_sum = sums[window:-1] - sums[:-window - 1]
+    window_squares = squares[window:-1] - squares[:-window - 1]
+    mean = window_sum / window
+    std = np.sqrt(np.maximum(window_squares / window - mean * mean, 0.0))
+
+    deviation = centred[window:] - mean
+    scores[window:] = np.divide(deviation, std, out=np.zeros_like(deviation), where=std > 0)
+    return scores
+
+
+def rolling_mad_scores(values: np.ndarray, window: int) -> np.ndarray:
+    """Robust z-score of each point against the median/MAD of the `window` points before it."""
+    scores = np.zeros(values.size)
+    if values.size <= window:
+        return scores
+
+    history = sliding_window_view(values, window)[:-1]
+    current = values[window:]
+    for start in range(0, len(history), _MAD_BLOCK_ROWS):
+        block = history[start:start + _MAD_BLOCK_ROWS]
+        median = np.median(block, axis=1)
+        mad = np.median(np.abs(block - median[:, None]), axis=1)
+        deviation = 0.6745 * (current[start:start + len(block)] - median)
+        scores[window + start:window + start + len(block)] = np.divide(
+            deviation, mad, out=np.zeros_like(deviation), where=mad > 0
+        )
+    return scores
+
+
+def anomaly_intervals(
+        epoch_seconds: np.ndarray,
+        values: np.ndarray,
+        scores: np.ndarray,
+        threshold: float,
+        merge_gap: int = 0
+) -> List[Dict]:
+    """Collapse points scoring above the threshold into anomaly intervals.
+
+    Runs separated by at most `merge_gap` normal points are merged.
+    """
+    mask = np.abs(scores) > threshold
+    if not mask.any():
+        return []
+
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if merge_gap and len(starts) > 1:
+        keep = np.concatenate(([True], starts[1:] - ends[:-1] > merge_gap))
+        starts = starts[keep]
+        ends = np.concatenate((ends[:-1][keep[1:]], ends[-1:]))
+
+    magnitude = np.abs(scores)
+    peak_scores = np.maximum.reduceat(magnitude, starts)
+    intervals = []
+    for start, end, peak_score in zip(starts, ends, peak_scores):
+        peak = start + int(np.argmax(magnitude[start:end]))
+        intervals.append({
+            'start_time': datetime.fromtimestamp(epoch_seconds[start]),
+            'end_time': datetime.fromtimestamp(epoch_seconds[end - 1]),
+            'points': int(mask[start:end].sum()),
+            'peak_value': float(values[peak]),
+            'peak_score': float(peak_score)
+        })
+    return intervals
+
+
+def _best_split(sums: np.ndarray, start: int, end: int,
+                min_size: int) -> Tuple[Optional[int], float]:
+    """Split of [start, end) that most reduces the squared error around segment means."""
+    if end - start < 2 * min_size:
+        return None, 0.0
+
+    splits = np.arange(start + min_size, end - min_size + 1)
+    left_n = splits - start
+    right_n = end - splits
+    left_sum = sums[splits] - sums[start]
+    right_sum = sums[end] - sums[splits]
+    total_sum = sums[end] - sums[start]
+    # Reduction in squared error; the sum-of-squares terms cancel out
+    gain = left_sum ** 2 / left_n + right_sum ** 2 / right_n - total_sum ** 2 / (end - start)
+    best = int(np.argmax(gain))
+    return int(splits[best]), float(gain[best])
+
+
+def binary_segmentation(
+        values: np.ndarray,
+        max_changepoints: int = 10,
+        min_size: int = 30,
+        penalty: Optional[float] = None
+) -> List[int]:
+    """Indices where the mean of the series shifts, by greedy binary segmentation.
+
+    A split is accepted while it reduces the squared error by more than
+    `penalty`, which defaults to a BIC-style 2 * sigma^2 * log(n) with
+    sigma estimated robustly from successive differences.
+    """
+    n = values.size
+    if n < 2 * min_size:
+        return []
+    if penalty is None:
+        diffs = np.diff(values)
+        sigma = np.median(np.abs(diffs - np.median(diffs))) / 0.6745 / np.sqrt(2)
+        penalty = 2 * max(sigma * sigma, 1e-12) * np.log(n)
+
+    centred = values - values.mean()
+    sums = np.concatenate(([0.0], np.cumsum(centred)))
+
+    segments = [(0, n) + _best_split(sums, 0, n, min_size)]
+    changepoints = []
+    while segments and len(changepoints) < max_changepoints:
+        best = max(range(len(segments)), key=lambda i: segments[i][3])
+        start, end, split, gain = segments[best]
+        if split is None or gain <= penalty:
+            break
+        segments.pop(best)
+        changepoints.append(split)
+        segments.append((start, split) + _best_split(sums, start, split, min_size))
+        segments.append((split, end) + _best_split(sums, split, end, min_size))
+    return sorted(changepoints)
+
+
+def trend_slope(epoch_seconds: np.ndarray, values: np.ndarray) -> Dict[str, float]:
+    """Least-squares linear trend, with slope per hour."""
+    if values.size < 2:
+        return {'slope_per_hour': 0.0, 'intercept': float(values.mean()) if values.size else 0.0,
+                'r_squared': 0.0}
+
+    hours = (epoch_seconds - epoch_seconds[0]) / 3600
+    hours_centred = hours - hours.mean()
+    values_centred = values - values.mean()
+    variance = float(np.dot(hours_centred, hours_centred))
+    if variance == 0:
+        return {'slope_per_hour': 0.0, 'intercept': float(values.mean()), 'r_squared': 0.0}
+
+    slope = float(np.dot(hours_centred, values_centred)) / variance
+    total = float(np.dot(values_centred, values_centred))
+    residual = values_centred - slope * hours_centred
+    return {
+        'slope_per_hour': slope,
+        'intercept': float(values.mean() - slope * hours.mean()),
+        'r_squared': 1 - float(np.dot(residual, residual)) / total if total else 0.0
+    }
+
+
+def grouped_trend_slopes(counts: np.ndarray, epoch_seconds: np.ndarray,
+                         values: np.ndarray) -> Dict[str, np.ndarray]:
+    """`trend_slope` of many series at once.
+
+    The series are concatenated in `epoch_seconds`/`values`, each
+    time-ordered, with `counts[i]` points for series i. Per-series sums
+    come from bincount, so the cost is linear in the total points.
+    """
+    groups = np.repeat(np.arange(len(counts)), counts)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+    filled = np.maximum(counts, 1)
+    first = np.zeros(len(counts))
+    first[counts > 0] = epoch_seconds[starts[counts > 0]]
+
+    hours = (epoch_seconds - first[groups]) / 3600
+    hours_mean = np.bincount(groups, hours, len(counts)) / filled
+    values_mean = np.bincount(groups, values, len(counts)) / filled
+    hours_centred = hours - hours_mean[groups]
+    values_centred = values - values_mean[groups]
+    variance = np.bincount(groups, hours_centred * hours_centred, len(counts))
+    covariance = np.bincount(groups, hours_centred * values_centred, len(counts))
+    total = np.bincount(groups, values_centred * values_centred, len(counts))
+
+    fitted = (counts >= 2) & (variance > 0)
+    slope = np.divide(covariance, variance, out=np.zeros(len(counts)), where=fitted)
+    residual = values_centred - slope[groups] * hours_centred
+    residual_total = np.bincount(groups, residual * residual, len(counts))
+    r_squared = np.zeros(len(counts))
+    explained = fitted & (total > 0)
+    r_squared[explained] = 1 - residual_total[explained] / total[explained]
+    return {
+        'slope_per_hour': slope,
+        'intercept': np.where(counts > 0, values_mean - slope * hours_mean, 0.0),
+        'r_squared': r_squared
+    }
+
+
+def detect_patterns(epoch_seconds: np.ndarray, values: np.ndarray, config: Dict) -> Dict:
+    """Trend and mean-shift changepoints of a time-ordered batch."""
+    changepoints = binary_segmentation(
+        values,
+        config.get('max_changepoints', 10),
+        config.get('min_segment', 30),
+        config.get('changepoint_penalty')
+    )
+    bounds = [0] + changepoints + [values.size]
+    return {
+        'points': int(values.size),
+        'trend': trend_slope(epoch_seconds, values),
+        'changepoints': [
+            {
+                'time': datetime.fromtimestamp(epoch_seconds[split]),
+                'mean_before': float(values[bounds[i]:split].mean()),
+                'mean_after': float(values[split:bounds[i + 2]].mean())
+            }
+            for i, split in enumerate(changepoints)
+        ]
+    }
+
+
+def detect_anomalies(epoch_seconds: np.ndarray, values: np.ndarray, config: Dict) -> List[Dict]:
+    """Anomaly intervals of a time-ordered batch by rolling z-score or MAD."""
+    window = config.get('window', 60)
+    if config.get('method', 'zscore') == 'mad':
+        scores = rolling_mad_scores(values, window)
+    else:
+        scores = rolling_zscores(values, window)
+    return anomaly_intervals(
+        epoch_seconds,
+        values,
+        scores,
+        config.get('threshold', 3.5),
+        config.get('merge_gap', 0)
+    )
@@ -1,5 +1,7 @@
+import logging
 import pandas as pd
-import streamlit as st
+
+logger = logging.getLogger(__name__)
 
 def calculate_health_metrics(filtered_data):
     # Resample data and calculate event metrics
@@ -49,7 +51,6 @@ def calculate_health_metrics(filtered_data):
     )
 
     # Debugging: Check aggregated scores
-    st.write("Debugging: Aggregated Scores")
-    st.dataframe(aggregated_scores)
+    logger.debug("Aggregated scores:\n%s", aggregated_scores)
 
     return event_metrics, aggregated_scores
@@ -0,0 +1,139 @@
+# core/calculators/partial_aggregates.py
+
+from typing import Dict, Optional
+import math
+import numpy as np
+from core.calculators.quantile_sketch import QuantileSketch
+
+
+class PartialAggregate:
+    """Mergeable summary of a set of values: moments, extremes and a sketch."""
+    __slots__ = ('count', 'sum', 'sumsq', 'min', 'max', 'sketch')
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sketch = QuantileSketch()
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> 'PartialAggregate':
+        aggregate = cls()
+        if values.size:
+            aggregate.count = int(values.size)
+            aggregate.sum = float(values.sum())
+            aggregate.sumsq = float(np.dot(values, values))
+            aggregate.min = float(values.min())
+            aggregate.max = float(values.max())
+            aggregate.sketch.add_values(values)
+        return aggregate
+
+    def merge(self, other: 'PartialAggregate'):
+        self.count += other.count
+        self.sum += other.sum
+        self.sumsq += other.sumsq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def to_metrics(self) -> Dict[str, float]:
+        """The batch metrics (sample std, sketch p95) of the merged values."""
+        if not self.count:
+            return {'mean': math.nan, 'std': math.nan, 'min': math.nan,
+                    'max': math.nan, 'p95': math.nan}
+        mean = self.sum / self.count
+        variance = (self.sumsq - self.count * mean * mean) / (self.count - 1) \
+            if self.count > 1 else math.nan
+        return {
+            'mean': mean,
+            'std': math.sqrt(max(variance, 0.0)) if self.count > 1 else math.nan,
+            'min': self.min,
+            'max': self.max,
+            'p95': self.sketch.quantile(0.95)
+        }
+
+
+def build_chunk_aggregates(
+        epoch_seconds: np.ndarray,
+        values: np.ndarray,
+        chunk_seconds: int
+) -> Dict[int, PartialAggregate]:
+    """Partial aggregates of values grouped into fixed chunks by start time."""
+    chunks = (epoch_seconds // chunk_seconds).astype(np.int64) * chunk_seconds
+    order = np.argsort(chunks, kind='stable')
+    chunks, values = chunks[order], values[order]
+    starts, first = np.unique(chunks, return_index=True)
+    return {
+        int(start): PartialAggregate.from_values(part)
+        for start, part in zip(starts, np.split(values, first[1:]))
+    }
+
+
+class ChunkedAggregates:
+    """Per-API partial aggregates of closed time chunks.
+
+    A chunk is closed, and never recomputed, once the API's data has been
+    processed past its end. Window metrics merge the closed chunks with
+    aggregates of the newly fetched data, so work grows with the new data
+    rather than the window length. Windows are aligned down to whole chunks.
+    With `track_closed`, newly closed chunks are also queued for
+    `drain_closed`, e.g. to be persisted as rollups.
+    """
+
+    def __init__(self, chunk_seconds: int = 300, track_closed: bool = False):
+        self.chunk_seconds = chunk_seconds
+        self.track_closed = track_closed
+        self.chunks: Dict[str, Dict[int, PartialAggregate]] = {}
+        self.closed_until: Dict[str, int] = {}
+        self.newly_closed: Dict[str, Dict[int, PartialAggregate]] = {}
+
+    def align(self, epoch_seconds: float) -> int:
+        return int(epoch_seconds // self.chunk_seconds) * self.chunk_seconds
+
+    def fetch_start(self, api_name: str, window_start: float) -> int:
+        """Earliest time whose data is not yet covered by closed chunks."""
+        return max(self.align(window_start), self.closed_until.get(api_name, 0))
+
+    def window_metrics(
+            self,
+            api_name: str,
+            window_start: float,
+            new_chunks: Dict[int, PartialAggregate],
+            processed_until: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Merge closed and new chunks in the window, then close finished ones."""
+        start = self.align(window_start)
+        closed = self.chunks.setdefault(api_name, {})
+        for chunk_start in [c for c in closed if c < start]:
+            del closed[chunk_start]
+
+        total = PartialAggregate()
+        for chunk_start, aggregate in closed.items():
+            total.merge(aggregate)
+
+        frontier = self.closed_until.get(api_name, 0)
+        for chunk_start, aggregate in new_chunks.items():
+            if chunk_start < max(start, frontier):
+                continue
+            total.merge(aggregate)
+            if processed_until is not None and chunk_start + self.chunk_seconds <= processed_until:
+                closed[chunk_start] = aggregate
+                if self.track_closed:
+                    self.newly_closed.setdefault(api_name, {})[chunk_start] = aggregate
+        if processed_until is not None:
+            self.closed_until[api_name] = max(frontier, self.align(processed_until))
+        return total.to_metrics()
+
+    def drain_closed(self, api_name: str) -> Dict[int, PartialAggregate]:
+        """Chunks closed since the last drain, by chunk start."""
+        return self.newly_closed.pop(api_name, {})
+
+    def has_chunks(self, api_name: str) -> bool:
+        return bool(self.chunks.get(api_name))
+
+    def drop(self, api_name: str):
+        self.chunks.pop(api_name, None)
+        self.closed_until.pop(api_name, None)
+        self.newly_closed.pop(api_name, None)
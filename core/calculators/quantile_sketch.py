@@ -0,0 +1,145 @@
+# core/calculators/quantile_sketch.py
+
+from typing import Dict, Iterable, List, Union
+import math
+import numpy as np
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmically sized buckets (as in DDSketch),
+    so any quantile is returned within `relative_accuracy` of the true
+    value using memory bounded by `max_bins`. Values at or below
+    `min_value`, including zeros, share a single zero bucket.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01,
+                 max_bins: int = 2048,
+                 min_value: float = 1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """Add a single value."""
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def add_values(self, values: Union[np.ndarray, Iterable[float]]):
+        """Add many values in one vectorized pass."""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+
+        self.count += int(values.size)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        positive = values[values > self.min_value]
+        self.zero_count += int(values.size - positive.size)
+        if positive.size:
+            keys, counts = np.unique(
+                np.ceil(np.log(positive) / self._log_gamma).astype(np.int64),
+                return_counts=True
+            )
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                self.bins[key] = self.bins.get(key, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+
+    def merge(self, other: 'QuantileSketch'):
+        """Merge another sketch with the same accuracy into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def scale(self, factor: float):
+        """Scale every count, down-weighting the values seen so far."""
+        self.bins = {key: count * factor for key, count in self.bins.items()}
+        self.zero_count *= factor
+        self.count *= factor
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-th quantile (0 <= q <= 1)."""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Estimate several quantiles with a single pass over the buckets."""
+        qs = list(qs)
+        if not self.count:
+            return [math.nan] * len(qs)
+
+        keys = sorted(self.bins)
+        cumulative = np.cumsum([self.bins[key] for key in keys]) + self.zero_count
+        results = []
+        for q in qs:
+            rank = q * max(self.count - 1, 0)
+            if rank < self.zero_count:
+                value = 0.0
+            else:
+                key = keys[int(np.searchsorted(cumulative, rank, side='right'))]
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+            results.append(float(min(max(value, self.min), self.max)))
+        return results
+
+    def to_dict(self) -> Dict:
+        """Serialize the sketch to plain Python types."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_bins': self.max_bins,
+            'min_value': self.min_value,
+            'bins': {str(key): count for key, count in self.bins.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        """Restore a sketch serialized with `to_dict`."""
+        sketch = cls(data['relative_accuracy'], data['max_bins'], data['min_value'])
+        sketch.bins = {int(key): count for key, count in data['bins'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        if sketch.count:
+            sketch.min = data['min']
+            sketch.max = data['max']
+        return sketch
+
+    def _collapse(self):
+        """Fold the lowest buckets together to respect `max_bins`."""
+        keys = sorted(self.bins)
+        overflow = keys[:len(keys) - self.max_bins + 1]
+        folded = sum(self.bins.pop(key) for key in overflow)
+        target = keys[len(overflow)]
+        self.bins[target] = self.bins.get(target, 0) + folded
@@ -0,0 +1,138 @@
+# core/calculators/seasonal_profile.py
+
+from typing import Dict, Optional
+from datetime import date, datetime
+import numpy as np
+
+HOURS_PER_DAY = 24
+DAYS_PER_WEEK = 7
+HOURS_PER_WEEK = HOURS_PER_DAY * DAYS_PER_WEEK
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def hour_of_week(epoch_seconds: np.ndarray) -> np.ndarray:
+    """Map epoch seconds to hour-of-week slots, Monday 00:00 being slot 0."""
+    days = epoch_seconds // 86400
+    # 1970-01-01 was a Thursday
+    return ((days + 3) % DAYS_PER_WEEK) * HOURS_PER_DAY + (epoch_seconds // 3600) % HOURS_PER_DAY
+
+
+def week_index(epoch_seconds: np.ndarray) -> np.ndarray:
+    """Map epoch seconds to calendar weeks, weeks starting on Monday."""
+    return (epoch_seconds // 86400 + 3) // DAYS_PER_WEEK
+
+
+def _merge_moments(counts: np.ndarray, means: np.ndarray, m2s: np.ndarray,
+                   groups: np.ndarray, size: int):
+    """Combine per-slot count/mean/M2 into coarser groups."""
+    group_counts = np.bincount(groups, weights=counts, minlength=size)
+    group_sums = np.bincount(groups, weights=counts * means, minlength=size)
+    group_means = np.divide(group_sums, group_counts,
+                            out=np.zeros(size), where=group_counts > 0)
+    spread = counts * (means - group_means[groups]) ** 2
+    group_m2s = np.bincount(groups, weights=m2s + spread, minlength=size)
+    return group_counts, group_means, group_m2s
+
+
+class SeasonalProfile:
+    """Hour-of-week mean/variance maintained incrementally as points arrive.
+
+    Hour-of-day and day-of-week profiles are derived from the 168
+    hour-of-week slots by merging their moments, and are cached until
+    new points arrive.
+
+    With `half_life_weeks` set, every slot's weight decays exponentially
+    each time a new calendar week starts, so the profile follows a
+    drifting baseline instead of averaging over all history. Points are
+    weighted by the week they arrive in, not the one they belong to.
+    """
+
+    def __init__(self, half_life_weeks: Optional[float] = None):
+        self.counts = np.zeros(HOURS_PER_WEEK)
+        self.means = np.zeros(HOURS_PER_WEEK)
+        self.m2s = np.zeros(HOURS_PER_WEEK)
+        self.decay = 0.5 ** (1 / half_life_weeks) if half_life_weeks else 1.0
+        self.week: Optional[int] = None
+        self._derived: Optional[Dict[str, Dict[str, np.ndarray]]] = None
+
+    def add_point(self, value: float, timestamp: datetime):
+        """Add a single point with Welford's update."""
+        self._advance_week((timestamp.toordinal() - _EPOCH_ORDINAL + 3) // DAYS_PER_WEEK)
+        slot = timestamp.weekday() * HOURS_PER_DAY + timestamp.hour
+        self.counts[slot] += 1
+        delta = value - self.means[slot]
+        self.means[slot] += delta / self.counts[slot]
+        self.m2s[slot] += delta * (value - self.means[slot])
+        self._derived = None
+
+    def add_points(self, values: np.ndarray, epoch_seconds: np.ndarray):
+        """Merge a batch of points into the profile in one vectorized pass."""
+        if len(values) == 0:
+            return
+
+        self._advance_week(int(week_index(epoch_seconds.max())))
+        slots = hour_of_week(epoch_seconds)
+        batch_counts = np.bincount(slots, minlength=HOURS_PER_WEEK).astype(np.float64)
+        batch_sums = np.bincount(slots, weights=values, minlength=HOURS_PER_WEEK)
+        batch_means = np.divide(batch_sums, batch_counts,
+                                out=np.zeros(HOURS_PER_WEEK), where=batch_counts > 0)
+        batch_m2s = np.bincount(slots, weights=(values - batch_means[slots]) ** 2,
+                                minlength=HOURS_PER_WEEK)
+
+        # Chan et al. parallel merge of the batch moments into each slot
+        total = self.counts + batch_counts
+        populated = total > 0
+        delta = batch_means - self.means
+        weight = np.divide(batch_counts, total, out=np.zeros(HOURS_PER_WEEK), where=populated)
+        self.m2s += batch_m2s + delta * delta * self.counts * weight
+        self.means += delta * weight
+        self.counts = total
+        self._derived = None
+
+    def _advance_week(self, week: int):
+        """Decay the accumulated weight once per calendar week elapsed."""
+        if self.week is not None and week > self.week and self.decay < 1.0:
+            self.scale(self.decay ** (week - self.week))
+        if self.week is None or week > self.week:
+            self.week = week
+
+    def scale(self, factor: float):
+        """Scale the weight of everything seen so far; means are unchanged."""
+        self.counts *= factor
+        self.m2s *= factor
+        self._derived = None
+
+    def get_profiles(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Get count/mean/std arrays for hourly, daily and hour-of-week profiles."""
+        if self._derived is None:
+            slots = np.arange(HOURS_PER_WEEK)
+            self._derived = {
+                'hour_of_week': self._describe(self.counts, self.means, self.m2s),
+                'hourly': self._describe(*_merge_moments(
+                    self.counts, self.means, self.m2s, slots % HOURS_PER_DAY, HOURS_PER_DAY
+                )),
+                'daily': self._describe(*_merge_moments(
+                    self.counts, self.means, self.m2s, slots // HOURS_PER_DAY, DAYS_PER_WEEK
+                ))
+            }
+        return self._derived
+
+    @staticmethod
+    def _describe(counts: np.ndarray, means: np.ndarray, m2s: np.ndarray) -> Dict[str, np.ndarray]:
+        """Build mean, sample std and adjustment factor arrays for a profile."""
+        populated = counts > 0
+        stds = np.full(len(counts), np.nan)
+        has_spread = counts > 1
+        stds[has_spread] = np.sqrt(m2s[has_spread] / (counts[has_spread] - 1))
+
+        overall = means[populated].mean() if populated.any() else 0.0
+        factors = np.ones(len(counts))
+        if overall:
+            factors[populated] = means[populated] / overall
+
+        return {
+            'counts': counts,
+            'means': np.where(populated, means, np.nan),
+            'stds': stds,
+            'factors': factors
+        }
@@ -1,23 +1,131 @@
 # core/processors/batch_processor.py
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 import asyncio
 import logging
+import time
+import numpy as np
 import pandas as pd
+from core.calculators.batch_detection import detect_anomalies, detect_patterns
+from core.calculators.partial_aggregates import (
+    ChunkedAggregates,
+    PartialAggregate,
+    build_chunk_aggregates
+)
+from core.storage.history_store import HistoryStore, rollup_frame
 from core.storage.time_series_data_mgmt import TimeSeriesManager
-from analysis.ml_models.orchestrator import MLModelOrchestrator
+from analysis.ml_models.context import APIContext
+from core.utils.frames import build_metric_frame, local_epoch_seconds
+from core.utils.lazy_imports import import_attr
+from core.utils.tracing import tracer
+
+DEFAULT_CRITICALITY = 0.5
+
+
+def batch_arrays(timestamps_us: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Time-ordered epoch seconds and values of fetched points, from their
+    wall-clock microsecond timestamps."""
+    epoch_seconds = local_epoch_seconds(timestamps_us / 1e6)
+    order = np.argsort(epoch_seconds, kind='stable')
+    return epoch_seconds[order], values[order]
+
+
+def window_arrays(
+        previous: Optional[Tuple[np.ndarray, np.ndarray]],
+        window_start: float,
+        fetch_start: float,
+        epoch_seconds: np.ndarray,
+        values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Points of the whole window: previously seen points before `fetch_start`
+    followed by the newly fetched ones, all from `window_start` on."""
+    new_from = int(np.searchsorted(epoch_seconds, window_start))
+    if previous is None:
+        return epoch_seconds[new_from:], values[new_from:]
+    kept_epoch, kept_values = previous
+    first, last = np.searchsorted(kept_epoch, [window_start, fetch_start])
+    return (
+        np.concatenate((kept_epoch[first:last], epoch_seconds[new_from:])),
+        np.concatenate((kept_values[first:last], values[new_from:]))
+    )
+
+
+def aggregate_batch_chunks(
+        epoch_seconds: np.ndarray,
+        values: np.ndarray,
+        chunk_seconds: int
+) -> Tuple[Dict[int, PartialAggregate], Optional[float]]:
+    """Partial aggregates per chunk of newly fetched points, and the newest
+    point's epoch time."""
+    if not values.size:
+        return {}, None
+    return build_chunk_aggregates(epoch_seconds, values, chunk_seconds), float(epoch_seconds[-1])
 
 
 class BatchProcessor:
-    """Batch processing for historical analysis and model training."""
+    """Batch processing for historical analysis and model training.
+
+    Each scheduling cycle runs the per-API jobs concurrently, at most
+    `max_concurrent_batches` at a time, most stale and most critical APIs
+    first. APIs with no data newer than their watermark are skipped, and
+    the aggregation work runs on a thread or process pool so it does not
+    stall the event loop.
 
-    def __init__(self, config: Dict):
+    Batch metrics are incremental: only data past the last closed chunk is
+    fetched and aggregated, then merged with the cached chunk aggregates
+    for the rest of the window. The window's points are kept per API, so
+    patterns and anomalies are still detected over the whole window with
+    the vectorized kernels of `batch_detection`. When a history store is
+    configured, every closed chunk is written to it as a rollup row.
+    """
+
+    def __init__(
+            self,
+            config: Dict,
+            time_series_manager: Optional[TimeSeriesManager] = None,
+            contexts: Optional[Dict[str, APIContext]] = None,
+            history_store: Optional[HistoryStore] = None
+    ):
         self.config = config
-        self.time_series_manager = TimeSeriesManager()
-        self.ml_orchestrator = MLModelOrchestrator()
+        self.time_series_manager = time_series_manager or TimeSeriesManager()
+        self._ml_orchestrator = None
+        self.contexts: Dict[str, APIContext] = contexts or {}
+        self.watermarks: Dict[str, datetime] = {}
+        self.windows: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        if history_store is None and config.get('history_path'):
+            history_store = HistoryStore(config['history_path'])
+        self.history_store = history_store
+        self.aggregates = ChunkedAggregates(
+            config.get('batch_chunk_seconds', 300),
+            track_closed=history_store is not None
+        )
+        self.detection_config: Dict = config.get('batch_detection', {})
+        self.last_cycle: Dict = {}
+        self.executor = self._create_executor()
         self.logger = logging.getLogger(__name__)
 
+    def _create_executor(self) -> Executor:
+        workers = self.config.get('batch_workers')
+        if self.config.get('batch_executor', 'thread') == 'process':
+            return ProcessPoolExecutor(max_workers=workers)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch')
+
+    @property
+    def ml_orchestrator(self):
+        """Built on first model update, so batch analysis never loads model libraries."""
+        if self._ml_orchestrator is None:
+            self._ml_orchestrator = import_attr(
+                'analysis.ml_models.orchestrator', 'MLModelOrchestrator'
+            )()
+        return self._ml_orchestrator
+
+    def set_context(self, context: APIContext):
+        """Register an API's context, used to prioritise its batch jobs."""
+        self.contexts[context.name] = context
+
+    @tracer.traced('batch.process_batch')
     async def process_batch(
             self,
             api_name: str,
@@ -26,25 +134,54 @@ class BatchProcessor:
     ) -> Dict:
         """Process a batch of historical data."""
         try:
-            # Get data for time range
-            data = await self.time_series_manager.get_time_range(
-                api_name,
-                start_time,
-                end_time
+            # Get data not yet covered by closed chunks
+            fetch_start = datetime.fromtimestamp(
+                self.aggregates.fetch_start(api_name, start_time.timestamp())
             )
+            with tracer.span('batch.fetch', api_name=api_name):
+                timestamps_us, values = await self.time_series_manager.get_time_range_arrays(
+                    api_name,
+                    fetch_start,
+                    end_time
+                )
 
-            if not data:
+            if not len(values) and not self.aggregates.has_chunks(api_name):
                 return {'status': 'no_data'}
 
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
+            # Convert to epoch seconds in time order
+            loop = asyncio.get_running_loop()
+            with tracer.span('batch.to_arrays', rows=len(values)):
+                epoch_seconds, values = await loop.run_in_executor(
+                    self.executor, batch_arrays, timestamps_us, values
+                )
+                window = await loop.run_in_executor(
+                    self.executor,
+                    window_arrays,
+                    self.windows.get(api_name),
+                    start_time.timestamp(),
+                    fetch_start.timestamp(),
+                    epoch_seconds,
+                    values
+                )
+                self.windows[api_name] = window
 
             # Perform batch analysis
-            analysis_results = await self._analyze_batch(api_name, df)
+            with tracer.span('batch.analyze', rows=len(window[1])):
+                analysis_results = await self._analyze_batch(
+                    api_name, epoch_seconds, values, start_time, window
+                )
+
+            if self.history_store is not None:
+                with tracer.span('batch.write_history'):
+                    await self._write_history(api_name)
 
             # Update ML models if needed
             if self._should_update_models(api_name, analysis_results):
-                await self._update_models(api_name, df)
+                with tracer.span('batch.update_models'):
+                    await self._update_models(
+                        api_name,
+                        build_metric_frame(epoch_seconds, {'value': values})
+                    )
 
             return {
                 'api_name': api_name,
@@ -61,36 +198,82 @@ class BatchProcessor:
     async def _analyze_batch(
             self,
             api_name: str,
-            data: pd.DataFrame
+            epoch_seconds: np.ndarray,
+            values: np.ndarray,
+            start_time: datetime,
+            window: Tuple[np.ndarray, np.ndarray]
     ) -> Dict:
-        """Perform analysis on batch data."""
+        """Perform analysis on batch data: metrics from the newly fetched
+        points, patterns and anomalies over the whole window."""
+        metrics, patterns, anomalies = await asyncio.gather(
+            self._calculate_batch_metrics(api_name, epoch_seconds, values, start_time),
+            self._detect_patterns(*window),
+            self._detect_batch_anomalies(*window)
+        )
         analysis_results = {
-            'metrics': await self._calculate_batch_metrics(data),
-            'patterns': await self._detect_patterns(data),
-            'anomalies': await self._detect_batch_anomalies(data)
+            'metrics': metrics,
+            'patterns': patterns,
+            'anomalies': anomalies
         }
 
         return analysis_results
 
-    async def _calculate_batch_metrics(self, data: pd.DataFrame) -> Dict:
-        """Calculate aggregate metrics for batch."""
-        return {
-            'mean': data['value'].mean(),
-            'std': data['value'].std(),
-            'min': data['value'].min(),
-            'max': data['value'].max(),
-            'p95': data['value'].quantile(0.95)
-        }
+    async def _calculate_batch_metrics(
+            self,
+            api_name: str,
+            epoch_seconds: np.ndarray,
+            values: np.ndarray,
+            start_time: datetime
+    ) -> Dict:
+        """Calculate aggregate metrics for the window from cached and new chunks."""
+        loop = asyncio.get_running_loop()
+        new_chunks, processed_until = await loop.run_in_executor(
+            self.executor,
+            aggregate_batch_chunks,
+            epoch_seconds,
+            values,
+            self.aggregates.chunk_seconds
+        )
+        return self.aggregates.window_metrics(
+            api_name,
+            start_time.timestamp(),
+            new_chunks,
+            processed_until
+        )
 
-    async def _detect_patterns(self, data: pd.DataFrame) -> Dict:
-        """Detect patterns in batch data."""
-        # Implement pattern detection logic
-        pass
+    async def _detect_patterns(self, epoch_seconds: np.ndarray, values: np.ndarray) -> Dict:
+        """Detect trend and changepoints in batch data."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, detect_patterns, epoch_seconds, values, self.detection_config
+        )
 
-    async def _detect_batch_anomalies(self, data: pd.DataFrame) -> List[Dict]:
-        """Detect anomalies in batch data."""
-        # Implement batch anomaly detection
-        pass
+    async def _detect_batch_anomalies(
+            self,
+            epoch_seconds: np.ndarray,
+            values: np.ndarray
+    ) -> List[Dict]:
+        """Detect anomaly intervals in batch data."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, detect_anomalies, epoch_seconds, values, self.detection_config
+        )
+
+    async def _write_history(self, api_name: str):
+        """Persist the chunks closed by this batch as history rollups."""
+        closed = self.aggregates.drain_closed(api_name)
+        if not closed:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                self.executor,
+                self.history_store.write_rollups,
+                api_name,
+                rollup_frame(closed)
+            )
+        except Exception as e:
+            self.logger.error(f"Error writing history for {api_name}: {str(e)}")
 
     def _should_update_models(
             self,
@@ -108,24 +291,73 @@ class BatchProcessor:
         except Exception as e:
             self.logger.error(f"Error updating models: {str(e)}")
 
+    async def run_cycle(self, now: Optional[datetime] = None) -> Dict:
+        """Run one batch cycle over all APIs with new data."""
+        now = now or datetime.now()
+        started = time.perf_counter()
+        window = timedelta(hours=self.config['batch_window_hours'])
+
+        apis = await self._get_apis_for_batch_processing()
+        due = {}
+        for api in apis:
+            last_update = self.time_series_manager.last_update(api)
+            watermark = self.watermarks.get(api)
+            if last_update is not None and (watermark is None or last_update > watermark):
+                due[api] = last_update
+        ordered = sorted(due, key=lambda api: self._priority(api, now), reverse=True)
+        max_staleness = max(
+            ((now - self.watermarks[api]).total_seconds() for api in ordered if api in self.watermarks),
+            default=0.0
+        )
+
+        semaphore = asyncio.Semaphore(self.config.get('max_concurrent_batches', 8))
+
+        async def run_job(api: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.process_batch(api, now - window, now)
+                    self.watermarks[api] = due[api]
+                    return True
+                except Exception:
+                    return False
+
+        results = await asyncio.gather(*(run_job(api) for api in ordered))
+
+        duration = time.perf_counter() - started
+        self.last_cycle = {
+            'started_at': now,
+            'duration_seconds': duration,
+            'lag_seconds': max(duration - self.config['batch_interval_seconds'], 0.0),
+            'processed': sum(results),
+            'failed': len(results) - sum(results),
+            'skipped': len(apis) - len(ordered),
+            'max_staleness_seconds': max_staleness
+        }
+        return self.last_cycle
+
+    def _priority(self, api_name: str, now: datetime) -> float:
+        """Staleness weighted by criticality; never-processed APIs go first."""
+        watermark = self.watermarks.get(api_name)
+        if watermark is None:
+            return float('inf')
+        context = self.contexts.get(api_name)
+        criticality = context.criticality if context else DEFAULT_CRITICALITY
+        return (now - watermark).total_seconds() * (1 + criticality)
+
     async def schedule_batch_processing(self):
         """Schedule regular batch processing jobs."""
+        interval = self.config['batch_interval_seconds']
         while True:
             try:
-                # Get APIs requiring batch processing
-                apis = await self._get_apis_for_batch_processing()
-
-                # Process each API
-                for api in apis:
-                    end_time = datetime.now()
-                    start_time = end_time - timedelta(
-                        hours=self.config['batch_window_hours']
+                cycle = await self.run_cycle()
+                if cycle['lag_seconds'] > 0:
+                    self.logger.warning(
+                        f"Batch cycle took {cycle['duration_seconds']:.1f}s, "
+                        f"{cycle['lag_seconds']:.1f}s over the {interval}s interval"
                     )
 
-                    await self.process_batch(api, start_time, end_time)
-
                 # Wait for next batch window
-                await asyncio.sleep(self.config['batch_interval_seconds'])
+                await asyncio.sleep(max(interval - cycle['duration_seconds'], 0))
 
             except Exception as e:
                 self.logger.error(
@@ -135,5 +367,4 @@ class BatchProcessor:
 
     async def _get_apis_for_batch_processing(self) -> List[str]:
         """Get list of APIs that need batch processing."""
-        # Implement logic for determining which APIs need processing
-        pass
\ No newline at end of file
+        return self.time_series_manager.list_apis()
@@ -0,0 +1,231 @@
+# core/processors/log_ingestion.py
+
+from typing import Dict, Iterator, Optional, TextIO, Tuple, Union
+from io import StringIO
+from pathlib import Path
+import os
+import sys
+import threading
+import logging
+import numpy as np
+import pandas as pd
+from core.utils.frames import local_wall_seconds
+
+logger = logging.getLogger(__name__)
+
+METRIC_COLUMNS = ('response_time', 'error_rate', 'event_count')
+TIMESTAMP_COLUMN = 'timestamp'
+
+LogSource = Union[str, Path, TextIO]
+
+
+def detect_format(source: LogSource) -> str:
+    """Infer the log format from a file suffix, defaulting to JSON lines."""
+    if isinstance(source, (str, Path)) and Path(source).suffix.lower() == '.csv':
+        return 'csv'
+    return 'jsonl'
+
+
+def read_log_chunks(source: LogSource, fmt: Optional[str] = None,
+                    chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Read a JSON-lines or CSV log file (or '-' for stdin) in DataFrame chunks."""
+    fmt = fmt or detect_format(source)
+    if source == '-':
+        source = sys.stdin
+
+    if fmt == 'csv':
+        wanted = {TIMESTAMP_COLUMN, *METRIC_COLUMNS}
+        reader = pd.read_csv(source, chunksize=chunksize,
+                             usecols=lambda column: column in wanted)
+    elif fmt == 'jsonl':
+        reader = pd.read_json(source, lines=True, chunksize=chunksize,
+                              convert_dates=False, keep_default_dates=False)
+    else:
+        raise ValueError(f"Unsupported log format: {fmt}")
+
+    for chunk in reader:
+        if len(chunk):
+            yield chunk
+
+
+def extract_metrics(frame: pd.DataFrame) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Extract sorted wall-clock seconds and metric arrays from a log chunk.
+
+    Numeric timestamps are Unix epochs, string timestamps are parsed as
+    given. Rows without a usable timestamp are dropped and missing metric
+    values count as 0, as in `RealTimeMonitor.process_log_entry`.
+    """
+    if TIMESTAMP_COLUMN not in frame:
+        return np.empty(0), {}
+
+    timestamps = frame[TIMESTAMP_COLUMN]
+    if pd.api.types.is_numeric_dtype(timestamps):
+        epoch_seconds = timestamps.to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(epoch_seconds)
+        wall_seconds = local_wall_seconds(epoch_seconds[valid])
+    else:
+        parsed = pd.to_datetime(timestamps, errors='coerce')
+        valid = parsed.notna().to_numpy()
+        parsed = parsed[valid]
+        if getattr(parsed.dt, 'tz', None) is not None:
+            epoch_seconds = parsed.dt.tz_convert('UTC').dt.tz_localize(None) \
+                .to_numpy(dtype='datetime64[us]').astype(np.int64) / 1e6
+            wall_seconds = local_wall_seconds(epoch_seconds)
+        else:
+            wall_seconds = parsed.to_numpy(dtype='datetime64[us]').astype(np.int64) / 1e6
+
+    metrics = {}
+    for column in METRIC_COLUMNS:
+        if column in frame:
+            values = pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=np.float64)[valid]
+            metrics[column] = np.nan_to_num(values, nan=0.0)
+        else:
+            metrics[column] = np.zeros(len(wall_seconds))
+
+    # Log lines are usually ordered already; sort only when they are not
+    if len(wall_seconds) > 1 and np.any(np.diff(wall_seconds) < 0):
+        order = np.argsort(wall_seconds, kind='stable')
+        wall_seconds = wall_seconds[order]
+        metrics = {name: values[order] for name, values in metrics.items()}
+
+    return wall_seconds, metrics
+
+
+def iter_time_batches(wall_seconds: np.ndarray,
+                      batch_seconds: Optional[float]) -> Iterator[slice]:
+    """Split sorted timestamps into slices covering at most `batch_seconds` each."""
+    if not batch_seconds or not len(wall_seconds):
+        yield slice(0, len(wall_seconds))
+        return
+
+    buckets = np.floor(wall_seconds / batch_seconds)
+    edges = np.flatnonzero(np.diff(buckets)) + 1
+    bounds = [0, *edges.tolist(), len(wall_seconds)]
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        yield slice(start, stop)
+
+
+def replay_logs(monitor, source: LogSource, fmt: Optional[str] = None,
+                chunksize: int = 100_000,
+                batch_seconds: Optional[float] = 60.0) -> int:
+    """Feed a log file or stdin through a RealTimeMonitor in batches.
+
+    Each chunk is split into `batch_seconds` of event time so thresholds
+    evolve during the replay much as they would have live. Returns the
+    number of log rows processed.
+    """
+    rows = 0
+    for chunk in read_log_chunks(source, fmt, chunksize):
+        rows += monitor.process_log_frame(chunk, batch_seconds)
+    return rows
+
+
+class LogTailer:
+    """Follow a growing log file across rotations, yielding DataFrame batches.
+
+    Rotation is detected when the path points at a new inode or the file
+    shrinks below the current read position; the rest of the old file is
+    drained before the new one is opened from its start.
+    """
+
+    def __init__(self, path: Union[str, Path], fmt: Optional[str] = None,
+                 poll_interval: float = 1.0, max_lines: int = 10_000,
+                 from_start: bool = False):
+        self.path = Path(path)
+        self.fmt = fmt or detect_format(self.path)
+        self.poll_interval = poll_interval
+        self.max_lines = max_lines
+        self.from_start = from_start
+
+        self._file: Optional[TextIO] = None
+        self._inode: Optional[int] = None
+        self._header = ''
+        self._partial = ''
+
+    def follow(self, stop_event: Optional[threading.Event] = None) -> Iterator[pd.DataFrame]:
+        """Yield parsed batches of new lines until `stop_event` is set."""
+        stop_event = stop_event or threading.Event()
+        try:
+            while not stop_event.is_set():
+                if self._file is None and not self._open(self.from_start):
+                    stop_event.wait(self.poll_interval)
+                    continue
+
+                lines = self._read_lines()
+                if lines:
+                    frame = self._parse(lines)
+                    if frame is not None and len(frame):
+                        yield frame
+                    continue
+
+                if self._rotated():
+                    logger.info(f"Log file {self.path} rotated, reopening")
+                    self._close()
+                    self._open(from_start=True)
+                    continue
+
+                stop_event.wait(self.poll_interval)
+        finally:
+            self._close()
+
+    def _open(self, from_start: bool) -> bool:
+        try:
+            self._file = open(self.path, 'r')
+        except FileNotFoundError:
+            return False
+
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._partial = ''
+        if self.fmt == 'csv':
+            self._header = self._file.readline()
+        if not from_start:
+            self._file.seek(0, os.SEEK_END)
+        return True
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_lines(self) -> list:
+        """Read up to `max_lines` complete lines, keeping a trailing partial line."""
+        lines = []
+        while len(lines) < self.max_lines:
+            line = self._file.readline()
+            if not line:
+                break
+            if not line.endswith('\n'):
+                self._partial += line
+                break
+            lines.append(self._partial + line)
+            self._partial = ''
+        return lines
+
+    def _rotated(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        return stat.st_ino != self._inode or stat.st_size < self._file.tell()
+
+    def _parse(self, lines: list) -> Optional[pd.DataFrame]:
+        text = ''.join(lines)
+        try:
+            if self.fmt == 'csv':
+                return pd.read_csv(StringIO(self._header + text))
+            return pd.read_json(StringIO(text), lines=True,
+                                convert_dates=False, keep_default_dates=False)
+        except ValueError as e:
+            logger.warning(f"Skipping unparsable log batch from {self.path}: {e}")
+            return None
+
+
+def follow_logs(monitor, path: Union[str, Path], fmt: Optional[str] = None,
+                poll_interval: float = 1.0,
+                stop_event: Optional[threading.Event] = None) -> int:
+    """Tail a rotating log file into a RealTimeMonitor until stopped."""
+    rows = 0
+    tailer = LogTailer(path, fmt, poll_interval)
+    for frame in tailer.follow(stop_event):
+        rows += monitor.process_log_frame(frame, batch_seconds=None)
+    return rows
@@ -5,32 +5,45 @@ from datetime import datetime
 import asyncio
 from collections import deque
 import logging
+import numpy as np
+from analysis.ml_models.context import APIContext
 from core.storage.metric_buffer_mgmt import MetricBuffer
-from core.calculators.health_analysis import HealthCalculator
-from core.calculators.spike_detection import SpikeDetector
+from core.system.broadcast_hub import BroadcastHub
+from core.system.fleet_snapshot import DEFAULT_ERROR_THRESHOLD, DEFAULT_WEIGHTS, health_scores
+from core.utils.tracing import tracer
+
+DEFAULT_SPIKE_THRESHOLD = 3.0
+DEFAULT_SPIKE_MIN_POINTS = 30
 
 
 class StreamProcessor:
     """Real-time stream processing for API metrics."""
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, hub: Optional[BroadcastHub] = None,
+                 metric_buffer: Optional[MetricBuffer] = None):
         self.config = config
-        self.metric_buffer = MetricBuffer()
-        self.health_calculator = HealthCalculator()
-        self.spike_detector = SpikeDetector()
+        self.hub = hub
+        self.metric_buffer = metric_buffer or MetricBuffer(config.get('buffer_size', 1000))
+        self.weights = config.get('health_scoring', {}).get('weights', DEFAULT_WEIGHTS)
+        self.contexts: Dict[str, APIContext] = {
+            name: APIContext(name=name, **context)
+            for name, context in config.get('default_contexts', {}).items()
+        }
+        spikes = config.get('spike_detection', {})
+        self.spike_threshold = spikes.get('threshold_multiplier', DEFAULT_SPIKE_THRESHOLD)
+        self.spike_min_points = spikes.get('window_size', DEFAULT_SPIKE_MIN_POINTS)
         self.processing_queues: Dict[str, asyncio.Queue] = {}
         self.logger = logging.getLogger(__name__)
 
+    async def enqueue_metric(self, api_name: str, metric_data: Dict):
+        """Queue a metric event for the batched `start_processing` path."""
+        if api_name not in self.processing_queues:
+            self.processing_queues[api_name] = asyncio.Queue()
+        await self.processing_queues[api_name].put(metric_data)
+
     async def process_metric(self, api_name: str, metric_data: Dict) -> Dict:
-        """Process a single metric event."""
+        """Process a single metric event inline."""
         try:
-            # Ensure queue exists
-            if api_name not in self.processing_queues:
-                self.processing_queues[api_name] = asyncio.Queue()
-
-            # Add to processing queue
-            await self.processing_queues[api_name].put(metric_data)
-
             # Process metric
             processed_data = await self._process_single_metric(
                 api_name,
@@ -38,7 +51,8 @@ class StreamProcessor:
             )
 
             # Store in buffer
-            self.metric_buffer.add_metric(api_name, processed_data)
+            self.metric_buffer.add_metric(api_name, self._buffer_record(processed_data))
+            self._broadcast(api_name, processed_data)
 
             return processed_data
 
@@ -46,6 +60,7 @@ class StreamProcessor:
             self.logger.error(f"Error processing metric: {str(e)}")
             raise
 
+    @tracer.traced('stream.process_single_metric')
     async def _process_single_metric(
             self,
             api_name: str,
@@ -53,16 +68,18 @@ class StreamProcessor:
     ) -> Dict:
         """Process individual metric data point."""
         # Calculate health score
-        health_score = self.health_calculator.calculate_health_score(
-            api_name,
-            metric_data
-        )
+        with tracer.span('stream.health_score'):
+            health_score = self.calculate_health_score(
+                api_name,
+                metric_data['metrics']
+            )
 
         # Detect spikes
-        is_spike = self.spike_detector.detect_spike(
-            api_name,
-            metric_data
-        )
+        with tracer.span('stream.spike_detection'):
+            is_spike = self.detect_spike(
+                api_name,
+                metric_data['metrics']
+            )
 
         return {
             'api_name': api_name,
@@ -73,6 +90,44 @@ class StreamProcessor:
             'processed_at': datetime.now()
         }
 
+    def calculate_health_score(self, api_name: str, metrics: Dict) -> Optional[float]:
+        """0-100 health of one point, scored as the fleet snapshot scores an API."""
+        context = self.contexts.get(api_name)
+        expectations = (
+            [context.expected_latency, context.error_threshold, context.baseline_traffic]
+            if context is not None else [np.nan, DEFAULT_ERROR_THRESHOLD, np.nan]
+        )
+        point = np.array([
+            [metrics.get(name)] for name in ('latency', 'error_rate', 'traffic')
+        ], dtype=np.float64)
+        health = health_scores(
+            point[0], point[1], point[2],
+            *(np.array([expected], dtype=np.float64) for expected in expectations),
+            self.weights
+        )[0]
+        return None if np.isnan(health) else round(float(health), 2)
+
+    def detect_spike(self, api_name: str, metrics: Dict) -> bool:
+        """Whether traffic is `threshold_multiplier` standard deviations above the buffered mean."""
+        traffic = metrics.get('traffic')
+        stats = self.metric_buffer.get_statistics(api_name, 'traffic')
+        if traffic is None or stats.get('count', 0) < self.spike_min_points or not stats['std']:
+            return False
+        return (traffic - stats['mean']) / stats['std'] > self.spike_threshold
+
+    @staticmethod
+    def _buffer_record(processed_data: Dict) -> Dict[str, float]:
+        """Flatten a processed metric into the buffer's metric columns."""
+        return {
+            **processed_data['original_metrics'],
+            'health_score': processed_data['health_score']
+        }
+
+    def _broadcast(self, api_name: str, processed_data: Dict):
+        # Health is published from the fleet snapshot; per-point scores would flap
+        if self.hub is not None:
+            self.hub.publish(api_name, {'is_spike': bool(processed_data['is_spike'])})
+
     async def start_processing(self):
         """Start background processing tasks."""
         self.logger.info("Starting stream processor")
@@ -128,7 +183,14 @@ class StreamProcessor:
                 processed_metrics.append(processed)
 
             # Store batch results
-            self.metric_buffer.add_metric_batch(api_name, processed_metrics)
+            self.metric_buffer.add_metric_batch(
+                api_name,
+                [self._buffer_record(processed) for processed in processed_metrics]
+            )
+            # One update per batch: whether any point spiked
+            self._broadcast(api_name, {
+                'is_spike': any(processed['is_spike'] for processed in processed_metrics)
+            })
 
         except Exception as e:
             self.logger.error(f"Error processing batch: {str(e)}")
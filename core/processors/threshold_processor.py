@@ -1,76 +1,238 @@
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 import numpy as np
-from datetime import datetime, timedelta
-from collections import deque
+from datetime import datetime, timedelta, timezone
 import pandas as pd
-from scipy import stats
+from core.calculators.batch_detection import trend_slope
+from core.calculators.quantile_sketch import QuantileSketch
+from core.calculators.seasonal_profile import (
+    HOURS_PER_DAY, HOURS_PER_WEEK, SeasonalProfile, hour_of_week
+)
+from core.processors.threshold_scheduler import ThresholdScheduler
+from core.processors.log_ingestion import extract_metrics, iter_time_batches
+from core.storage.rollup_tiers import series_key
+from core.system.broadcast_hub import BroadcastHub
+
+DEFAULT_HALF_LIFE_WEEKS = 4.0
+
+
+def wall_seconds(timestamp: datetime) -> float:
+    """Seconds since the epoch of a timestamp's wall-clock reading"""
+    return timestamp.replace(tzinfo=timezone.utc).timestamp()
 
 
 @dataclass
 class MetricWindow:
     window_size: timedelta
-    data: deque
-    timestamp: deque
+    data: np.ndarray
+    timestamp: np.ndarray
 
-    def __init__(self, window_size: timedelta):
+    def __init__(self, window_size: timedelta, capacity: int = 1024):
         self.window_size = window_size
-        self.data = deque()
-        self.timestamp = deque()
+        # Live points occupy [_start, _end); timestamps are wall-clock epoch seconds
+        self.data = np.empty(capacity)
+        self.timestamp = np.empty(capacity)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
 
     def add_point(self, value: float, timestamp: datetime):
-        self.data.append(value)
-        self.timestamp.append(timestamp)
+        self._reserve(1)
+        self.data[self._end] = value
+        self.timestamp[self._end] = wall_seconds(timestamp)
+        self._end += 1
 
         # Remove old data points
-        while (timestamp - self.timestamp[0]) > self.window_size:
-            self.data.popleft()
-            self.timestamp.popleft()
+        self._evict()
+
+    def add_points(self, values: np.ndarray, epoch_seconds: np.ndarray):
+        """Add a time-ordered batch, copying only the points that stay in the window"""
+        if not len(values):
+            return
+
+        first = int(np.searchsorted(epoch_seconds, epoch_seconds[-1] - self.window_size.total_seconds()))
+        count = len(values) - first
+        self._reserve(count)
+        self.data[self._end:self._end + count] = values[first:]
+        self.timestamp[self._end:self._end + count] = epoch_seconds[first:]
+        self._end += count
+        self._evict()
+
+    @property
+    def latest_timestamp(self) -> Optional[datetime]:
+        if not len(self):
+            return None
+        return datetime.fromtimestamp(self.timestamp[self._end - 1], timezone.utc).replace(tzinfo=None)
+
+    def _evict(self):
+        cutoff = self.timestamp[self._end - 1] - self.window_size.total_seconds()
+        self._start += int(np.searchsorted(self.timestamp[self._start:self._end], cutoff))
+
+    def _reserve(self, count: int):
+        """Make room for `count` more points, compacting or growing the arrays"""
+        if self._end + count <= len(self.data):
+            return
+
+        size = len(self)
+        capacity = max(len(self.data), 2 * (size + count))
+        data = np.empty(capacity) if capacity > len(self.data) else self.data
+        timestamp = np.empty(capacity) if capacity > len(self.timestamp) else self.timestamp
+        data[:size] = self.data[self._start:self._end].copy()
+        timestamp[:size] = self.timestamp[self._start:self._end].copy()
+        self.data, self.timestamp = data, timestamp
+        self._start, self._end = 0, size
 
     def get_statistics(self) -> Dict[str, float]:
-        data_array = np.array(self.data)
+        data_array = self.data[self._start:self._end]
+        median, p95, p99 = np.percentile(data_array, [50, 95, 99])
         return {
             'mean': np.mean(data_array),
             'std': np.std(data_array),
-            'median': np.median(data_array),
-            'p95': np.percentile(data_array, 95),
-            'p99': np.percentile(data_array, 99)
+            'median': median,
+            'p95': p95,
+            'p99': p99
+        }
+
+
+class SeasonalBaseline(SeasonalProfile):
+    """Hour-of-week baseline of a metric with a quantile sketch per slot.
+
+    Every update is O(1) and every lookup reads a single slot, so the
+    cost of consulting the baseline does not grow with history length.
+    An all-hours sketch backs slots that have not seen enough data yet.
+    Moments and sketches decay together each week, so old weeks fade out
+    with a half-life of `half_life_weeks`.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01,
+                 half_life_weeks: Optional[float] = DEFAULT_HALF_LIFE_WEEKS):
+        super().__init__(half_life_weeks)
+        self.relative_accuracy = relative_accuracy
+        self.sketches: List[Optional[QuantileSketch]] = [None] * HOURS_PER_WEEK
+        self.overall_sketch = QuantileSketch(relative_accuracy)
+
+    def add_point(self, value: float, timestamp: datetime):
+        super().add_point(value, timestamp)
+        self._slot_sketch(timestamp.weekday() * HOURS_PER_DAY + timestamp.hour).add(value)
+        self.overall_sketch.add(value)
+
+    def add_points(self, values: np.ndarray, epoch_seconds: np.ndarray):
+        super().add_points(values, epoch_seconds)
+        slots = hour_of_week(epoch_seconds)
+        for slot in np.unique(slots).tolist():
+            self._slot_sketch(slot).add_values(values[slots == slot])
+        self.overall_sketch.add_values(values)
+
+    def get_slot_statistics(self, timestamp: datetime) -> Dict[str, float]:
+        """Get baseline statistics for the hour-of-week slot of a timestamp."""
+        slot = timestamp.weekday() * HOURS_PER_DAY + timestamp.hour
+        count = self.counts[slot]
+        if not count:
+            return {'count': 0}
+
+        p95, p99 = self.sketches[slot].quantiles([0.95, 0.99])
+        return {
+            'count': int(count),
+            'mean': float(self.means[slot]),
+            'std': float(np.sqrt(self.m2s[slot] / count)),
+            'p95': p95,
+            'p99': p99
         }
 
+    def get_overall_statistics(self) -> Dict[str, float]:
+        """Get baseline statistics across all hour-of-week slots."""
+        total = self.counts.sum()
+        if not total:
+            return {'count': 0}
+
+        mean = float(np.dot(self.counts, self.means) / total)
+        m2 = float(self.m2s.sum() + np.dot(self.counts, (self.means - mean) ** 2))
+        p95, p99 = self.overall_sketch.quantiles([0.95, 0.99])
+        return {
+            'count': int(total),
+            'mean': mean,
+            'std': float(np.sqrt(m2 / total)),
+            'p95': p95,
+            'p99': p99
+        }
+
+    def scale(self, factor: float):
+        super().scale(factor)
+        for sketch in self.sketches:
+            if sketch is not None:
+                sketch.scale(factor)
+        self.overall_sketch.scale(factor)
+
+    def _slot_sketch(self, slot: int) -> QuantileSketch:
+        sketch = self.sketches[slot]
+        if sketch is None:
+            sketch = QuantileSketch(self.relative_accuracy)
+            self.sketches[slot] = sketch
+        return sketch
+
 
 class AdaptiveThresholdManager:
-    def __init__(self, metric_name: str):
+    def __init__(self, metric_name: str, min_slot_samples: int = 30,
+                 half_life_weeks: Optional[float] = DEFAULT_HALF_LIFE_WEEKS):
         self.metric_name = metric_name
         self.short_window = MetricWindow(timedelta(minutes=30))
-        self.long_window = MetricWindow(timedelta(hours=24))
+        self.seasonal_baseline = SeasonalBaseline(half_life_weeks=half_life_weeks)
+        self.min_slot_samples = min_slot_samples
+        self.last_timestamp: Optional[datetime] = None
         self.baseline_stats: Optional[Dict[str, float]] = None
         self.current_threshold: float = 0
         self.adjustment_history: List[Tuple[datetime, float, str]] = []
 
     def add_metric(self, value: float, timestamp: datetime):
-        """Add new metric value to both windows"""
+        """Add new metric value to the recent window and seasonal baseline"""
         self.short_window.add_point(value, timestamp)
-        self.long_window.add_point(value, timestamp)
-
-    def calculate_adaptive_threshold(self) -> float:
-        """Calculate new threshold based on recent and historical data"""
+        self.seasonal_baseline.add_point(value, timestamp)
+        self.last_timestamp = timestamp
+
+    def add_metrics(self, values: np.ndarray, epoch_seconds: np.ndarray):
+        """Add a time-ordered batch of values keyed by wall-clock epoch seconds"""
+        if not len(values):
+            return
+        self.short_window.add_points(values, epoch_seconds)
+        self.seasonal_baseline.add_points(values, epoch_seconds.astype(np.int64))
+        self.last_timestamp = self.short_window.latest_timestamp
+
+    def calculate_adaptive_threshold(self, timestamp: Optional[datetime] = None) -> float:
+        """Calculate new threshold from recent data and the seasonal baseline"""
         short_stats = self.short_window.get_statistics()
-        long_stats = self.long_window.get_statistics()
+        baseline_stats = self._get_baseline_statistics(timestamp or self.last_timestamp)
+        if not baseline_stats['count']:
+            return short_stats['p95']
+        self.baseline_stats = baseline_stats
 
-        # Calculate dynamic components
-        recent_volatility = short_stats['std'] / short_stats['mean']
-        historical_volatility = long_stats['std'] / long_stats['mean']
+        # Compare recent volatility with what is normal for this hour of the week
+        recent_volatility = self._volatility(short_stats)
+        historical_volatility = self._volatility(baseline_stats)
 
         # Adjust threshold based on volatility comparison
         if recent_volatility > historical_volatility * 1.5:
             # High volatility period - use more conservative threshold
-            new_threshold = long_stats['p99']
+            new_threshold = baseline_stats['p99']
         else:
             # Normal volatility - use dynamic threshold
-            new_threshold = long_stats['p95'] + (short_stats['std'] * 2)
+            new_threshold = baseline_stats['p95'] + (short_stats['std'] * 2)
 
         return new_threshold
 
+    def _get_baseline_statistics(self, timestamp: Optional[datetime]) -> Dict[str, float]:
+        """Use the hour-of-week slot once it has enough samples, else all hours"""
+        if timestamp is not None:
+            slot_stats = self.seasonal_baseline.get_slot_statistics(timestamp)
+            if slot_stats['count'] >= self.min_slot_samples:
+                return slot_stats
+        return self.seasonal_baseline.get_overall_statistics()
+
+    @staticmethod
+    def _volatility(stats: Dict[str, float]) -> float:
+        return stats['std'] / stats['mean'] if stats['mean'] else 0.0
+
     def should_update_threshold(self, new_threshold: float) -> bool:
         """Determine if threshold should be updated"""
         if not self.current_threshold:
@@ -94,40 +256,68 @@ class AdaptiveThresholdManager:
         return None
 
 
+def threshold_key(metric_name: str) -> str:
+    """Hub key a metric's threshold updates are published under."""
+    return f"threshold:{metric_name}"
+
+
 class StreamProcessor:
-    def __init__(self):
+    def __init__(self, scheduler: Optional[ThresholdScheduler] = None,
+                 hub: Optional[BroadcastHub] = None):
         self.threshold_managers: Dict[str, AdaptiveThresholdManager] = {}
         self.alert_feedback: Dict[str, List[bool]] = {}  # Store alert accuracy feedback
+        self.threshold_scheduler = scheduler or ThresholdScheduler()
+        self.hub = hub
 
     def process_metric(self, metric_name: str, value: float, timestamp: datetime):
         """Process incoming metric"""
+        manager = self._get_manager(metric_name)
+        manager.add_metric(value, timestamp)
+
+        # Scheduling runs on event (wall-clock) time so replayed logs behave like live ones
+        now = wall_seconds(timestamp)
+        if self._should_check_threshold(metric_name, value):
+            self._recompute_threshold(metric_name, now)
+        for due_metric in self.threshold_scheduler.pop_due(now):
+            self._recompute_threshold(due_metric, now)
+
+    def process_metric_batch(self, metric_name: str, values: np.ndarray,
+                             epoch_seconds: np.ndarray):
+        """Process a time-ordered batch of one metric keyed by wall-clock epoch seconds"""
+        if not len(values):
+            return
+
+        self._get_manager(metric_name).add_metrics(values, epoch_seconds)
+
+        now = float(epoch_seconds[-1])
+        if self.threshold_scheduler.record_batch(metric_name, values):
+            self._recompute_threshold(metric_name, now)
+        for due_metric in self.threshold_scheduler.pop_due(now):
+            self._recompute_threshold(due_metric, now)
+
+    def _get_manager(self, metric_name: str) -> AdaptiveThresholdManager:
         if metric_name not in self.threshold_managers:
             self.threshold_managers[metric_name] = AdaptiveThresholdManager(metric_name)
+        return self.threshold_managers[metric_name]
 
-        manager = self.threshold_managers[metric_name]
-        manager.add_metric(value, timestamp)
+    def _should_check_threshold(self, metric_name: str, value: float) -> bool:
+        """Determine if the threshold is due by point count or a detected level shift"""
+        return self.threshold_scheduler.record(metric_name, value)
 
-        # Check for threshold updates periodically
-        if self._should_check_threshold(metric_name):
-            new_threshold = manager.update_threshold()
-            if new_threshold:
-                self._handle_threshold_update(metric_name, new_threshold)
-
-    def _should_check_threshold(self, metric_name: str) -> bool:
-        """Determine if we should check for threshold updates"""
-        # Implementation could consider:
-        # - Time since last check
-        # - Number of new data points
-        # - System load
-        # - Alert frequency
-        return True  # Simplified for example
+    def _recompute_threshold(self, metric_name: str, now: float):
+        """Recompute a metric's threshold and schedule its next time-based check"""
+        new_threshold = self.threshold_managers[metric_name].update_threshold()
+        self.threshold_scheduler.mark_recomputed(metric_name, now)
+        if new_threshold:
+            self._handle_threshold_update(metric_name, new_threshold)
 
     def _handle_threshold_update(self, metric_name: str, new_threshold: float):
         """Handle threshold update"""
         # Update alert rules
-        # Notify interested parties
+        # Notify interested parties; metrics are not API names, so they get their own stream key
+        if self.hub is not None:
+            self.hub.publish(threshold_key(metric_name), {'threshold': float(new_threshold)})
         # Log change
-        pass
 
     def add_alert_feedback(self, metric_name: str, was_useful: bool):
         """Add feedback about alert usefulness"""
@@ -154,9 +344,10 @@ class StreamProcessor:
 
 
 class RealTimeMonitor:
-    def __init__(self):
-        self.stream_processor = StreamProcessor()
+    def __init__(self, hub: Optional[BroadcastHub] = None):
+        self.stream_processor = StreamProcessor(hub=hub)
         self.metric_buffers: Dict[str, List[Tuple[datetime, float]]] = {}
+        self.trends: Dict[str, Dict] = {}
 
     def process_log_entry(self, log_data: Dict):
         """Process incoming log entry"""
@@ -167,6 +358,35 @@ class RealTimeMonitor:
             self.stream_processor.process_metric(metric_name, value, timestamp)
             self._buffer_metric(metric_name, timestamp, value)
 
+    def process_api_metrics(self, api_name: str, timestamp: datetime,
+                            metrics: Dict[str, Optional[float]]) -> Dict[str, float]:
+        """Process one API's metrics, each as its `series_key` series; returns current thresholds"""
+        thresholds = {}
+        for metric_type, value in metrics.items():
+            if value is None:
+                continue
+            series = series_key(api_name, metric_type)
+            self.stream_processor.process_metric(series, value, timestamp)
+            thresholds[metric_type] = float(self.stream_processor.threshold_managers[series].current_threshold)
+        return thresholds
+
+    def process_log_frame(self, frame: pd.DataFrame,
+                          batch_seconds: Optional[float] = 60.0) -> int:
+        """Process a chunk of parsed log rows in batches; returns rows processed"""
+        wall_seconds, metrics = extract_metrics(frame)
+        for batch in iter_time_batches(wall_seconds, batch_seconds):
+            self.process_log_batch(
+                wall_seconds[batch],
+                {metric_name: values[batch] for metric_name, values in metrics.items()}
+            )
+        return len(wall_seconds)
+
+    def process_log_batch(self, epoch_seconds: np.ndarray, metrics: Dict[str, np.ndarray]):
+        """Process time-ordered metric arrays keyed by wall-clock epoch seconds"""
+        for metric_name, values in metrics.items():
+            self.stream_processor.process_metric_batch(metric_name, values, epoch_seconds)
+            self._process_metric_batch(metric_name, epoch_seconds, values)
+
     def _extract_metrics(self, log_data: Dict) -> Dict[str, float]:
         """Extract metrics from log data"""
         # Implementation would depend on log format
@@ -188,27 +408,37 @@ class RealTimeMonitor:
 
     def _process_metric_buffer(self, metric_name: str):
         """Process accumulated metrics"""
-        buffer = self.metric_buffers[metric_name]
-        df = pd.DataFrame(buffer, columns=['timestamp', 'value'])
-
-        # Perform batch analysis
-        # - Check for trends
-        # - Detect seasonal patterns
-        # - Update baseline statistics
+        timestamps, values = zip(*self.metric_buffers[metric_name])
+        epoch_seconds = np.array(timestamps, dtype='datetime64[us]').astype(np.int64) / 1e6
+        self._process_metric_batch(metric_name, epoch_seconds, np.array(values))
 
         # Clear buffer
         self.metric_buffers[metric_name] = []
 
+    def _process_metric_batch(self, metric_name: str, epoch_seconds: np.ndarray,
+                              values: np.ndarray):
+        """Fit the trend of accumulated metrics; the stream processor already
+        keeps the seasonal baseline up to date"""
+        if len(values) < 2:
+            return
+        end_time = datetime.fromtimestamp(float(epoch_seconds[-1]), timezone.utc)
+        self.trends[metric_name] = {
+            'end_time': end_time.replace(tzinfo=None),
+            'points': len(values),
+            **trend_slope(np.asarray(epoch_seconds, dtype=np.float64), np.asarray(values, dtype=np.float64))
+        }
+
 
-# Example usage
-monitor = RealTimeMonitor()
+if __name__ == '__main__':
+    # Example usage
+    monitor = RealTimeMonitor()
 
-# Simulate incoming log entries
-sample_log = {
-    'timestamp': datetime.now().timestamp(),
-    'response_time': 150.0,
-    'error_rate': 0.02,
-    'event_count': 100
-}
+    # Simulate incoming log entries
+    sample_log = {
+        'timestamp': datetime.now().timestamp(),
+        'response_time': 150.0,
+        'error_rate': 0.02,
+        'event_count': 100
+    }
 
-monitor.process_log_entry(sample_log)
\ No newline at end of file
+    monitor.process_log_entry(sample_log)
@@ -0,0 +1,186 @@
+# core/processors/threshold_scheduler.py
+
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+import heapq
+import math
+import numpy as np
+
+
+@dataclass
+class RecomputePolicy:
+    """When to recompute the adaptive threshold of a metric."""
+    every_n_points: Optional[int] = 500
+    every_seconds: Optional[float] = 300.0
+    change_detection: bool = True
+    cusum_threshold: float = 8.0  # standard deviations of accumulated shift
+    cusum_drift: float = 0.5  # shift tolerated per point, in standard deviations
+    ewma_alpha: float = 0.01
+    warmup_points: int = 30
+
+
+class _MetricSchedule:
+    """Scheduling state of a single metric."""
+    __slots__ = (
+        'policy', 'points_since', 'count', 'mean', 'variance',
+        'cusum_high', 'cusum_low', 'due_at', 'generation'
+    )
+
+    def __init__(self, policy: RecomputePolicy):
+        self.policy = policy
+        self.points_since = 0
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.cusum_high = 0.0
+        self.cusum_low = 0.0
+        self.due_at = math.inf
+        self.generation = 0
+
+
+class ThresholdScheduler:
+    """Decides when each metric's threshold is recomputed.
+
+    A recompute is due after `every_n_points` new points, after
+    `every_seconds` have elapsed, or as soon as a two-sided CUSUM on
+    EWMA-standardized values detects a level shift. Time-based due
+    times of all metrics share one min-heap. When more metrics are
+    overdue than `max_due_per_tick`, point and time intervals are
+    stretched until the backlog clears, while change detection keeps
+    reacting to real shifts immediately.
+    """
+
+    def __init__(self, default_policy: Optional[RecomputePolicy] = None,
+                 max_due_per_tick: int = 100,
+                 max_stretch: float = 16.0):
+        self.default_policy = default_policy or RecomputePolicy()
+        self.max_due_per_tick = max_due_per_tick
+        self.max_stretch = max_stretch
+        self.stretch = 1.0
+        self.schedules: Dict[str, _MetricSchedule] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+
+    def set_policy(self, metric_name: str, policy: RecomputePolicy):
+        """Override the recompute policy of a metric."""
+        self._get_schedule(metric_name).policy = policy
+
+    def record(self, metric_name: str, value: float) -> bool:
+        """Record a new point and return whether to recompute immediately."""
+        schedule = self.schedules.get(metric_name)
+        if schedule is None:
+            schedule = self._get_schedule(metric_name)
+            self._update_statistics(schedule, value)
+            return True
+
+        schedule.points_since += 1
+        shifted = self._update_statistics(schedule, value)
+        return shifted or self._count_due(schedule)
+
+    def record_batch(self, metric_name: str, values: np.ndarray) -> bool:
+        """Record a batch of points and return whether to recompute immediately.
+
+        The CUSUM is advanced by the summed standardized deviations of the
+        batch, which matches the per-point update unless the statistic
+        would have been clipped at zero part-way through the batch.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not values.size:
+            return False
+
+        schedule = self.schedules.get(metric_name)
+        is_new = schedule is None
+        if is_new:
+            schedule = self._get_schedule(metric_name)
+
+        schedule.points_since += int(values.size)
+        policy = schedule.policy
+        shifted = False
+        if schedule.count >= policy.warmup_points and policy.change_detection:
+            std = math.sqrt(schedule.variance) or 1e-9
+            deviations = (values - schedule.mean) / std
+            schedule.cusum_high = max(0.0, schedule.cusum_high + float(np.sum(deviations - policy.cusum_drift)))
+            schedule.cusum_low = max(0.0, schedule.cusum_low - float(np.sum(deviations + policy.cusum_drift)))
+            shifted = max(schedule.cusum_high, schedule.cusum_low) > policy.cusum_threshold
+
+        # Fold the batch into the EWMA as one step weighted by its size
+        weight = 1.0 if shifted else 1 - (1 - policy.ewma_alpha) ** values.size
+        batch_mean = float(values.mean())
+        delta = batch_mean - schedule.mean if schedule.count else 0.0
+        schedule.mean = batch_mean if not schedule.count else schedule.mean + weight * delta
+        schedule.variance = (1 - weight) * (schedule.variance + weight * delta * delta) + \
+            weight * float(values.var())
+        schedule.count += int(values.size)
+
+        return is_new or shifted or self._count_due(schedule)
+
+    def pop_due(self, now: float) -> List[str]:
+        """Pop metrics whose time-based recompute is due, shedding load if behind."""
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.max_due_per_tick:
+            due_at, generation, metric_name = heapq.heappop(self._heap)
+            schedule = self.schedules[metric_name]
+            if generation == schedule.generation and due_at == schedule.due_at:
+                due.append(metric_name)
+
+        behind = bool(self._heap) and self._heap[0][0] <= now
+        if behind:
+            self.stretch = min(self.stretch * 2, self.max_stretch)
+        elif len(due) < self.max_due_per_tick // 2 and self.stretch > 1.0:
+            self.stretch = max(self.stretch / 2, 1.0)
+
+        return due
+
+    def mark_recomputed(self, metric_name: str, now: float):
+        """Reset counters of a metric and schedule its next time-based recompute."""
+        schedule = self._get_schedule(metric_name)
+        schedule.points_since = 0
+        schedule.cusum_high = 0.0
+        schedule.cusum_low = 0.0
+        schedule.generation += 1
+
+        interval = schedule.policy.every_seconds
+        if interval is None:
+            schedule.due_at = math.inf
+            return
+
+        schedule.due_at = now + interval * self.stretch
+        heapq.heappush(self._heap, (schedule.due_at, schedule.generation, metric_name))
+
+    def _count_due(self, schedule: _MetricSchedule) -> bool:
+        every_n_points = schedule.policy.every_n_points
+        return every_n_points is not None and \
+            schedule.points_since >= every_n_points * self.stretch
+
+    def _update_statistics(self, schedule: _MetricSchedule, value: float) -> bool:
+        """Update EWMA mean/variance and the CUSUM; return whether a shift was detected."""
+        policy = schedule.policy
+        schedule.count += 1
+        if schedule.count == 1:
+            schedule.mean = value
+            return False
+
+        shifted = False
+        if schedule.count > policy.warmup_points and policy.change_detection:
+            std = math.sqrt(schedule.variance) or 1e-9
+            deviation = (value - schedule.mean) / std
+            schedule.cusum_high = max(0.0, schedule.cusum_high + deviation - policy.cusum_drift)
+            schedule.cusum_low = max(0.0, schedule.cusum_low - deviation - policy.cusum_drift)
+            shifted = max(schedule.cusum_high, schedule.cusum_low) > policy.cusum_threshold
+
+        if shifted:
+            # Re-centre on the new level so one shift triggers one recompute
+            schedule.mean = value
+            return True
+
+        alpha = policy.ewma_alpha
+        delta = value - schedule.mean
+        schedule.mean += alpha * delta
+        schedule.variance = (1 - alpha) * (schedule.variance + alpha * delta * delta)
+        return False
+
+    def _get_schedule(self, metric_name: str) -> _MetricSchedule:
+        schedule = self.schedules.get(metric_name)
+        if schedule is None:
+            schedule = _MetricSchedule(self.default_policy)
+            self.schedules[metric_name] = schedule
+        return schedule
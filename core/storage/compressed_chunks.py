@@ -0,0 +1,211 @@
+# core/storage/compressed_chunks.py
+
+from typing import List, Optional, Tuple
+from array import array
+import numpy as np
+
+# Bit widths of the four delta-of-delta classes, picked by a 2-bit selector
+_DOD_WIDTHS = np.array([0, 8, 20, 64], dtype=np.int64)
+_ONE = np.uint64(1)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Bit length of each uint64 (0 for 0), exact over the full 64-bit range."""
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    # frexp's exponent is the bit length for integers below 2**53
+    high_bits = np.frexp(high)[1].astype(np.int64)
+    low_bits = np.frexp(low)[1].astype(np.int64)
+    return np.where(high_bits > 0, high_bits + 32, low_bits)
+
+
+def _pack_bits(values: np.ndarray, widths: np.ndarray) -> bytes:
+    """Concatenate the low `widths[i]` bits of each value, most significant first."""
+    total = int(widths.sum())
+    if not total:
+        return b''
+    starts = np.cumsum(widths) - widths
+    owner = np.repeat(np.arange(len(values)), widths)
+    shifts = (widths[owner] - 1 - (np.arange(total) - starts[owner])).astype(np.uint64)
+    bits = ((values[owner] >> shifts) & _ONE).astype(np.uint8)
+    return np.packbits(bits).tobytes()
+
+
+def _unpack_bits(data: bytes, widths: np.ndarray) -> np.ndarray:
+    """Inverse of `_pack_bits`."""
+    values = np.zeros(len(widths), dtype=np.uint64)
+    total = int(widths.sum())
+    if not total:
+        return values
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=total).astype(np.uint64)
+    starts = np.cumsum(widths) - widths
+    owner = np.repeat(np.arange(len(widths)), widths)
+    shifts = (widths[owner] - 1 - (np.arange(total) - starts[owner])).astype(np.uint64)
+    present = widths > 0
+    values[present] = np.bitwise_or.reduceat(bits << shifts, starts[present])
+    return values
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(values: np.ndarray) -> np.ndarray:
+    return (values >> _ONE).view(np.int64) ^ -(values & _ONE).view(np.int64)
+
+
+class CompressedChunk:
+    """Immutable block of points: delta-of-delta timestamps, XOR-encoded values.
+
+    Timestamps (int64 microseconds) are stored as the first timestamp,
+    the first delta and zigzagged delta-of-deltas in 0/8/20/64-bit classes,
+    so regular intervals cost 2 bits per point. Values are XORed with
+    their predecessor, as in Gorilla: repeats cost 1 bit, other values a
+    12-bit header (leading zeros, length) plus their meaningful bits.
+    Encoding and decoding are vectorized over the whole chunk.
+    """
+    __slots__ = ('count', 'start', 'end', 'first_timestamp', 'first_delta', 'first_value',
+                 'dod_selectors', 'dod_bits', 'xor_flags', 'xor_headers', 'xor_bits')
+
+    @classmethod
+    def encode(cls, timestamps: np.ndarray, values: np.ndarray) -> 'CompressedChunk':
+        chunk = cls()
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        value_bits = np.asarray(values, dtype=np.float64).view(np.uint64)
+        chunk.count = len(timestamps)
+        chunk.start = int(timestamps.min())
+        chunk.end = int(timestamps.max())
+        chunk.first_timestamp = int(timestamps[0])
+        chunk.first_delta = int(timestamps[1] - timestamps[0]) if chunk.count > 1 else 0
+        chunk.first_value = int(value_bits[0])
+
+        zigzagged = _zigzag(np.diff(timestamps, n=2))
+        selectors = np.searchsorted(_DOD_WIDTHS, _bit_length(zigzagged))
+        chunk.dod_selectors = np.packbits(
+            np.stack([selectors >> 1, selectors & 1], axis=1).astype(np.uint8)
+        ).tobytes()
+        chunk.dod_bits = _pack_bits(zigzagged, _DOD_WIDTHS[selectors])
+
+        xors = value_bits[1:] ^ value_bits[:-1]
+        changed = xors != 0
+        chunk.xor_flags = np.packbits(changed).tobytes()
+        xors = xors[changed]
+        leading = 64 - _bit_length(xors)
+        trailing = _bit_length(xors & (~xors + _ONE)) - 1
+        lengths = 64 - leading - trailing
+        headers = (leading.astype(np.uint64) << np.uint64(6)) | (lengths - 1).astype(np.uint64)
+        chunk.xor_headers = _pack_bits(headers, np.full(len(headers), 12, dtype=np.int64))
+        chunk.xor_bits = _pack_bits(xors >> trailing.astype(np.uint64), lengths)
+        return chunk
+
+    def decode(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps (int64 microseconds) and float64 values of the chunk."""
+        n = self.count
+        timestamps = np.empty(n, dtype=np.int64)
+        timestamps[0] = self.first_timestamp
+        if n > 1:
+            selector_bits = np.unpackbits(
+                np.frombuffer(self.dod_selectors, dtype=np.uint8), count=2 * (n - 2)
+            ).astype(np.int64)
+            widths = _DOD_WIDTHS[selector_bits[0::2] * 2 + selector_bits[1::2]]
+            dods = _unzigzag(_unpack_bits(self.dod_bits, widths))
+            deltas = np.concatenate(([self.first_delta], self.first_delta + np.cumsum(dods)))
+            timestamps[1:] = self.first_timestamp + np.cumsum(deltas)
+
+        changed = np.unpackbits(
+            np.frombuffer(self.xor_flags, dtype=np.uint8), count=n - 1
+        ).astype(bool)
+        headers = _unpack_bits(self.xor_headers, np.full(int(changed.sum()), 12, dtype=np.int64))
+        leading = (headers >> np.uint64(6)).astype(np.int64)
+        lengths = (headers & np.uint64(63)).astype(np.int64) + 1
+        xors = np.zeros(n, dtype=np.uint64)
+        xors[0] = self.first_value
+        xors[1:][changed] = _unpack_bits(self.xor_bits, lengths) \
+            << (64 - leading - lengths).astype(np.uint64)
+        values = np.bitwise_xor.accumulate(xors).view(np.float64)
+        return timestamps, values
+
+    @property
+    def nbytes(self) -> int:
+        return (len(self.dod_selectors) + len(self.dod_bits) + len(self.xor_flags)
+                + len(self.xor_headers) + len(self.xor_bits) + 6 * 8)
+
+
+class CompressedSeries:
+    """Append-only series stored as sealed compressed chunks plus an open head.
+
+    Appends go to compact `array` buffers (16 bytes per point); every
+    `chunk_size` points the head is sealed into a `CompressedChunk`.
+    """
+
+    def __init__(self, chunk_size: int = 1024):
+        self.chunk_size = chunk_size
+        self.chunks: List[CompressedChunk] = []
+        self._head_timestamps = array('q')
+        self._head_values = array('d')
+
+    def __len__(self) -> int:
+        return sum(chunk.count for chunk in self.chunks) + len(self._head_timestamps)
+
+    def append(self, timestamp_us: int, value: float):
+        self._head_timestamps.append(timestamp_us)
+        self._head_values.append(value)
+        if len(self._head_timestamps) >= self.chunk_size:
+            self.seal()
+
+    def extend(self, timestamps_us: np.ndarray, values: np.ndarray):
+        timestamps_us = np.asarray(timestamps_us, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        start = 0
+        while start < len(timestamps_us):
+            room = self.chunk_size - len(self._head_timestamps)
+            self._head_timestamps.frombytes(timestamps_us[start:start + room].tobytes())
+            self._head_values.frombytes(values[start:start + room].tobytes())
+            start += room
+            if len(self._head_timestamps) >= self.chunk_size:
+                self.seal()
+
+    def seal(self):
+        """Compress the open head into a chunk."""
+        if not self._head_timestamps:
+            return
+        self.chunks.append(CompressedChunk.encode(
+            np.frombuffer(self._head_timestamps, dtype=np.int64),
+            np.frombuffer(self._head_values, dtype=np.float64)
+        ))
+        self._head_timestamps = array('q')
+        self._head_values = array('d')
+
+    def to_arrays(self, start_us: Optional[int] = None,
+                  end_us: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Points with start_us <= timestamp <= end_us, decoding only overlapping chunks."""
+        low = -2 ** 63 if start_us is None else start_us
+        high = 2 ** 63 - 1 if end_us is None else end_us
+        parts = [
+            chunk.decode() for chunk in self.chunks
+            if chunk.end >= low and chunk.start <= high
+        ]
+        if self._head_timestamps:
+            parts.append((np.frombuffer(self._head_timestamps, dtype=np.int64).copy(),
+                          np.frombuffer(self._head_values, dtype=np.float64).copy()))
+        if not parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        timestamps = np.concatenate([t for t, _ in parts])
+        values = np.concatenate([v for _, v in parts])
+        mask = (timestamps >= low) & (timestamps <= high)
+        return timestamps[mask], values[mask]
+
+    def evict_before(self, cutoff_us: int):
+        """Drop sealed chunks whose points are all older than the cutoff."""
+        keep = 0
+        while keep < len(self.chunks) and self.chunks[keep].end < cutoff_us:
+            keep += 1
+        if keep:
+            del self.chunks[:keep]
+
+    @property
+    def nbytes(self) -> int:
+        return (sum(chunk.nbytes for chunk in self.chunks)
+                + self._head_timestamps.itemsize * len(self._head_timestamps)
+                + self._head_values.itemsize * len(self._head_values))
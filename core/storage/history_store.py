@@ -0,0 +1,152 @@
+# core/storage/history_store.py
+
+from typing import Dict, List, Optional
+from datetime import date, datetime, timezone
+from pathlib import Path
+from urllib.parse import quote, unquote
+import uuid
+import numpy as np
+import pandas as pd
+from core.calculators.partial_aggregates import PartialAggregate
+from core.utils.frames import TIMESTAMP_COLUMN, build_metric_frame, epoch_ns
+from core.utils.lazy_imports import import_attr
+
+ROLLUP_COLUMNS = ('count', 'mean', 'std', 'min', 'max', 'p95')
+DEFAULT_HISTORY_ROOT = 'data/history'
+
+
+def rollup_frame(aggregates: Dict[int, PartialAggregate]) -> pd.DataFrame:
+    """One rollup row per chunk, keyed by chunk start epoch seconds."""
+    starts = sorted(aggregates)
+    metrics = [aggregates[start].to_metrics() for start in starts]
+    columns = {'count': np.array([aggregates[start].count for start in starts], dtype=np.int64)}
+    for name in ROLLUP_COLUMNS[1:]:
+        columns[name] = np.array([m[name] for m in metrics], dtype=np.float64)
+    return build_metric_frame(np.array(starts, dtype=np.float64), columns,
+                              keep_float64=ROLLUP_COLUMNS[1:])
+
+
+def rollup_schema():
+    """Fixed Arrow schema of rollup files, so appends never disagree on types."""
+    schema = import_attr('pyarrow', 'schema', 'pyarrow')
+    int64 = import_attr('pyarrow', 'int64', 'pyarrow')
+    float64 = import_attr('pyarrow', 'float64', 'pyarrow')
+    return schema(
+        [(TIMESTAMP_COLUMN, int64()), ('count', int64())]
+        + [(name, float64()) for name in ROLLUP_COLUMNS[1:]]
+    )
+
+
+class HistoryStore:
+    """Rolled-up per-API metric history in hive-partitioned Parquet files.
+
+    Files live under `<root>/api=<name>/date=<YYYY-MM-DD>/` (UTC dates), so
+    a query for one API only lists and reads that API's directory, and the
+    date partitions outside the range are pruned before any file is opened.
+    Within files, timestamp filters and column selection are pushed down
+    to the Parquet reader.
+    """
+
+    def __init__(self, root: str = DEFAULT_HISTORY_ROOT):
+        self.root = Path(root)
+
+    def _api_path(self, api_name: str) -> Path:
+        return self.root / f"api={quote(api_name, safe='')}"
+
+    def write_rollups(self, api_name: str, frame: pd.DataFrame):
+        """Append rollup rows (int64 ns `timestamp` plus the rollup columns) for an API.
+
+        Rows are written with `rollup_schema`, whatever the frame's dtypes.
+        """
+        if frame.empty:
+            return
+        Table = import_attr('pyarrow', 'Table', 'pyarrow')
+        array = import_attr('pyarrow', 'array', 'pyarrow')
+        write_to_dataset = import_attr('pyarrow.parquet', 'write_to_dataset', 'pyarrow')
+
+        days = frame[TIMESTAMP_COLUMN].to_numpy().view('datetime64[ns]').astype('datetime64[D]')
+        schema = rollup_schema()
+        table = Table.from_pandas(
+            frame[schema.names], schema=schema, preserve_index=False
+        ).append_column('date', array(days.astype(str)))
+        write_to_dataset(
+            table,
+            root_path=str(self._api_path(api_name)),
+            partition_cols=['date'],
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet"
+        )
+
+    def _dataset(self, api_name: str):
+        path = self._api_path(api_name)
+        if not path.exists():
+            return None
+        dataset = import_attr('pyarrow.dataset', 'dataset', 'pyarrow')
+        partitioning = import_attr('pyarrow.dataset', 'partitioning', 'pyarrow')
+        schema = import_attr('pyarrow', 'schema', 'pyarrow')
+        string = import_attr('pyarrow', 'string', 'pyarrow')
+        return dataset(
+            str(path),
+            format='parquet',
+            partitioning=partitioning(schema([('date', string())]), flavor='hive')
+        )
+
+    def query(
+            self,
+            api_name: str,
+            start_time: datetime,
+            end_time: datetime,
+            columns: Optional[List[str]] = None
+    ):
+        """Arrow table of an API's rollups with start_time <= timestamp <= end_time."""
+        dataset = self._dataset(api_name)
+        columns = [TIMESTAMP_COLUMN, *(columns or ROLLUP_COLUMNS)]
+        if dataset is None:
+            Table = import_attr('pyarrow', 'Table', 'pyarrow')
+            return Table.from_pydict({name: [] for name in columns})
+
+        field = import_attr('pyarrow.dataset', 'field', 'pyarrow')
+        start_ns, end_ns = epoch_ns(np.array([start_time.timestamp(), end_time.timestamp()]))
+        predicate = (
+            (field('date') >= self._utc_day(start_time).isoformat())
+            & (field('date') <= self._utc_day(end_time).isoformat())
+            & (field(TIMESTAMP_COLUMN) >= int(start_ns))
+            & (field(TIMESTAMP_COLUMN) <= int(end_ns))
+        )
+        table = dataset.to_table(columns=columns, filter=predicate)
+        return table.sort_by(TIMESTAMP_COLUMN)
+
+    def query_frame(
+            self,
+            api_name: str,
+            start_time: datetime,
+            end_time: datetime,
+            columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """`query` converted to pandas, reusing Arrow buffers where possible."""
+        table = self.query(api_name, start_time, end_time, columns)
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def compact_partition(self, api_name: str, day: date):
+        """Rewrite one API-day partition written in many small appends as a single file."""
+        path = self._api_path(api_name) / f"date={day.isoformat()}"
+        files = sorted(path.glob('*.parquet'))
+        if len(files) <= 1:
+            return
+        read_table = import_attr('pyarrow.parquet', 'read_table', 'pyarrow')
+        write_table = import_attr('pyarrow.parquet', 'write_table', 'pyarrow')
+        table = read_table([str(f) for f in files]).sort_by(TIMESTAMP_COLUMN)
+        if 'date' in table.column_names:
+            # Inferred from the directory name; the partition path already holds it
+            table = table.drop(['date'])
+        write_table(table, str(path / f"part-{uuid.uuid4().hex}-0.parquet"))
+        for old in files:
+            old.unlink()
+
+    def list_apis(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(unquote(p.name[len('api='):]) for p in self.root.glob('api=*') if p.is_dir())
+
+    @staticmethod
+    def _utc_day(moment: datetime) -> date:
+        return datetime.fromtimestamp(moment.timestamp(), tz=timezone.utc).date()
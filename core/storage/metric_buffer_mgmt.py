@@ -1,33 +1,169 @@
-from typing import Dict, List, Optional
-from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 
+METRIC_COLUMNS = ('latency', 'error_rate', 'traffic', 'health_score')
+
+
+def _summarize(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """count/mean/std/min/max/p95 along the last axis, ignoring NaN padding."""
+    ordered = np.sort(values, axis=-1)  # NaNs sort to the end
+    counts = np.count_nonzero(~np.isnan(ordered), axis=-1)
+    filled = np.maximum(counts, 1)
+    mean = np.nansum(ordered, axis=-1) / filled
+    deviations = np.where(np.isnan(ordered), 0.0, ordered - mean[..., None])
+    std = np.sqrt(np.einsum('...i,...i->...', deviations, deviations) / filled)
+
+    # Linear interpolation between order statistics, as np.percentile does
+    position = 0.95 * (filled - 1)
+    lower = np.floor(position).astype(np.int64)
+    upper = np.minimum(lower + 1, filled - 1)
+    low_value = np.take_along_axis(ordered, lower[..., None], axis=-1)[..., 0]
+    high_value = np.take_along_axis(ordered, upper[..., None], axis=-1)[..., 0]
+    p95 = low_value + (high_value - low_value) * (position - lower)
+
+    minimum = np.take_along_axis(ordered, np.zeros_like(lower)[..., None], axis=-1)[..., 0]
+    maximum = np.take_along_axis(ordered, (filled - 1)[..., None], axis=-1)[..., 0]
+    empty = counts == 0
+    return {
+        'count': counts,
+        'mean': np.where(empty, np.nan, mean),
+        'std': np.where(empty, np.nan, std),
+        'min': minimum,
+        'max': maximum,
+        'p95': p95
+    }
+
+
+def _scalar(name: str, value) -> float:
+    return int(value) if name == 'count' else float(value)
+
 
 class MetricBuffer:
-    def __init__(self, max_size: int = 1000):
+    """Fixed-size ring buffers of every metric column for every API.
+
+    API names are interned to integer rows of one preallocated
+    (apis, columns, max_size) array, so adds write straight into numpy
+    slots and statistics read contiguous views of it. Unfilled slots and
+    missing metrics hold NaN. Until a row wraps its points occupy
+    [0, size); after that the whole row is live, so ring order never
+    matters for the order-independent statistics kept here.
+    """
+
+    def __init__(self, max_size: int = 1000, columns: Sequence[str] = METRIC_COLUMNS,
+                 initial_apis: int = 16):
         self.max_size = max_size
-        self.buffers: Dict[str, deque] = {}
+        self.columns = tuple(columns)
+        self.column_ids = {name: i for i, name in enumerate(self.columns)}
+        self.api_ids: Dict[str, int] = {}
+        self.api_names: List[str] = []
+        self.values = np.full((initial_apis, len(self.columns), max_size), np.nan)
+        self.sizes = np.zeros(initial_apis, dtype=np.int64)
+        self.heads = np.zeros(initial_apis, dtype=np.int64)
 
-    def add_metric(self, api_name: str, metric_type: str, value: float):
-        """Add new metric to buffer."""
-        buffer_key = f"{api_name}:{metric_type}"
-        if buffer_key not in self.buffers:
-            self.buffers[buffer_key] = deque(maxlen=self.max_size)
+    def _api_id(self, api_name: str) -> int:
+        api_id = self.api_ids.get(api_name)
+        if api_id is not None:
+            return api_id
 
-        self.buffers[buffer_key].append(value)
+        api_id = len(self.api_names)
+        if api_id == len(self.values):
+            grown = np.full((2 * api_id, len(self.columns), self.max_size), np.nan)
+            grown[:api_id] = self.values
+            self.values = grown
+            self.sizes = np.resize(self.sizes, 2 * api_id)
+            self.heads = np.resize(self.heads, 2 * api_id)
+            self.sizes[api_id:] = 0
+            self.heads[api_id:] = 0
+        self.api_ids[api_name] = api_id
+        self.api_names.append(api_name)
+        return api_id
+
+    def add_metric(self, api_name: str, metrics: Dict[str, float]):
+        """Add one record of metric values; unknown names are ignored."""
+        api_id = self._api_id(api_name)
+        head = self.heads[api_id]
+        row = self.values[api_id, :, head]
+        row[:] = np.nan
+        for name, value in metrics.items():
+            column = self.column_ids.get(name)
+            if column is not None and value is not None:
+                row[column] = value
+        self.heads[api_id] = (head + 1) % self.max_size
+        self.sizes[api_id] = min(self.sizes[api_id] + 1, self.max_size)
+
+    def add_metric_batch(self, api_name: str, records: List[Dict[str, float]]):
+        """Add time-ordered records, converted to columns for `add_batch`."""
+        if not records:
+            return
+        self.add_batch(api_name, {
+            name: np.array([record.get(name, np.nan) for record in records], dtype=np.float64)
+            for name in self.columns
+        })
+
+    def add_batch(self, api_name: str, columns: Dict[str, np.ndarray]):
+        """Add equal-length metric columns with at most two slice writes per column."""
+        known = {name: np.asarray(values, dtype=np.float64)
+                 for name, values in columns.items() if name in self.column_ids}
+        if not known:
+            return
+        count = len(next(iter(known.values())))
+        if not count:
+            return
+
+        api_id = self._api_id(api_name)
+        block = np.full((len(self.columns), count), np.nan)
+        for name, values in known.items():
+            block[self.column_ids[name]] = values
+        if count > self.max_size:
+            # Only the newest max_size points survive the wrap anyway
+            block = block[:, -self.max_size:]
+            count = self.max_size
+
+        head = int(self.heads[api_id])
+        first = min(count, self.max_size - head)
+        row = self.values[api_id]
+        row[:, head:head + first] = block[:, :first]
+        row[:, :count - first] = block[:, first:]
+        self.heads[api_id] = (head + count) % self.max_size
+        self.sizes[api_id] = min(self.sizes[api_id] + count, self.max_size)
+
+    def view(self, api_name: str, metric_type: str) -> Optional[np.ndarray]:
+        """Live values of one API metric as a view (unordered once the ring wraps)."""
+        api_id = self.api_ids.get(api_name)
+        column = self.column_ids.get(metric_type)
+        if api_id is None or column is None:
+            return None
+        return self.values[api_id, column, :self.sizes[api_id]]
 
     def get_statistics(self, api_name: str,
                        metric_type: str) -> Dict[str, float]:
         """Get statistical summary of buffered metrics."""
-        buffer_key = f"{api_name}:{metric_type}"
-        if buffer_key not in self.buffers:
+        values = self.view(api_name, metric_type)
+        if values is None or not len(values):
+            return {}
+        summary = _summarize(values)
+        if not summary['count']:
             return {}
+        return {name: _scalar(name, stat) for name, stat in summary.items()}
 
-        values = np.array(self.buffers[buffer_key])
+    def statistics_arrays(self) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """API names and every statistic as an (apis, columns) array in their order."""
+        # Names first: rows are allocated before a name is published
+        api_names = list(self.api_names)
+        return api_names, _summarize(self.values[:len(api_names)])
+
+    def get_all_statistics(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Statistics of every metric of every API, computed in one vectorized pass."""
+        if not self.api_names:
+            return {}
+        api_names, summary = self.statistics_arrays()
         return {
-            'mean': np.mean(values),
-            'std': np.std(values),
-            'min': np.min(values),
-            'max': np.max(values),
-            'p95': np.percentile(values, 95)
-        }
\ No newline at end of file
+            api_name: {
+                column: {
+                    name: _scalar(name, stat[api_id, column_id]) for name, stat in summary.items()
+                }
+                for column_id, column in enumerate(self.columns)
+                if summary['count'][api_id, column_id]
+            }
+            for api_id, api_name in enumerate(api_names)
+        }
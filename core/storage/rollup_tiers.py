@@ -0,0 +1,217 @@
+# core/storage/rollup_tiers.py
+
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import math
+import numpy as np
+from core.calculators.partial_aggregates import PartialAggregate, build_chunk_aggregates
+
+SERIES_FIELDS = ('count', 'mean', 'min', 'max', 'p95')
+
+
+def series_key(api_name: str, metric_type: str) -> str:
+    """Name of one API metric's series in a TieredMetricStore."""
+    return f"{api_name}.{metric_type}"
+
+
+@dataclass
+class RollupTier:
+    """One downsampling level: bucket width and how long buckets are kept."""
+    name: str
+    resolution_seconds: int
+    retention: timedelta
+
+
+DEFAULT_TIERS = [
+    RollupTier('1m', 60, timedelta(days=2)),
+    RollupTier('5m', 300, timedelta(days=14)),
+    RollupTier('1h', 3600, timedelta(days=90))
+]
+
+
+def tiers_from_config(config: List[Dict]) -> List[RollupTier]:
+    """Tiers from config entries like {name: 5m, resolution_seconds: 300, retention_hours: 336}."""
+    return [
+        RollupTier(entry['name'], entry['resolution_seconds'],
+                   timedelta(hours=entry['retention_hours']))
+        for entry in config
+    ]
+
+
+class TieredMetricStore:
+    """Raw points plus rollup tiers of count/sum/sumsq/min/max and a sketch.
+
+    New points are aggregated once into the finest tier's buckets; coarser
+    tiers merge those partial aggregates, so each raw point is touched
+    once whatever the number of tiers. Every tier keeps buckets for its own
+    retention, measured back from the newest point of the series. Queries
+    are answered from the coarsest tier that still meets the requested
+    resolution and covers the start of the range.
+
+    Series are named with `series_key`, one per API metric. An optional
+    `raw` TimeSeriesBuffer keyed the same way serves requests finer than
+    the finest tier.
+    """
+
+    def __init__(self, tiers: Optional[List[RollupTier]] = None, raw=None):
+        self.tiers = sorted(tiers or DEFAULT_TIERS, key=lambda tier: tier.resolution_seconds)
+        finest = self.tiers[0].resolution_seconds
+        for tier in self.tiers[1:]:
+            if tier.resolution_seconds % finest:
+                raise ValueError(
+                    f"Tier {tier.name} resolution must be a multiple of {finest}s"
+                )
+        self.raw = raw
+        self.buckets: Dict[str, List[Dict[int, PartialAggregate]]] = {}
+        self.oldest: Dict[str, List[float]] = {}
+        self.newest: Dict[str, float] = {}
+
+    def add_point(self, series: str, timestamp: datetime, value: float):
+        self.add_points(series, np.array([timestamp.timestamp()]), np.array([value]))
+
+    def add_metrics(self, api_name: str, timestamp: datetime, metrics: Dict[str, Optional[float]]):
+        """Add one record of an API's metrics, each to its own series."""
+        for metric_type, value in metrics.items():
+            if value is not None:
+                self.add_point(series_key(api_name, metric_type), timestamp, value)
+
+    def add_points(self, series: str, epoch_seconds: np.ndarray, values: np.ndarray):
+        """Fold a batch of raw points into every tier."""
+        if not len(values):
+            return
+        epoch_seconds = np.asarray(epoch_seconds, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        tiers = self.buckets.setdefault(series, [{} for _ in self.tiers])
+        oldest = self.oldest.setdefault(series, [math.inf] * len(self.tiers))
+        newest = max(self.newest.get(series, -np.inf), float(epoch_seconds.max()))
+        self.newest[series] = newest
+
+        fine = build_chunk_aggregates(epoch_seconds, values, self.tiers[0].resolution_seconds)
+        for index, (tier, buckets) in enumerate(zip(self.tiers, tiers)):
+            width = tier.resolution_seconds
+            # Late points already past a tier's retention are not added to it
+            cutoff = newest - tier.retention.total_seconds()
+            for start, aggregate in fine.items():
+                bucket_start = start - start % width
+                if bucket_start + width <= cutoff:
+                    continue
+                bucket = buckets.get(bucket_start)
+                if bucket is None:
+                    oldest[index] = min(oldest[index], bucket_start)
+                    if index == 0:
+                        buckets[bucket_start] = aggregate
+                        continue
+                    bucket = buckets[bucket_start] = PartialAggregate()
+                bucket.merge(aggregate)
+
+        self._evict(series)
+
+    def _evict(self, series: str):
+        """Drop buckets past each tier's retention, whatever order they arrived in."""
+        newest = self.newest[series]
+        oldest = self.oldest[series]
+        for index, (tier, buckets) in enumerate(zip(self.tiers, self.buckets[series])):
+            cutoff = newest - tier.retention.total_seconds()
+            if oldest[index] + tier.resolution_seconds > cutoff:
+                continue
+            for start in [start for start in buckets if start + tier.resolution_seconds <= cutoff]:
+                del buckets[start]
+            oldest[index] = min(buckets, default=math.inf)
+
+    def select_tier(self, series: str, start_time: datetime,
+                    resolution_seconds: float) -> Optional[RollupTier]:
+        """Coarsest tier no coarser than `resolution_seconds` whose retention reaches
+        `start_time`; None when raw points are needed."""
+        newest = self.newest.get(series)
+        covering = [
+            tier for tier in self.tiers
+            if newest is None or newest - tier.retention.total_seconds() <= start_time.timestamp()
+        ]
+        fitting = [tier for tier in covering if tier.resolution_seconds <= resolution_seconds]
+        if fitting:
+            return fitting[-1]
+        raw_covers = self.raw is not None and (
+            newest is None
+            or newest - self.raw.retention_period.total_seconds() <= start_time.timestamp()
+        )
+        if raw_covers and resolution_seconds < self.tiers[0].resolution_seconds:
+            return None
+        # Nothing retains the whole range: fall back to the longest-lived tier
+        return covering[0] if covering else self.tiers[-1]
+
+    def query(
+            self,
+            series: str,
+            start_time: datetime,
+            end_time: datetime,
+            resolution_seconds: Optional[float] = None,
+            max_points: int = 500
+    ) -> Dict[str, np.ndarray]:
+        """Series buckets between two times at the requested resolution or coarser.
+
+        Without `resolution_seconds` the resolution is chosen so that about
+        `max_points` buckets span the range. Returns epoch-second
+        `timestamp` and `count`/`mean`/`min`/`max`/`p95` arrays plus the tier used.
+        """
+        span = max((end_time - start_time).total_seconds(), 1.0)
+        resolution = resolution_seconds or span / max_points
+        tier = self.select_tier(series, start_time, resolution)
+        if tier is None:
+            return self._query_raw(series, start_time, end_time)
+
+        index = self.tiers.index(tier)
+        buckets = self.buckets.get(series, [{}] * len(self.tiers))[index]
+        start, end = start_time.timestamp(), end_time.timestamp()
+        width = tier.resolution_seconds
+        step = max(math.ceil(resolution / width), 1) * width
+
+        # Re-bucket into `step`-wide buckets when the request is coarser than the tier
+        merged: Dict[int, PartialAggregate] = {}
+        for bucket_start in sorted(buckets):
+            if bucket_start + width <= start or bucket_start > end:
+                continue
+            aggregate = buckets[bucket_start]
+            if step == width:
+                merged[bucket_start] = aggregate
+                continue
+            target = bucket_start - bucket_start % step
+            if target not in merged:
+                merged[target] = PartialAggregate()
+            merged[target].merge(aggregate)
+
+        return self._to_series(tier.name, step, merged)
+
+    def _query_raw(self, series: str, start_time: datetime, end_time: datetime) -> Dict:
+        points = self.raw.get_range(series, start_time, end_time)
+        values = np.array([value for _, value in points], dtype=np.float64)
+        return {
+            'tier': 'raw',
+            'resolution_seconds': 0,
+            'timestamp': np.array([ts.timestamp() for ts, _ in points], dtype=np.float64),
+            'count': np.ones(len(values), dtype=np.int64),
+            'mean': values,
+            'min': values,
+            'max': values,
+            'p95': values
+        }
+
+    @staticmethod
+    def _to_series(tier_name: str, step: int, buckets: Dict[int, PartialAggregate]) -> Dict:
+        starts = sorted(buckets)
+        metrics = [buckets[start].to_metrics() for start in starts]
+        series = {
+            'tier': tier_name,
+            'resolution_seconds': step,
+            'timestamp': np.array(starts, dtype=np.float64),
+            'count': np.array([buckets[start].count for start in starts], dtype=np.int64)
+        }
+        for name in SERIES_FIELDS[1:]:
+            series[name] = np.array([m[name] for m in metrics], dtype=np.float64)
+        return series
+
+    def bucket_counts(self, series: str) -> Dict[str, int]:
+        return {
+            tier.name: len(buckets)
+            for tier, buckets in zip(self.tiers, self.buckets.get(series, []))
+        }
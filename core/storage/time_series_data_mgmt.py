@@ -1,37 +1,134 @@
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 import numpy as np
+from core.storage.compressed_chunks import CompressedSeries
+from core.storage.rollup_tiers import series_key
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_microseconds(timestamp: datetime) -> int:
+    """Naive datetime as int64 microseconds; aware ones are converted to UTC first."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
 
 
 class TimeSeriesBuffer:
-    def __init__(self, retention_period: timedelta = timedelta(hours=24)):
+    """Per-API time series kept in compressed chunks.
+
+    Points are stored as delta-of-delta timestamps and XOR-encoded values
+    (see core.storage.compressed_chunks), typically 1-11 bytes per point
+    instead of ~100 for a (datetime, float) tuple in a list.
+    """
+
+    def __init__(self, retention_period: timedelta = timedelta(hours=24),
+                 chunk_size: int = 1024):
         self.retention_period = retention_period
-        self.data: Dict[str, List[tuple]] = {}  # api_name -> [(timestamp, value)]
+        self.chunk_size = chunk_size
+        self.data: Dict[str, CompressedSeries] = {}  # api_name -> compressed (timestamp, value)
 
     def add_point(self, api_name: str, timestamp: datetime, value: float):
         """Add new data point to time series."""
         if api_name not in self.data:
-            self.data[api_name] = []
+            self.data[api_name] = CompressedSeries(self.chunk_size)
+
+        self.data[api_name].append(_to_microseconds(timestamp), value)
+        self._cleanup_old_data(api_name)
+
+    def add_points(self, api_name: str, timestamps_us: np.ndarray, values: np.ndarray):
+        """Add a batch of points with int64 microsecond timestamps."""
+        if api_name not in self.data:
+            self.data[api_name] = CompressedSeries(self.chunk_size)
 
-        self.data[api_name].append((timestamp, value))
+        self.data[api_name].extend(timestamps_us, values)
         self._cleanup_old_data(api_name)
 
+    def get_range_arrays(self, api_name: str,
+                         start_time: datetime,
+                         end_time: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps (int64 microseconds) and values within the range, in insertion order."""
+        if api_name not in self.data:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        # Whole chunks are evicted lazily; apply the exact retention cutoff here
+        cutoff = _to_microseconds(datetime.now() - self.retention_period) + 1
+        return self.data[api_name].to_arrays(
+            max(_to_microseconds(start_time), cutoff),
+            _to_microseconds(end_time)
+        )
+
     def get_range(self, api_name: str,
                   start_time: datetime,
                   end_time: datetime) -> List[tuple]:
         """Get time series data within specified range."""
-        if api_name not in self.data:
-            return []
+        timestamps, values = self.get_range_arrays(api_name, start_time, end_time)
+        return list(zip(timestamps.astype('datetime64[us]').tolist(), values.tolist()))
 
-        return [
-            (ts, val) for ts, val in self.data[api_name]
-            if start_time <= ts <= end_time
-        ]
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the compressed series."""
+        return sum(series.nbytes for series in self.data.values())
 
     def _cleanup_old_data(self, api_name: str):
-        """Remove data points older than retention period."""
+        """Remove chunks whose points are all older than the retention period."""
         cutoff_time = datetime.now() - self.retention_period
-        self.data[api_name] = [
-            (ts, val) for ts, val in self.data[api_name]
-            if ts > cutoff_time
-        ]
\ No newline at end of file
+        self.data[api_name].evict_before(_to_microseconds(cutoff_time) + 1)
+
+
+class TimeSeriesManager:
+    """Async access to per-API time series with ingest watermarks.
+
+    With a `rollups` store (core.storage.rollup_tiers.TieredMetricStore),
+    points are also downsampled into its tiers for long-range reads, as
+    the `metric_type` series of each API.
+    """
+
+    def __init__(self, buffer: Optional[TimeSeriesBuffer] = None, rollups=None,
+                 metric_type: str = 'value'):
+        self.buffer = buffer or TimeSeriesBuffer()
+        self.rollups = rollups
+        self.metric_type = metric_type
+        self.last_updated: Dict[str, datetime] = {}
+
+    def add_point(self, api_name: str, timestamp: datetime, value: float):
+        self.buffer.add_point(api_name, timestamp, value)
+        if self.rollups is not None:
+            self.rollups.add_point(series_key(api_name, self.metric_type), timestamp, value)
+        if timestamp > self.last_updated.get(api_name, datetime.min):
+            self.last_updated[api_name] = timestamp
+
+    def list_apis(self) -> List[str]:
+        return list(self.buffer.data)
+
+    def last_update(self, api_name: str) -> Optional[datetime]:
+        """Timestamp of the newest point ingested for an API."""
+        return self.last_updated.get(api_name)
+
+    async def get_time_range(self, api_name: str,
+                             start_time: datetime,
+                             end_time: datetime) -> List[Dict]:
+        """Get points within the range as timestamp/value records."""
+        return [
+            {'timestamp': ts, 'value': val}
+            for ts, val in self.buffer.get_range(api_name, start_time, end_time)
+        ]
+
+    async def get_time_range_arrays(self, api_name: str,
+                                    start_time: datetime,
+                                    end_time: datetime) -> Tuple[np.ndarray, np.ndarray]:
+        """Points within the range as int64 wall-clock microseconds and values,
+        in insertion order, without building per-point records."""
+        return self.buffer.get_range_arrays(api_name, start_time, end_time)
+
+    async def get_rollups(self, api_name: str,
+                          start_time: datetime,
+                          end_time: datetime,
+                          resolution_seconds: Optional[float] = None,
+                          max_points: int = 500) -> Dict[str, np.ndarray]:
+        """Downsampled series from the coarsest rollup tier that fits the request."""
+        if self.rollups is None:
+            raise RuntimeError("TimeSeriesManager was created without rollup tiers")
+        return self.rollups.query(
+            series_key(api_name, self.metric_type), start_time, end_time, resolution_seconds, max_points
+        )
@@ -0,0 +1,186 @@
+# core/system/broadcast_hub.py
+
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+import asyncio
+import logging
+from core.utils.batch_queries import encode, finite_or_none
+
+HEARTBEAT = ''
+
+
+class HubFull(Exception):
+    """Raised when the hub already serves its maximum number of subscribers."""
+
+
+class Subscription:
+    """One client's bounded queue of encoded messages."""
+    __slots__ = ('apis', 'queue', 'closed', 'close_reason')
+
+    def __init__(self, apis: Optional[Set[str]], queue_size: int):
+        self.apis = apis
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+        self.close_reason: Optional[str] = None
+
+    def offer(self, message: str) -> bool:
+        """Queue a message without waiting; False when the queue is full."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self, reason: str):
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        # Pending messages are useless once deltas are missed; make room for the sentinel
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def messages(self, heartbeat_seconds: Optional[float] = None) -> AsyncIterator[str]:
+        """Encoded messages until closed; yields HEARTBEAT after idle periods."""
+        while True:
+            if not self.queue.empty():
+                # Drain without arming a timeout per message
+                message = self.queue.get_nowait()
+            else:
+                try:
+                    message = await asyncio.wait_for(self.queue.get(), heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield HEARTBEAT
+                    continue
+            if message is None:
+                return
+            yield message
+
+
+class BroadcastHub:
+    """Fans out delta-encoded per-API updates to many streaming clients.
+
+    Producers `publish` the latest fields of an API (health, status,
+    spike, threshold...). The hub keeps the current state per API, and
+    only fields that changed are broadcast, encoded once and shared by
+    every subscriber of that API. New subscribers first receive a full
+    snapshot of their APIs, so the deltas that follow always apply.
+
+    Each subscriber has a bounded queue; one that falls behind far enough
+    to fill it is disconnected rather than slowing everyone else down,
+    and resyncs from a fresh snapshot when it reconnects.
+    """
+
+    def __init__(self, queue_size: int = 256, max_subscribers: int = 10000,
+                 heartbeat_seconds: float = 15.0):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat_seconds = heartbeat_seconds
+        self.state: Dict[str, Dict] = {}
+        self.published = 0
+        self.dropped = 0
+        self.logger = logging.getLogger(__name__)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._by_api: Dict[str, Set[Subscription]] = {}
+        self._all: Set[Subscription] = set()
+        self._subscriptions: Set[Subscription] = set()
+
+    def configure(self, config: Optional[Dict] = None):
+        """Apply the `streaming` section of the monitoring config."""
+        config = config or {}
+        self.queue_size = config.get('queue_size', self.queue_size)
+        self.max_subscribers = config.get('max_subscribers', self.max_subscribers)
+        self.heartbeat_seconds = config.get('heartbeat_seconds', self.heartbeat_seconds)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, apis: Optional[Iterable[str]] = None) -> Subscription:
+        """Subscribe to some APIs (all when None); must run on the event loop."""
+        apis = set(apis) if apis is not None else None
+        if apis is not None and not apis:
+            raise ValueError("Subscribe to at least one API, or to all of them")
+        if len(self._subscriptions) >= self.max_subscribers:
+            raise HubFull(f"Streaming is limited to {self.max_subscribers} subscribers")
+        self._loop = asyncio.get_running_loop()
+
+        subscription = Subscription(apis, self.queue_size)
+        if apis is None:
+            self._all.add(subscription)
+        else:
+            for api_name in apis:
+                self._by_api.setdefault(api_name, set()).add(subscription)
+        self._subscriptions.add(subscription)
+
+        names = self.state.keys() if apis is None else apis & self.state.keys()
+        subscription.offer(encode({
+            'type': 'snapshot',
+            'apis': {api_name: self.state[api_name] for api_name in names}
+        }))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription not in self._subscriptions:
+            return
+        self._subscriptions.discard(subscription)
+        if subscription.apis is None:
+            self._all.discard(subscription)
+            return
+        for api_name in subscription.apis:
+            subscribers = self._by_api.get(api_name)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_api[api_name]
+
+    def publish(self, api_name: str, fields: Dict):
+        """Merge an API's latest fields into its state and broadcast what changed.
+
+        Safe to call from any thread; off the loop thread the broadcast is
+        handed to the loop.
+        """
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is not loop:
+                loop.call_soon_threadsafe(self._publish, api_name, dict(fields))
+                return
+        self._publish(api_name, fields)
+
+    def _publish(self, api_name: str, fields: Dict):
+        current = self.state.setdefault(api_name, {})
+        # NaN never equals itself, so it would be re-sent on every publish
+        fields = {key: finite_or_none(value) for key, value in fields.items()}
+        changes = {key: value for key, value in fields.items()
+                   if key not in current or current[key] != value}
+        if not changes:
+            return
+        current.update(changes)
+        self.published += 1
+
+        subscribers = self._by_api.get(api_name)
+        if not subscribers and not self._all:
+            return
+        message = encode({'type': 'delta', 'api': api_name, 'changes': changes})
+        for subscription in [*(subscribers or ()), *self._all]:
+            if not subscription.offer(message):
+                self._drop(subscription)
+
+    def _drop(self, subscription: Subscription):
+        self.unsubscribe(subscription)
+        subscription.close('slow consumer')
+        self.dropped += 1
+        self.logger.warning("Dropped slow streaming subscriber")
+
+    def stats(self) -> Dict:
+        return {
+            'subscribers': len(self._subscriptions),
+            'apis': len(self.state),
+            'published': self.published,
+            'dropped': self.dropped
+        }
@@ -0,0 +1,241 @@
+# core/system/fleet_snapshot.py
+
+from typing import Dict, Mapping, Optional, Tuple
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+import asyncio
+import logging
+import numpy as np
+from analysis.ml_models.context import APIContext
+from core.storage.metric_buffer_mgmt import MetricBuffer
+from core.system.broadcast_hub import BroadcastHub
+from core.utils.batch_queries import encode
+
+DEFAULT_WEIGHTS = {'latency': 0.4, 'error_rate': 0.3, 'traffic': 0.3}
+DEFAULT_STATUS_THRESHOLDS = {'healthy': 90, 'warning': 70}
+DEFAULT_ERROR_THRESHOLD = 0.01
+SNAPSHOT_STATISTICS = ('mean', 'std', 'p95')
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    values.flags.writeable = False
+    return values
+
+
+def health_scores(
+        latency_p95: np.ndarray,
+        error_mean: np.ndarray,
+        traffic_mean: np.ndarray,
+        expected_latency: np.ndarray,
+        error_threshold: np.ndarray,
+        baseline_traffic: np.ndarray,
+        weights: Dict[str, float]
+) -> np.ndarray:
+    """0-100 health of every API from its metric statistics and expectations.
+
+    Each component scores 1 while the API meets its expectation and falls
+    off with the ratio beyond it: expected / p95 latency, error threshold
+    / mean error rate and mean / baseline traffic. Components without an
+    expectation (NaN) or data are left out and the weights renormalized.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        components = np.stack([
+            np.clip(expected_latency / latency_p95, 0.0, 1.0),
+            np.clip(np.where(
+                np.isnan(error_mean), np.nan,
+                np.where(error_mean > 0, error_threshold / error_mean, 1.0)
+            ), 0.0, 1.0),
+            np.clip(traffic_mean / baseline_traffic, 0.0, 1.0)
+        ])
+    component_weights = np.array(
+        [weights.get('latency', 0.0), weights.get('error_rate', 0.0), weights.get('traffic', 0.0)]
+    )[:, None] * ~np.isnan(components)
+    total = component_weights.sum(axis=0)
+    weighted = np.nansum(components * component_weights, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total > 0, 100 * weighted / total, np.nan)
+
+
+def health_statuses(health: np.ndarray, thresholds: Dict[str, float]) -> np.ndarray:
+    return np.select(
+        [np.isnan(health), health >= thresholds['healthy'], health >= thresholds['warning']],
+        ['unknown', 'healthy', 'warning'],
+        'critical'
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class FleetSnapshot:
+    """Immutable statistics and health of every API at one refresh.
+
+    Built off the request path and swapped in whole, so readers only ever
+    dereference it. `apis` holds read-only per-API views and `body` the
+    whole snapshot already encoded as JSON.
+    """
+    taken_at: datetime
+    api_names: Tuple[str, ...]
+    statistics: Mapping[str, np.ndarray]
+    health: np.ndarray
+    status: Tuple[str, ...]
+    apis: Mapping[str, Mapping]
+    status_counts: Mapping[str, int]
+    body: bytes
+
+    def api(self, api_name: str) -> Optional[Dict]:
+        entry = self.apis.get(api_name)
+        return dict(entry) if entry is not None else None
+
+
+def build_fleet_snapshot(
+        buffer: MetricBuffer,
+        contexts: Optional[Dict[str, APIContext]] = None,
+        weights: Optional[Dict[str, float]] = None,
+        status_thresholds: Optional[Dict[str, float]] = None
+) -> FleetSnapshot:
+    """Compute mean/std/p95, health and status of all APIs in one vectorized pass."""
+    contexts = contexts or {}
+    weights = weights or DEFAULT_WEIGHTS
+    status_thresholds = {**DEFAULT_STATUS_THRESHOLDS, **(status_thresholds or {})}
+
+    api_names, summary = buffer.statistics_arrays()
+    columns = {name: buffer.column_ids[name] for name in ('latency', 'error_rate', 'traffic')}
+    expectations = np.array([
+        [context.expected_latency, context.error_threshold, context.baseline_traffic]
+        if context is not None else [np.nan, DEFAULT_ERROR_THRESHOLD, np.nan]
+        for context in (contexts.get(api_name) for api_name in api_names)
+    ], dtype=np.float64).reshape(len(api_names), 3)
+
+    health = _readonly(health_scores(
+        summary['p95'][:, columns['latency']],
+        summary['mean'][:, columns['error_rate']],
+        summary['mean'][:, columns['traffic']],
+        expectations[:, 0],
+        expectations[:, 1],
+        expectations[:, 2],
+        weights
+    ))
+    status = health_statuses(health, status_thresholds).tolist()
+    statistics = {
+        name: _readonly(summary[name]) for name in ('count',) + SNAPSHOT_STATISTICS
+    }
+
+    taken_at = datetime.now()
+    apis = {}
+    for api_id, api_name in enumerate(api_names):
+        entry = {
+            'api_name': api_name,
+            'health_score': None if np.isnan(health[api_id]) else round(float(health[api_id]), 2),
+            'status': status[api_id],
+            'metrics': {
+                column: {
+                    'count': int(statistics['count'][api_id, column_id]),
+                    **{
+                        name: float(statistics[name][api_id, column_id])
+                        for name in SNAPSHOT_STATISTICS
+                    }
+                }
+                for column_id, column in enumerate(buffer.columns)
+                if statistics['count'][api_id, column_id]
+            }
+        }
+        apis[api_name] = entry
+
+    status_counts = {name: status.count(name) for name in ('healthy', 'warning', 'critical', 'unknown')}
+    body = encode({
+        'taken_at': taken_at.isoformat(),
+        'status_counts': status_counts,
+        'apis': list(apis.values())
+    }).encode()
+    return FleetSnapshot(
+        taken_at=taken_at,
+        api_names=tuple(api_names),
+        statistics=MappingProxyType(statistics),
+        health=health,
+        status=tuple(status),
+        apis=MappingProxyType({name: MappingProxyType(entry) for name, entry in apis.items()}),
+        status_counts=MappingProxyType(status_counts),
+        body=body
+    )
+
+
+class FleetMonitor:
+    """Refreshes the fleet snapshot on a fixed cadence for lock-free readers.
+
+    Each refresh runs in the default executor so the vectorized pass never
+    stalls the event loop; publishing is a single reference assignment,
+    so any number of dashboard polls read `snapshot` without recomputing
+    or locking.
+    """
+
+    def __init__(self, buffer: MetricBuffer, refresh_seconds: float = 1.0,
+                 contexts: Optional[Dict[str, APIContext]] = None,
+                 hub: Optional[BroadcastHub] = None):
+        self.buffer = buffer
+        self.hub = hub
+        self.refresh_seconds = refresh_seconds
+        self.contexts: Dict[str, APIContext] = contexts or {}
+        self.weights = dict(DEFAULT_WEIGHTS)
+        self.status_thresholds = dict(DEFAULT_STATUS_THRESHOLDS)
+        self.snapshot: FleetSnapshot = build_fleet_snapshot(buffer)
+        self.logger = logging.getLogger(__name__)
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(self, config: Optional[Dict] = None):
+        """Apply the monitoring config: `fleet_snapshot`, `health_scoring`,
+        `status_thresholds` and `default_contexts`."""
+        config = config or {}
+        self.refresh_seconds = config.get('fleet_snapshot', {}).get(
+            'refresh_seconds', self.refresh_seconds
+        )
+        self.weights = config.get('health_scoring', {}).get('weights', self.weights)
+        self.status_thresholds.update(config.get('status_thresholds', {}))
+        for name, context in config.get('default_contexts', {}).items():
+            self.contexts[name] = APIContext(name=name, **context)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def refresh(self) -> FleetSnapshot:
+        self.snapshot = build_fleet_snapshot(
+            self.buffer, self.contexts, self.weights, self.status_thresholds
+        )
+        return self.snapshot
+
+    def broadcast(self, snapshot: FleetSnapshot):
+        """Push each API's health and status to the hub, which forwards only changes."""
+        if self.hub is None:
+            return
+        for api_name, entry in snapshot.apis.items():
+            self.hub.publish(api_name, {
+                'health_score': entry['health_score'],
+                'status': entry['status']
+            })
+
+    def start(self):
+        if self.running:
+            return
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            try:
+                snapshot = await loop.run_in_executor(None, self.refresh)
+                self.broadcast(snapshot)
+            except Exception as e:
+                self.logger.error(f"Error refreshing fleet snapshot: {str(e)}")
+            # Keep a fixed cadence however long the refresh took
+            await asyncio.sleep(max(self.refresh_seconds - (loop.time() - started), 0))
@@ -1,9 +1,9 @@
 from typing import Dict
 from datetime import datetime
-from ..models.context import APIContext
-from ..models.threshold_model import AdaptiveThreshold
-from ..models.spike_model import SpikeDetector
-from ..models.health_model import HealthScoreCalculator
+from analysis.ml_models.context import APIContext
+from analysis.ml_models.threshold_model import AdaptiveThreshold
+from analysis.ml_models.spike_model import SpikeDetector
+from analysis.ml_models.health_model import HealthScoreCalculator
 
 
 class MonitoringSystem:
@@ -0,0 +1,102 @@
+# core/utils/batch_queries.py
+
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Sequence
+from fnmatch import fnmatchcase
+import asyncio
+import json
+import math
+import numpy as np
+
+MAX_BATCH_APIS = 1000
+_GLOB_CHARS = frozenset('*?[')
+
+
+def json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def finite_or_none(value):
+    """NaN and infinite floats as None, which JSON can carry; other values unchanged."""
+    if isinstance(value, (float, np.floating)) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _finite_values(value):
+    if isinstance(value, dict):
+        return {key: _finite_values(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite_values(item) for item in value]
+    return finite_or_none(value)
+
+
+def encode(record: Dict) -> str:
+    """Compact JSON of a record; non-finite floats are encoded as null."""
+    try:
+        return json.dumps(record, default=json_default, separators=(',', ':'), allow_nan=False)
+    except ValueError:
+        # Rare: only records holding NaN/inf pay for the rewrite
+        return json.dumps(_finite_values(record), default=json_default, separators=(',', ':'))
+
+
+def resolve_api_names(requested: Sequence[str], known: Iterable[str],
+                      limit: int = MAX_BATCH_APIS) -> List[str]:
+    """Expand glob entries (`pay-*`) against known API names.
+
+    Plain names are kept even when unknown, so the caller can report them;
+    the result is de-duplicated in request order and capped at `limit`.
+    """
+    known = list(known)
+    names: Dict[str, None] = {}
+    for entry in requested:
+        if _GLOB_CHARS.intersection(entry):
+            names.update(dict.fromkeys(sorted(name for name in known if fnmatchcase(name, entry))))
+        else:
+            names[entry] = None
+    if len(names) > limit:
+        raise ValueError(f"Batch matches {len(names)} APIs; the limit is {limit}")
+    return list(names)
+
+
+async def run_chunks(
+        api_names: Sequence[str],
+        fetch_chunk: Callable[[List[str]], Awaitable[Iterable[Dict]]],
+        chunk_size: int = 50,
+        concurrency: int = 8
+) -> AsyncIterator[Dict]:
+    """Run `fetch_chunk` over chunks of APIs concurrently, yielding each
+    chunk's records as soon as it completes.
+
+    A failing chunk yields an error record per API instead of aborting the
+    batch. Chunks still running are cancelled if the consumer stops early.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def guarded(chunk: List[str]) -> List[Dict]:
+        async with semaphore:
+            try:
+                return list(await fetch_chunk(chunk))
+            except Exception as e:
+                return [{'api_name': name, 'error': str(e)} for name in chunk]
+
+    tasks = [
+        asyncio.ensure_future(guarded(list(api_names[start:start + chunk_size])))
+        for start in range(0, len(api_names), chunk_size)
+    ]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            for record in await completed:
+                yield record
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def ndjson(records: AsyncIterator[Dict]) -> AsyncIterator[bytes]:
+    """Encode records as newline-delimited JSON, one line per record."""
+    async for record in records:
+        yield (encode(record) + '\n').encode()
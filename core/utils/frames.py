@@ -0,0 +1,135 @@
+# core/utils/frames.py
+
+from typing import Dict, Iterable, Optional, Sequence
+from datetime import datetime
+import time
+import numpy as np
+import pandas as pd
+
+TIMESTAMP_COLUMN = 'timestamp'
+
+# Largest magnitude float32 still resolves to ~0.01 (24-bit mantissa)
+_FLOAT32_SAFE_MAX = 1e5
+
+
+def epoch_ns(epoch_seconds: np.ndarray) -> np.ndarray:
+    """Unix epoch seconds as int64 nanoseconds, rounded to the microsecond."""
+    return np.round(np.asarray(epoch_seconds, dtype=np.float64) * 1e6).astype(np.int64) * 1000
+
+
+def local_utc_offsets(epoch_seconds: np.ndarray) -> np.ndarray:
+    """Local UTC offset in seconds at each Unix timestamp.
+
+    The offset is looked up once per distinct hour, which keeps the
+    conversion vectorized while still following DST transitions.
+    """
+    epoch_seconds = np.asarray(epoch_seconds, dtype=np.float64)
+    hours, inverse = np.unique(epoch_seconds // 3600, return_inverse=True)
+    offsets = np.array([time.localtime(int(hour) * 3600).tm_gmtoff for hour in hours.tolist()],
+                       dtype=np.float64)
+    return offsets[inverse]
+
+
+def local_wall_seconds(epoch_seconds: np.ndarray) -> np.ndarray:
+    """Shift Unix timestamps to local wall-clock seconds, like `datetime.fromtimestamp`."""
+    epoch_seconds = np.asarray(epoch_seconds, dtype=np.float64)
+    return epoch_seconds + local_utc_offsets(epoch_seconds)
+
+
+def local_epoch_seconds(wall_seconds: np.ndarray) -> np.ndarray:
+    """Local wall-clock seconds back to Unix timestamps, like `datetime.timestamp`
+    on naive datetimes; the inverse of `local_wall_seconds`."""
+    wall_seconds = np.asarray(wall_seconds, dtype=np.float64)
+    # Near a DST change the offset at the wall reading itself is an hour off;
+    # the offset at the resulting estimate is not
+    return wall_seconds - local_utc_offsets(wall_seconds - local_utc_offsets(wall_seconds))
+
+
+def compact_floats(values: np.ndarray) -> np.ndarray:
+    """Downcast to float32 when every value stays within float32's safe range."""
+    values = np.asarray(values)
+    if values.dtype == np.float32 or not np.issubdtype(values.dtype, np.floating):
+        return values
+    # fmax skips NaNs without warning, even when every value is NaN
+    if values.size and np.fmax.reduce(np.abs(values)) > _FLOAT32_SAFE_MAX:
+        return values
+    return values.astype(np.float32)
+
+
+def build_metric_frame(
+        epoch_seconds: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        categories: Optional[Dict[str, Sequence]] = None,
+        keep_float64: Iterable[str] = ()
+) -> pd.DataFrame:
+    """Build a compact frame straight from column arrays.
+
+    `timestamp` is stored as int64 Unix nanoseconds, float columns as
+    float32 where `compact_floats` allows (unless listed in
+    `keep_float64`), and `categories` columns, such as the `api_source`
+    of multi-API log frames, as categoricals.
+    """
+    keep_float64 = set(keep_float64)
+    data = {TIMESTAMP_COLUMN: epoch_ns(epoch_seconds)}
+    for name, values in (categories or {}).items():
+        data[name] = pd.Categorical(values)
+    for name, values in columns.items():
+        data[name] = np.asarray(values) if name in keep_float64 else compact_floats(values)
+    return pd.DataFrame(data, copy=False)
+
+
+def frame_datetimes(frame: pd.DataFrame) -> pd.Series:
+    """The int64 timestamp column as naive local wall-clock datetime64, matching
+    the `datetime.fromtimestamp` readings used elsewhere."""
+    ns = frame[TIMESTAMP_COLUMN].to_numpy()
+    offsets = local_utc_offsets(ns // 1_000_000_000).astype(np.int64) * 1_000_000_000
+    return pd.Series((ns + offsets).view('datetime64[ns]'), index=frame.index)
+
+
+class ColumnarBuffer:
+    """Append-only timestamp/value columns with amortized growth.
+
+    Replaces a list of per-point dicts: appends write into preallocated
+    numpy arrays and `frame()` builds a DataFrame from array views.
+    """
+
+    def __init__(self, capacity: int = 1024, max_points: Optional[int] = None):
+        self.max_points = max_points
+        self._epoch = np.empty(capacity, dtype=np.float64)
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: datetime, value: float):
+        if self._size == len(self._epoch):
+            self._grow()
+        self._epoch[self._size] = timestamp.timestamp()
+        self._values[self._size] = value
+        self._size += 1
+
+    def _grow(self):
+        if self.max_points is not None and self._size >= self.max_points:
+            # Keep the newest half; older points are beyond the retention limit
+            keep = self.max_points // 2
+            self._epoch[:keep] = self._epoch[self._size - keep:self._size]
+            self._values[:keep] = self._values[self._size - keep:self._size]
+            self._size = keep
+            return
+        capacity = len(self._epoch) * 2
+        if self.max_points is not None:
+            capacity = min(capacity, self.max_points)
+        self._epoch = np.resize(self._epoch, capacity)
+        self._values = np.resize(self._values, capacity)
+
+    @property
+    def epoch_seconds(self) -> np.ndarray:
+        return self._epoch[:self._size]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[:self._size]
+
+    def frame(self) -> pd.DataFrame:
+        return build_metric_frame(self.epoch_seconds, {'value': self.values})
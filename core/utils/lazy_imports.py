@@ -0,0 +1,24 @@
+# core/utils/lazy_imports.py
+
+from typing import Any, Dict
+import importlib
+
+_resolved: Dict[str, Any] = {}
+
+
+def import_attr(module_name: str, attr: str, package: str = '') -> Any:
+    """Import `module_name.attr` on first use, with a helpful error if missing.
+
+    Model libraries (prophet, sklearn, tensorflow) are slow to import, so
+    factories call this when a model is actually built instead of the
+    library being imported at module load.
+    """
+    key = f"{module_name}.{attr}"
+    if key not in _resolved:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as e:
+            hint = f" (pip install {package})" if package else ''
+            raise ImportError(f"{module_name} is required for this feature{hint}") from e
+        _resolved[key] = getattr(module, attr)
+    return _resolved[key]
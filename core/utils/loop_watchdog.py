@@ -0,0 +1,164 @@
+# core/utils/loop_watchdog.py
+
+from typing import Deque, Dict, List, Optional
+from collections import deque
+from datetime import datetime
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from core.utils.profiler import running_task, task_label
+from core.utils.tracing import StageHistogram
+
+
+class BlockingEvent:
+    """One stall of the event loop and the stack that caused it."""
+    __slots__ = ('detected_at', 'task', 'stack', 'lag_ms')
+
+    def __init__(self, task: str, stack: List[str]):
+        self.detected_at = datetime.now()
+        self.task = task
+        self.stack = stack
+        self.lag_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'detected_at': self.detected_at.isoformat(),
+            'task': self.task,
+            'lag_ms': self.lag_ms,
+            'stack': self.stack
+        }
+
+
+class LoopWatchdog:
+    """Continuously measures event loop lag and catches blocking calls.
+
+    A heartbeat task on the loop stamps the time every `interval`; the lag
+    of each wake-up is recorded in a histogram. A watcher thread checks the
+    stamp, and once it is overdue by more than `threshold_ms` it captures
+    the loop thread's stack while the blocking call is still running.
+    """
+
+    def __init__(self, enabled: bool = False, interval_ms: float = 50,
+                 threshold_ms: float = 100, max_events: int = 100):
+        self.enabled = enabled
+        self.interval = interval_ms / 1000
+        self.threshold_ns = int(threshold_ms * 1e6)
+        self.histogram = StageHistogram()
+        self.events: Deque[BlockingEvent] = deque(maxlen=max_events)
+        self.logger = logging.getLogger(__name__)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat_ns = 0
+        self._stall: Optional[BlockingEvent] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def configure(self, config: Optional[Dict] = None):
+        """Apply the `loop_watchdog` section of the monitoring config."""
+        config = config or {}
+        self.enabled = config.get('enabled', self.enabled)
+        self.interval = config.get('interval_ms', self.interval * 1000) / 1000
+        self.threshold_ns = int(config.get('threshold_ms', self.threshold_ns / 1e6) * 1e6)
+        max_events = config.get('max_events', self.events.maxlen)
+        if max_events != self.events.maxlen:
+            self.events = deque(self.events, maxlen=max_events)
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat_task is not None
+
+    def start(self):
+        """Start watching the running event loop; a no-op while disabled."""
+        if not self.enabled or self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat_ns = time.perf_counter_ns()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.ensure_future(self._heartbeat())
+        self._watcher = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._watcher.start()
+        self.logger.info("Event loop watchdog started")
+
+    async def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat_task = None
+        self._watcher.join()
+        self._watcher = None
+
+    async def _heartbeat(self):
+        interval_ns = int(self.interval * 1e9)
+        while True:
+            expected = time.perf_counter_ns() + interval_ns
+            self._last_beat_ns = expected
+            await asyncio.sleep(self.interval)
+            lag_ns = max(time.perf_counter_ns() - expected, 0)
+
+            with self._lock:
+                self.histogram.record(lag_ns)
+                stall, self._stall = self._stall, None
+            if stall is not None:
+                stall.lag_ms = lag_ns / 1e6
+                self.logger.warning(
+                    f"Event loop blocked for {stall.lag_ms:.0f}ms in {stall.task}: "
+                    f"{stall.stack[-1] if stall.stack else 'unknown'}"
+                )
+
+    def _watch(self):
+        poll = max(self.threshold_ns / 1e9 / 4, 0.001)
+        while not self._stop.wait(poll):
+            overdue = time.perf_counter_ns() - self._last_beat_ns
+            if overdue < self.threshold_ns or self._stall is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            task = running_task(self._loop)
+            event = BlockingEvent(
+                task_label(task) if task is not None else 'loop:callback',
+                [
+                    f"{entry.filename}:{entry.lineno} in {entry.name}"
+                    for entry in traceback.extract_stack(frame)
+                ]
+            )
+            with self._lock:
+                self._stall = event
+                self.events.append(event)
+
+    def summary(self) -> Dict:
+        """Lag histogram summary plus the most recent blocking events."""
+        with self._lock:
+            lag = self.histogram.summary()
+            events = [event.to_dict() for event in reversed(self.events)]
+        return {
+            'enabled': self.enabled,
+            'running': self.running,
+            'threshold_ms': self.threshold_ns / 1e6,
+            'lag': lag,
+            'blocking_events': events
+        }
+
+    def histogram_buckets(self) -> List[Dict[str, float]]:
+        with self._lock:
+            return self.histogram.buckets()
+
+    def reset(self):
+        with self._lock:
+            self.histogram = StageHistogram()
+            self.events.clear()
+
+
+watchdog = LoopWatchdog()
@@ -0,0 +1,212 @@
+# core/utils/profiler.py
+
+from typing import Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+import asyncio
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def task_label(task) -> str:
+    """Name of an asyncio task with its coroutine, e.g. `Task-3:Monitor.run`."""
+    get_name = getattr(task, 'get_name', None)
+    coro = task.get_coro() if hasattr(task, 'get_coro') else None
+    name = get_name() if get_name else 'task'
+    qualname = getattr(coro, '__qualname__', None)
+    return f"{name}:{qualname}" if qualname else name
+
+
+def running_task(loop: asyncio.AbstractEventLoop):
+    """Task currently executing on `loop`, readable from another thread."""
+    # Read without the loop's cooperation; a stale answer only skews one sample
+    current_tasks = getattr(asyncio.tasks, '_current_tasks', None)
+    return current_tasks.get(loop) if current_tasks is not None else None
+
+
+class StackSampler:
+    """Samples the stacks of all threads from a background thread.
+
+    Nothing runs between profiles, so the idle cost is zero. While
+    profiling, every `interval` seconds each thread's stack is folded into
+    a collapsed-stack counter (the input format of flamegraph.pl and
+    speedscope). Samples taken on the event loop thread are tagged with the
+    asyncio task that was running at the time.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.task_samples: List[Tuple[int, str]] = []
+        self.sample_count = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident() if loop is not None else None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            now_ns = time.perf_counter_ns()
+            frames = sys._current_frames()
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+            for thread_id, frame in frames.items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < self.max_depth:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, f"thread-{thread_id}"))
+
+                if thread_id == self._loop_thread_id:
+                    task = running_task(self._loop)
+                    task_name = task_label(task) if task is not None else 'loop:idle-or-callback'
+                    labels.insert(-1, f"task:{task_name}")
+                    self.task_samples.append((now_ns, task_name))
+
+                self.stacks[';'.join(reversed(labels))] += 1
+            self.sample_count += 1
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one 'frame;frame;frame count' line per stack."""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class LoopLagProbe:
+    """Measures event loop lag as the oversleep of a periodic wake-up."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: List[Tuple[int, int]] = []  # (expected wake-up ns, lag ns)
+
+    async def run(self, stop: asyncio.Event):
+        interval_ns = int(self.interval * 1e9)
+        while not stop.is_set():
+            expected = time.perf_counter_ns() + interval_ns
+            await asyncio.sleep(self.interval)
+            self.lags.append((expected, max(time.perf_counter_ns() - expected, 0)))
+
+    def summary(self) -> Dict[str, float]:
+        if not self.lags:
+            return {'samples': 0}
+        lags = np.array([lag for _, lag in self.lags]) / 1e6
+        return {
+            'samples': len(lags),
+            'mean_ms': float(lags.mean()),
+            'p50_ms': float(np.percentile(lags, 50)),
+            'p99_ms': float(np.percentile(lags, 99)),
+            'max_ms': float(lags.max())
+        }
+
+
+def attribute_lag(lags: List[Tuple[int, int]], task_samples: List[Tuple[int, str]],
+                  min_lag_ns: int = 1_000_000) -> Dict[str, Dict[str, float]]:
+    """Attribute each lag episode to the tasks sampled on the loop while it lasted."""
+    per_task: Dict[str, Dict[str, float]] = defaultdict(
+        lambda: {'samples': 0, 'lag_ms': 0.0, 'max_lag_ms': 0.0}
+    )
+    for _, task_name in task_samples:
+        per_task[task_name]['samples'] += 1
+
+    if task_samples:
+        times = np.array([t for t, _ in task_samples])
+        for expected, lag in lags:
+            if lag < min_lag_ns:
+                continue
+            start, stop = np.searchsorted(times, [expected, expected + lag])
+            blocking = Counter(name for _, name in task_samples[start:stop])
+            total = sum(blocking.values())
+            for task_name, count in blocking.items():
+                share = lag / 1e6 * count / total
+                per_task[task_name]['lag_ms'] += share
+                per_task[task_name]['max_lag_ms'] = max(per_task[task_name]['max_lag_ms'], lag / 1e6)
+
+    return dict(sorted(per_task.items(), key=lambda item: item[1]['lag_ms'], reverse=True))
+
+
+class Profiler:
+    """On-demand profiler; disabled until switched on by configuration.
+
+    Only one profile runs at a time, and a profile never outlives
+    `max_seconds`.
+    """
+
+    def __init__(self, enabled: bool = False, max_seconds: float = 60.0,
+                 interval: float = 0.005, lag_interval: float = 0.01):
+        self.enabled = enabled
+        self.max_seconds = max_seconds
+        self.interval = interval
+        self.lag_interval = lag_interval
+        self._running = False
+
+    def configure(self, config: Optional[Dict] = None):
+        """Apply the `profiling` section of the monitoring config."""
+        config = config or {}
+        self.enabled = config.get('enabled', self.enabled)
+        self.max_seconds = config.get('max_seconds', self.max_seconds)
+        self.interval = config.get('interval_ms', self.interval * 1000) / 1000
+        self.lag_interval = config.get('lag_interval_ms', self.lag_interval * 1000) / 1000
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    async def profile(self, seconds: float) -> Dict:
+        """Sample all threads and measure loop lag for `seconds` on the running loop."""
+        if self._running:
+            raise RuntimeError("A profile is already running")
+        seconds = min(max(seconds, self.interval), self.max_seconds)
+
+        self._running = True
+        sampler = StackSampler(self.interval)
+        probe = LoopLagProbe(self.lag_interval)
+        stop = asyncio.Event()
+        started = time.perf_counter()
+        try:
+            sampler.start(asyncio.get_running_loop())
+            probe_task = asyncio.ensure_future(probe.run(stop))
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stop.set()
+                await probe_task
+                sampler.stop()
+        finally:
+            self._running = False
+
+        return {
+            'seconds': round(time.perf_counter() - started, 3),
+            'interval_ms': self.interval * 1000,
+            'samples': sampler.sample_count,
+            'collapsed': sampler.collapsed(),
+            'loop_lag': probe.summary(),
+            'tasks': attribute_lag(probe.lags, sampler.task_samples)
+        }
+
+
+profiler = Profiler()
@@ -0,0 +1,238 @@
+# core/utils/tracing.py
+
+from typing import Callable, Deque, Dict, List, Optional
+from collections import deque
+from contextvars import ContextVar
+import asyncio
+import bisect
+import functools
+import threading
+import time
+import uuid
+
+# Histogram bucket upper bounds in nanoseconds: 1us .. ~70s, four buckets per doubling
+_BUCKET_BOUNDS = [int(1000 * 2 ** (i / 4)) for i in range(105)]
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+_trace_id: ContextVar[Optional[str]] = ContextVar('trace_id', default=None)
+
+
+def set_trace_id(trace_id: str):
+    """Bind a trace ID (e.g. a request's) to spans started in the current context."""
+    return _trace_id.set(trace_id)
+
+
+def get_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace.trace_id if span is not None else _trace_id.get()
+
+
+class StageHistogram:
+    """Log-bucketed latency histogram for one stage."""
+    __slots__ = ('counts', 'count', 'total_ns', 'max_ns')
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int):
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, duration_ns)] += 1
+        self.count += 1
+        self.total_ns += duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile, in nanoseconds."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return float(min(_BUCKET_BOUNDS[index], self.max_ns)) \
+                    if index < len(_BUCKET_BOUNDS) else float(self.max_ns)
+        return float(self.max_ns)
+
+    def buckets(self) -> List[Dict[str, float]]:
+        """Non-empty buckets as (upper bound in ms, count) pairs."""
+        return [
+            {'le_ms': _BUCKET_BOUNDS[i] / 1e6 if i < len(_BUCKET_BOUNDS) else float('inf'),
+             'count': count}
+            for i, count in enumerate(self.counts) if count
+        ]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ns / self.count / 1e6 if self.count else 0.0,
+            'p50_ms': self.percentile(0.5) / 1e6,
+            'p99_ms': self.percentile(0.99) / 1e6,
+            'max_ms': self.max_ns / 1e6,
+            'total_ms': self.total_ns / 1e6
+        }
+
+
+class Trace:
+    """Spans recorded under one trace ID, rooted at the first span."""
+    __slots__ = ('trace_id', 'root', 'spans')
+
+    def __init__(self, trace_id: str, root: 'Span'):
+        self.trace_id = trace_id
+        self.root = root
+        self.spans: List['Span'] = []
+
+    def to_dict(self) -> Dict:
+        return {
+            'trace_id': self.trace_id,
+            'name': self.root.name,
+            'duration_ms': self.root.duration_ns / 1e6,
+            'spans': [span.to_dict() for span in sorted(self.spans, key=lambda s: s.start_ns)]
+        }
+
+
+class Span:
+    """Timed section of work; use as a context manager."""
+    __slots__ = ('tracer', 'name', 'attributes', 'trace', 'parent', 'depth',
+                 'start_ns', 'duration_ns', '_token')
+
+    def __init__(self, tracer: 'Tracer', name: str, attributes: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.duration_ns = 0
+
+    def __enter__(self) -> 'Span':
+        parent = _current_span.get()
+        self.parent = parent
+        if parent is None:
+            self.trace = Trace(_trace_id.get() or uuid.uuid4().hex, self)
+            self.depth = 0
+        else:
+            self.trace = parent.trace
+            self.depth = parent.depth + 1
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        self.trace.spans.append(self)
+        self.tracer._finish(self)
+        return False
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'depth': self.depth,
+            'offset_ms': (self.start_ns - self.trace.root.start_ns) / 1e6,
+            'duration_ms': self.duration_ns / 1e6,
+            **({'attributes': self.attributes} if self.attributes else {})
+        }
+
+
+class _NoopSpan:
+    """Shared stand-in returned while tracing is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """In-process tracer aggregating span durations into per-stage histograms.
+
+    When disabled, `span()` returns a shared no-op object and `traced`
+    functions call straight through, so instrumentation can stay in hot
+    paths permanently.
+    """
+
+    def __init__(self, enabled: bool = False, max_traces: int = 1000):
+        self.enabled = enabled
+        self.histograms: Dict[str, StageHistogram] = {}
+        self.recent_traces: Deque[Trace] = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+
+    def configure(self, config: Optional[Dict] = None):
+        """Apply the `tracing` section of the monitoring config."""
+        config = config or {}
+        self.enabled = config.get('enabled', self.enabled)
+        max_traces = config.get('max_traces', self.recent_traces.maxlen)
+        if max_traces != self.recent_traces.maxlen:
+            self.recent_traces = deque(self.recent_traces, maxlen=max_traces)
+
+    def span(self, name: str, **attributes):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def traced(self, name: Optional[str] = None) -> Callable:
+        """Decorator recording each call of a sync or async function as a span."""
+        def decorate(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    with Span(self, span_name, {}):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, span_name, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def _finish(self, span: Span):
+        with self._lock:
+            histogram = self.histograms.get(span.name)
+            if histogram is None:
+                histogram = self.histograms[span.name] = StageHistogram()
+            histogram.record(span.duration_ns)
+            if span.parent is None:
+                self.recent_traces.append(span.trace)
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """Latency summary per stage, slowest total time first."""
+        with self._lock:
+            summaries = {name: h.summary() for name, h in self.histograms.items()}
+        return dict(sorted(summaries.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def slowest_traces(self, limit: int = 20, name: Optional[str] = None) -> List[Dict]:
+        """Slowest of the recently completed traces, optionally by root span name."""
+        with self._lock:
+            traces = [t for t in self.recent_traces if name is None or t.root.name == name]
+        traces.sort(key=lambda t: t.root.duration_ns, reverse=True)
+        return [trace.to_dict() for trace in traces[:limit]]
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.recent_traces.clear()
+
+
+tracer = Tracer()
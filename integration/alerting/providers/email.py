@@ -1,4 +1,5 @@
 from typing import Dict, List
+import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -20,6 +21,11 @@ class EmailProvider:
         body = self._format_alert_body(alert_data)
         message.attach(MIMEText(body, 'html'))
 
+        # smtplib blocks on the network; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._send_message, message)
+
+    def _send_message(self, message: MIMEMultipart):
         with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
             server.starttls()
             server.login(self.username, self.password)
@@ -6,6 +6,7 @@ class PagerDutyProvider:
     def __init__(self, config: Dict):
         self.api_key = config['api_key']
         self.service_id = config['service_id']
+        self.api_url = config.get('api_url', 'https://api.pagerduty.com/incidents')
 
     async def send_alert(self, alert_data: Dict):
         """Send alert to PagerDuty."""
@@ -32,7 +33,7 @@ class PagerDutyProvider:
 
         async with aiohttp.ClientSession() as session:
             async with session.post(
-                    'https://api.pagerduty.com/incidents',
+                    self.api_url,
                     json=payload,
                     headers=headers
             ) as response:
@@ -1,11 +1,23 @@
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import pandas as pd
+from core.storage.rollup_tiers import SERIES_FIELDS, TieredMetricStore, series_key
+from core.system.fleet_snapshot import SNAPSHOT_STATISTICS, FleetMonitor
+from core.utils.frames import build_metric_frame
 
 
 class DashboardClient:
-    def __init__(self, config: Dict):
+    """Dashboard reads over the ingest path's rollup store and fleet snapshot.
+
+    `metric_store` must be the store metrics are ingested into, such as
+    MonitoringController.metric_store, so charts see live data.
+    """
+
+    def __init__(self, config: Dict, metric_store: TieredMetricStore,
+                 fleet: Optional[FleetMonitor] = None):
         self.config = config
+        self.fleet = fleet
+        self.metric_store = metric_store
         self.cache = {}
 
     async def get_metrics_data(
@@ -14,8 +26,41 @@ class DashboardClient:
             metric_type: str,
             time_range: timedelta
     ) -> pd.DataFrame:
-        """Fetch metrics data for visualization."""
-        pass
+        """Fetch metrics data for visualization.
+
+        Reads the rollup tier that gives about `max_points` (default 500)
+        buckets over the range, so long ranges never touch raw points.
+        """
+        end_time = datetime.now()
+        series = self.metric_store.query(
+            series_key(api_name, metric_type),
+            end_time - time_range,
+            end_time,
+            max_points=self.config.get('max_points', 500)
+        )
+        frame = build_metric_frame(
+            series['timestamp'],
+            {name: series[name] for name in SERIES_FIELDS}
+        )
+        frame.attrs['tier'] = series['tier']
+        frame.attrs['resolution_seconds'] = series['resolution_seconds']
+        return frame
+
+    def get_fleet_overview(self, metric_type: str = 'latency') -> pd.DataFrame:
+        """One row per API with health, status and one metric's statistics.
+
+        Read from the fleet snapshot's arrays, so polling never recomputes.
+        """
+        snapshot = self.fleet.snapshot
+        column = self.fleet.buffer.column_ids[metric_type]
+        frame = pd.DataFrame({
+            'api_name': pd.Categorical(snapshot.api_names),
+            'health_score': snapshot.health,
+            'status': pd.Categorical(snapshot.status),
+            **{name: snapshot.statistics[name][:, column] for name in ('count',) + SNAPSHOT_STATISTICS}
+        })
+        frame.attrs['taken_at'] = snapshot.taken_at
+        return frame
 
     async def update_dashboard(self, new_data: Dict):
         """Update dashboard with new data."""
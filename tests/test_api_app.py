@@ -0,0 +1,202 @@
+# tests/test_api_app.py
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip('fastapi')
+testclient = pytest.importorskip('fastapi.testclient')
+
+API_KEY = 'test-key'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('SMART_API_KEY', API_KEY)
+    from api.main import app
+    with testclient.TestClient(app) as client:
+        client.headers.update({'X-API-Key': API_KEY})
+        yield client
+
+
+def test_post_body_reaches_handler_through_middleware(client):
+    response = client.post('/v1/monitoring/health/batch', json={'apis': ['payments', 'orders']})
+    assert response.status_code == 200
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record['api_name'] for record in records] == ['payments', 'orders']
+
+
+def test_ingest_streams_per_api_thresholds(client):
+    from api.routes.monitoring_routes import controller
+    start = datetime(2024, 1, 1, 12)
+    # Few points: the app's rate limiter allows 100 requests a minute per client
+    for i in range(20):
+        response = client.post('/v1/monitoring/metrics', json={
+            'api_name': 'ingest-api',
+            'timestamp': (start + timedelta(seconds=i)).isoformat(),
+            'latency': 100.0 + i % 10, 'error_rate': 0.01, 'traffic': 50
+        })
+        assert response.status_code == 200
+    analysis = response.json()
+    assert analysis['current_threshold'] > 0
+    assert analysis['details']['thresholds']['latency'] == analysis['current_threshold']
+    assert controller.hub.state['threshold:ingest-api.latency']['threshold'] > 0
+
+
+def test_invalid_body_is_validated_not_lost(client):
+    response = client.post('/v1/monitoring/health/batch', json={'apis': []})
+    assert response.status_code == 422
+
+
+def test_requests_need_the_configured_key(client):
+    response = client.get('/v1/monitoring/fleet', headers={'X-API-Key': 'wrong'})
+    assert response.status_code == 403
+
+
+def test_websocket_is_served_under_the_monitoring_prefix(client):
+    from api.routes.monitoring_routes import controller
+    controller.hub.publish('ws-api', {'status': 'healthy'})
+
+    subscribers = controller.hub.subscriber_count
+
+    with client.websocket_connect('/v1/monitoring/ws?apis=ws-api',
+                                  headers={'X-API-Key': API_KEY}) as websocket:
+        snapshot = json.loads(websocket.receive_text())
+        websocket.close()
+        # The endpoint unsubscribes once it sees the disconnect
+        deadline = time.monotonic() + 5
+        while controller.hub.subscriber_count > subscribers and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert snapshot == {'type': 'snapshot', 'apis': {'ws-api': {'status': 'healthy'}}}
+    assert controller.hub.subscriber_count == subscribers
+
+
+def _asgi_messages(app, method: str, path: str, query_string: bytes = b'',
+                   body: bytes = b'', done=lambda message: False):
+    """Messages the app sends for one raw ASGI request, up to the one `done` accepts.
+
+    TestClient buffers the whole response; the raw messages show whether
+    the body arrives in pieces.
+    """
+    async def exchange():
+        sent = asyncio.Queue()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            await asyncio.Event().wait()  # the client never disconnects
+
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': method, 'scheme': 'http', 'path': path,
+            'raw_path': path.encode(), 'root_path': '', 'query_string': query_string,
+            'headers': [(b'host', b'test'), (b'x-api-key', API_KEY.encode()),
+                        (b'content-type', b'application/json')],
+            'server': ('test', 80), 'client': ('127.0.0.1', 1234)
+        }
+        task = asyncio.ensure_future(app(scope, receive, sent.put))
+        messages = []
+        try:
+            while True:
+                message = await asyncio.wait_for(sent.get(), 5)
+                messages.append(message)
+                if done(message) or (message['type'] == 'http.response.body'
+                                     and not message.get('more_body', False)):
+                    return messages
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    # A private loop: the pinned TestClient still needs the thread's default one
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(exchange())
+    finally:
+        # Starlette 0.14 leaves the response's disconnect listener running
+        leftover = asyncio.all_tasks(loop)
+        for task in leftover:
+            task.cancel()
+        if leftover:
+            loop.run_until_complete(asyncio.wait(leftover))
+        loop.close()
+
+
+def _ndjson_batch(path: str, apis, query_string: bytes = b''):
+    """POST a batch query; returns the records and how many body pieces carried them."""
+    from api.main import app
+    messages = _asgi_messages(app, 'POST', path, query_string, json.dumps({'apis': apis}).encode())
+    start, bodies = messages[0], [m.get('body', b'') for m in messages[1:]]
+    assert start['status'] == 200
+    assert dict(start['headers'])[b'content-type'] == b'application/x-ndjson'
+    lines = b''.join(bodies).decode().splitlines()
+    return [json.loads(line) for line in lines], len([body for body in bodies if body])
+
+
+def test_health_batch_streams_ndjson(client):
+    records, pieces = _ndjson_batch('/v1/monitoring/health/batch', ['payments', 'orders'])
+    assert [record['api_name'] for record in records] == ['payments', 'orders']
+    assert pieces == len(records)
+
+
+def test_context_batch_streams_ndjson(client, monkeypatch):
+    from analysis.context.dependency_analyzer import Dependency, DependencyAnalyzer
+    from api.routes.context_routes import controller
+
+    class Collector:
+        # The business/user analyzers are not implemented yet
+        def collect_context(self, api_name, timestamp):
+            return {'collected_at': timestamp}
+
+    analyzer = DependencyAnalyzer()
+    analyzer.add_dependency(Dependency('checkout', 'payments', 0.9, 100.0, 0.01, datetime(2024, 1, 1)))
+    monkeypatch.setattr(controller, 'context_collector', Collector())
+    monkeypatch.setattr(controller, 'dependency_analyzer', analyzer)
+
+    records, pieces = _ndjson_batch('/v1/context/batch', ['check*', 'payments'])
+    by_name = {record['api_name']: record for record in records}
+    assert set(by_name) == {'checkout', 'payments'}
+    assert by_name['payments']['dependencies']['dependent_apis'] == ['checkout']
+    assert pieces == len(records)
+
+
+def test_trend_batch_streams_ndjson(client, monkeypatch, tmp_path):
+    pytest.importorskip('pyarrow')
+    import numpy as np
+    from api.routes.analysis_routes import controller
+    from core.calculators.partial_aggregates import PartialAggregate
+    from core.storage.history_store import HistoryStore, rollup_frame
+
+    store = HistoryStore(str(tmp_path))
+    now = int(time.time()) // 300 * 300
+    for api_name, level in [('payments', 100.0), ('orders', 50.0)]:
+        store.write_rollups(api_name, rollup_frame({
+            now - 300 * i: PartialAggregate.from_values(np.full(10, level)) for i in range(1, 4)
+        }))
+    monkeypatch.setattr(controller, 'history_store', store)
+
+    records, pieces = _ndjson_batch('/v1/analysis/trends/batch', ['*'], b'window_hours=2')
+    by_name = {record['api_name']: record for record in records}
+    assert set(by_name) == {'orders', 'payments'}
+    assert by_name['payments']['rollups'] == 3
+    assert by_name['payments']['mean'] == 100.0
+    assert by_name['orders']['window_hours'] == 2
+    assert pieces == len(records)
+
+
+def test_sse_stream_starts_with_a_snapshot(client):
+    from api.main import app
+    from api.routes.monitoring_routes import controller
+    controller.hub.publish('sse-api', {'health_score': 97.5})
+
+    start, event = _asgi_messages(
+        app, 'GET', '/v1/monitoring/stream', b'apis=sse-api',
+        done=lambda message: bool(message.get('body'))
+    )
+    assert start['status'] == 200
+    assert dict(start['headers'])[b'content-type'].startswith(b'text/event-stream')
+    assert event['body'].decode() == 'data: {"type":"snapshot","apis":{"sse-api":{"health_score":97.5}}}\n\n'
@@ -0,0 +1,59 @@
+# tests/test_batch_processor.py
+
+from datetime import datetime, timedelta
+import asyncio
+import numpy as np
+from core.processors.batch_processor import BatchProcessor
+from core.storage.time_series_data_mgmt import TimeSeriesManager
+
+CONFIG = {
+    'batch_window_hours': 3,
+    'batch_interval_seconds': 60,
+    'batch_chunk_seconds': 300,
+    'batch_detection': {'window': 30, 'min_segment': 30, 'threshold': 4.0}
+}
+
+
+def _manager(now: datetime, minutes: int = 150) -> TimeSeriesManager:
+    rng = np.random.default_rng(7)
+    values = 100 + rng.normal(0, 2, minutes)
+    values[minutes // 2:] += 40  # level shift
+    values[50] = 400  # isolated spike
+    manager = TimeSeriesManager()
+    for i, value in enumerate(values):
+        manager.add_point('payments', now - timedelta(minutes=minutes - i), float(value))
+    return manager
+
+
+def test_detection_is_stable_across_cycles():
+    now = datetime.now().replace(microsecond=0)
+    processor = BatchProcessor(CONFIG, _manager(now))
+
+    async def cycles():
+        first = await processor.process_batch('payments', now - timedelta(hours=3), now)
+        second = await processor.process_batch('payments', now - timedelta(hours=3), now)
+        return first['analysis_results'], second['analysis_results']
+
+    first, second = asyncio.run(cycles())
+    assert first['patterns']['points'] == 150
+    assert second['patterns'] == first['patterns']
+    assert second['anomalies'] == first['anomalies']
+    shift = now - timedelta(minutes=75)
+    assert any(point['time'] == shift for point in first['patterns']['changepoints'])
+    assert any(interval['peak_value'] == 400 for interval in first['anomalies'])
+    assert abs(second['metrics']['mean'] - first['metrics']['mean']) < 1e-9
+
+
+def test_window_keeps_points_seen_in_earlier_cycles():
+    now = datetime.now().replace(microsecond=0)
+    manager = _manager(now - timedelta(minutes=30), minutes=120)
+    processor = BatchProcessor(CONFIG, manager)
+
+    async def cycles():
+        await processor.process_batch('payments', now - timedelta(hours=3), now)
+        for i in range(30):
+            manager.add_point('payments', now - timedelta(minutes=29 - i), 140.0)
+        return await processor.process_batch('payments', now - timedelta(hours=3), now)
+
+    result = asyncio.run(cycles())
+    assert result['analysis_results']['patterns']['points'] == 150
@@ -0,0 +1,86 @@
+# tests/test_broadcast_hub.py
+
+import asyncio
+import json
+import pytest
+from core.processors.threshold_processor import StreamProcessor, threshold_key
+from core.system.broadcast_hub import BroadcastHub
+
+
+def _drain(subscription):
+    messages = []
+    while not subscription.queue.empty():
+        message = subscription.queue.get_nowait()
+        messages.append(None if message is None else json.loads(message))
+    return messages
+
+
+def test_subscribe_gets_snapshot_then_deltas():
+    async def run():
+        hub = BroadcastHub()
+        hub.publish('payments', {'health_score': 95.0, 'status': 'healthy'})
+        payments = hub.subscribe(['payments'])
+        everything = hub.subscribe()
+        hub.publish('payments', {'health_score': 95.0, 'status': 'warning'})
+        hub.publish('orders', {'is_spike': True})
+        return hub, _drain(payments), _drain(everything)
+
+    hub, payments, everything = asyncio.run(run())
+    assert payments == [
+        {'type': 'snapshot', 'apis': {'payments': {'health_score': 95.0, 'status': 'healthy'}}},
+        {'type': 'delta', 'api': 'payments', 'changes': {'status': 'warning'}}
+    ]
+    assert [message['type'] for message in everything] == ['snapshot', 'delta', 'delta']
+    assert hub.subscriber_count == 2
+
+
+def test_nan_fields_are_sent_once_as_null():
+    async def run():
+        hub = BroadcastHub()
+        subscription = hub.subscribe(['payments'])
+        for _ in range(3):
+            hub.publish('payments', {'health_score': float('nan')})
+        return hub, _drain(subscription)
+
+    hub, messages = asyncio.run(run())
+    assert messages[1:] == [{'type': 'delta', 'api': 'payments', 'changes': {'health_score': None}}]
+    assert hub.published == 1
+
+
+def test_slow_subscriber_is_dropped_and_uncounted():
+    async def run():
+        hub = BroadcastHub(queue_size=3)
+        slow = hub.subscribe(['payments', 'orders'])
+        fast = hub.subscribe(['orders'])
+        for score in range(5):
+            hub.publish('payments', {'health_score': float(score)})
+            _drain(fast)
+        hub.unsubscribe(slow)
+        return hub, slow
+
+    hub, slow = asyncio.run(run())
+    assert slow.closed and slow.close_reason == 'slow consumer'
+    assert hub.dropped == 1
+    assert hub.subscriber_count == 1
+    assert hub.stats()['subscribers'] == 1
+
+
+def test_empty_api_set_is_rejected_and_unsubscribe_always_counts():
+    async def run():
+        hub = BroadcastHub(max_subscribers=1)
+        with pytest.raises(ValueError):
+            hub.subscribe([])
+        subscription = hub.subscribe(['payments'])
+        hub.unsubscribe(subscription)
+        hub.unsubscribe(subscription)
+        return hub
+
+    hub = asyncio.run(run())
+    assert hub.subscriber_count == 0
+
+
+def test_threshold_updates_use_their_own_key():
+    hub = BroadcastHub()
+    processor = StreamProcessor(hub=hub)
+    processor._handle_threshold_update('response_time', 250.0)
+    assert hub.state == {threshold_key('response_time'): {'threshold': 250.0}}
@@ -0,0 +1,54 @@
+# tests/test_compressed_chunks.py
+
+import numpy as np
+import pytest
+from core.storage.compressed_chunks import CompressedChunk, CompressedSeries
+
+
+def _roundtrip(timestamps: np.ndarray, values: np.ndarray):
+    decoded_timestamps, decoded_values = CompressedChunk.encode(timestamps, values).decode()
+    np.testing.assert_array_equal(decoded_timestamps, timestamps)
+    # Bit-exact, so NaN, infinities and signed zeros survive too
+    np.testing.assert_array_equal(decoded_values.view(np.int64), values.view(np.int64))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_chunk_roundtrip_irregular(seed):
+    rng = np.random.default_rng(seed)
+    timestamps = 1_700_000_000_000_000 + np.cumsum(rng.integers(0, 5_000_000, 2000))
+    values = rng.normal(100, 30, 2000).round(rng.integers(0, 6))
+    _roundtrip(timestamps.astype(np.int64), values)
+
+
+def test_chunk_roundtrip_edge_values():
+    timestamps = np.array([-2 ** 62, 0, 1, 1, 2 ** 40, 2 ** 62], dtype=np.int64)
+    values = np.array([np.nan, np.inf, -np.inf, -0.0, 0.0, 5e-324])
+    _roundtrip(timestamps, values)
+    _roundtrip(timestamps[:1], values[:1])
+
+
+def test_regular_series_compresses():
+    timestamps = 1_700_000_000_000_000 + np.arange(1024, dtype=np.int64) * 1_000_000
+    values = np.full(1024, 42.0)
+    chunk = CompressedChunk.encode(timestamps, values)
+    assert chunk.nbytes < 1024 * 16 / 20
+    _roundtrip(timestamps, values)
+
+
+def test_series_range_spans_chunks_and_head():
+    series = CompressedSeries(chunk_size=100)
+    timestamps = np.arange(250, dtype=np.int64) * 1000
+    values = np.arange(250, dtype=np.float64)
+    series.extend(timestamps[:120], values[:120])
+    for t, v in zip(timestamps[120:], values[120:]):
+        series.append(int(t), float(v))
+    assert len(series) == 250
+    assert len(series.chunks) == 2
+
+    ts, vs = series.to_arrays(95_000, 205_000)
+    np.testing.assert_array_equal(ts, timestamps[95:206])
+    np.testing.assert_array_equal(vs, values[95:206])
+
+    series.evict_before(150_000)
+    assert len(series.chunks) == 1
+    assert series.to_arrays()[0][0] == 100_000
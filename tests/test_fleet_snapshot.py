@@ -0,0 +1,33 @@
+# tests/test_fleet_snapshot.py
+
+import json
+import numpy as np
+from core.storage.metric_buffer_mgmt import MetricBuffer
+from core.system.fleet_snapshot import DEFAULT_WEIGHTS, build_fleet_snapshot, health_scores
+
+
+def test_missing_error_rate_is_left_out_of_health():
+    nan = np.array([np.nan])
+    health = health_scores(
+        latency_p95=np.array([400.0]),
+        error_mean=nan,
+        traffic_mean=np.array([100.0]),
+        expected_latency=np.array([200.0]),
+        error_threshold=np.array([0.01]),
+        baseline_traffic=np.array([100.0]),
+        weights=DEFAULT_WEIGHTS
+    )
+    # latency scores 0.5 and traffic 1.0, reweighted 0.4 : 0.3 without error rate
+    np.testing.assert_allclose(health, [100 * (0.4 * 0.5 + 0.3 * 1.0) / 0.7])
+
+
+def test_snapshot_of_api_without_error_rate():
+    buffer = MetricBuffer(max_size=10, initial_apis=1)
+    buffer.add_metric('orders', {'latency': 80.0, 'traffic': 5.0})
+    buffer.add_metric('payments', {'latency': 80.0, 'error_rate': 0.0})
+
+    snapshot = build_fleet_snapshot(buffer)
+    assert snapshot.api('orders')['health_score'] is None
+    assert snapshot.api('orders')['status'] == 'unknown'
+    assert snapshot.api('payments')['health_score'] == 100.0
+    assert json.loads(snapshot.body)['status_counts']['unknown'] == 1
@@ -0,0 +1,57 @@
+# tests/test_frames.py
+
+from datetime import datetime, timedelta
+import time
+import numpy as np
+import pandas as pd
+from core.utils.frames import (
+    ColumnarBuffer, build_metric_frame, frame_datetimes, local_epoch_seconds, local_wall_seconds
+)
+
+
+def test_frame_datetimes_are_local_wall_clock():
+    buffer = ColumnarBuffer(capacity=4)
+    # Hourly across the 2024 DST start in Europe and the US
+    start = datetime(2024, 3, 9, 22, 15, 30, 250000).timestamp()
+    timestamps = [datetime.fromtimestamp(start + i * 3600) for i in range(24 * 23)]
+    for i, timestamp in enumerate(timestamps):
+        buffer.append(timestamp, float(i))
+    frame = buffer.frame()
+    assert frame_datetimes(frame).dt.to_pydatetime().tolist() == timestamps
+    assert frame['value'].dtype == np.float32
+
+
+def test_keep_float64_columns():
+    frame = build_metric_frame(np.array([0.0, 60.0]), {'a': np.ones(2), 'b': np.ones(2)},
+                               keep_float64=['b'])
+    assert frame['a'].dtype == np.float32
+    assert frame['b'].dtype == np.float64
+    assert frame['timestamp'].tolist() == [0, 60_000_000_000]
+
+
+def test_local_epoch_seconds_inverts_wall_clock(monkeypatch):
+    monkeypatch.setenv('TZ', 'Europe/Berlin')
+    time.tzset()
+    try:
+        # Every 10 minutes across the 2024 spring and autumn DST changes
+        moments = [datetime(2024, 3, 30) + timedelta(minutes=10 * i) for i in range(6 * 72)]
+        moments += [datetime(2024, 10, 26) + timedelta(minutes=10 * i) for i in range(6 * 72)]
+        # Skip the readings that do not exist or are ambiguous
+        moments = [m for m in moments if datetime.fromtimestamp(m.timestamp()) == m
+                   and m.replace(fold=1).timestamp() == m.timestamp()]
+        wall = np.array([(m - datetime(1970, 1, 1)).total_seconds() for m in moments])
+        expected = np.array([m.timestamp() for m in moments])
+        np.testing.assert_array_equal(local_epoch_seconds(wall), expected)
+        np.testing.assert_array_equal(local_wall_seconds(expected), wall)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_categories_are_stored_as_categoricals():
+    sources = ['payments', 'orders', 'payments']
+    frame = build_metric_frame(np.array([0.0, 0.0, 60.0]), {'response_time': np.ones(3)},
+                               categories={'api_source': sources})
+    assert isinstance(frame['api_source'].dtype, pd.CategoricalDtype)
+    assert frame['api_source'].tolist() == sources
+    assert list(frame['api_source'].cat.categories) == ['orders', 'payments']
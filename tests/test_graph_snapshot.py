@@ -0,0 +1,53 @@
+# tests/test_graph_snapshot.py
+
+import asyncio
+from datetime import datetime
+import numpy as np
+import pytest
+from analysis.context.dependency_analyzer import Dependency, DependencyAnalyzer
+
+
+def _analyzer(edges):
+    analyzer = DependencyAnalyzer()
+    for source, target, criticality in edges:
+        analyzer.add_dependency(Dependency(source, target, criticality, 100.0, 0.01, datetime(2024, 1, 1)))
+    return analyzer
+
+
+def test_dependents_match_impact_index():
+    rng = np.random.default_rng(6)
+    names = [f"api-{i}" for i in range(25)]
+    edges = {(names[a], names[b], float(rng.random()))
+             for a, b in rng.integers(0, len(names), (60, 2)) if a != b}
+    analyzer = _analyzer(sorted(edges))
+    snapshot = analyzer.get_snapshot()
+
+    for name in snapshot.node_names:
+        assert set(snapshot.get_dependent_apis(name)) == set(analyzer.get_dependent_apis(name))
+    assert snapshot.get_dependent_apis('unknown') == []
+
+
+def test_context_batch_reads_one_snapshot():
+    pytest.importorskip('fastapi')
+    from api.controllers.context_controller import ContextController
+
+    class Collector:
+        # The business/user analyzers are not implemented yet
+        def collect_context(self, api_name, timestamp):
+            return {'collected_at': timestamp}
+
+    controller = ContextController()
+    controller.context_collector = Collector()
+    controller.dependency_analyzer = _analyzer([('checkout', 'payments', 0.9)])
+    records = controller.get_api_context_batch(['payments', 'checkout'])
+    # Changes after the batch started are not seen by it
+    controller.dependency_analyzer.add_dependency(
+        Dependency('orders', 'payments', 0.5, 10.0, 0.0, datetime(2024, 1, 1))
+    )
+
+    async def collect():
+        return [record async for record in records]
+
+    by_name = {record['api_name']: record for record in asyncio.run(collect())}
+    assert by_name['payments']['dependencies']['dependent_apis'] == ['checkout']
+    assert by_name['checkout']['dependencies']['critical_path'] == ['checkout', 'payments']
@@ -0,0 +1,30 @@
+# tests/test_history_store.py
+
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from core.calculators.partial_aggregates import PartialAggregate
+from core.storage.history_store import HistoryStore, rollup_frame
+
+pa = pytest.importorskip('pyarrow')
+
+
+def _rollups(start: datetime, values: np.ndarray):
+    chunk = int(start.timestamp()) // 300 * 300
+    return {chunk: PartialAggregate.from_values(values)}
+
+
+def test_rollups_keep_float64_schema_across_appends(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    start = datetime(2024, 1, 1, 12)
+    small = rollup_frame(_rollups(start, np.array([1.0, 2.0, 3.0])))
+    large = rollup_frame(_rollups(start + timedelta(minutes=5), np.array([1e6, 2e6])))
+    assert small['mean'].dtype == np.float64
+    store.write_rollups('payments', small)
+    store.write_rollups('payments', large)
+
+    table = store.query('payments', start - timedelta(hours=1), start + timedelta(hours=1))
+    assert table.num_rows == 2
+    assert table.schema.field('mean').type == pa.float64()
+    assert table.column('count').to_pylist() == [3, 2]
+    assert table.column('max').to_pylist() == [3.0, 2e6]
@@ -0,0 +1,37 @@
+# tests/test_metric_buffer.py
+
+import numpy as np
+from core.storage.metric_buffer_mgmt import MetricBuffer
+
+
+def test_statistics_match_numpy_after_wrap():
+    rng = np.random.default_rng(3)
+    buffer = MetricBuffer(max_size=100, initial_apis=1)
+    latency = rng.gamma(4, 30, 250)
+    for start in range(0, 250, 37):
+        buffer.add_batch('payments', {'latency': latency[start:start + 37]})
+    buffer.add_metric('orders', {'latency': 10.0, 'error_rate': None})
+
+    stats = buffer.get_statistics('payments', 'latency')
+    live = latency[-100:]
+    assert stats['count'] == 100 and isinstance(stats['count'], int)
+    np.testing.assert_allclose(stats['mean'], live.mean())
+    np.testing.assert_allclose(stats['std'], live.std())
+    np.testing.assert_allclose(stats['p95'], np.percentile(live, 95))
+    assert stats['min'] == live.min() and stats['max'] == live.max()
+    assert buffer.get_statistics('payments', 'traffic') == {}
+
+
+def test_all_statistics_skip_missing_columns():
+    rng = np.random.default_rng(4)
+    buffer = MetricBuffer(max_size=50, initial_apis=1)
+    records = [{'latency': float(v), 'error_rate': 0.01} for v in rng.normal(200, 20, 30)]
+    buffer.add_metric_batch('payments', records)
+    buffer.add_metric('orders', {'traffic': 5.0})
+
+    everything = buffer.get_all_statistics()
+    assert set(everything['payments']) == {'latency', 'error_rate'}
+    assert set(everything['orders']) == {'traffic'}
+    latencies = np.array([record['latency'] for record in records])
+    np.testing.assert_allclose(everything['payments']['latency']['p95'], np.percentile(latencies, 95))
+    assert everything['orders']['traffic']['count'] == 1
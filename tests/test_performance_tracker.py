@@ -0,0 +1,77 @@
+# tests/test_performance_tracker.py
+
+from analysis.ml_models.performance_monitor import ModelPerformanceMonitor
+from analysis.ml_models.performance_tracker import PerformanceTracker
+from analysis.ml_models.registry import ModelRegistry
+
+
+def _tracker(**retraining):
+    config = {'performance_monitoring': {'retraining': {'min_samples': 5, **retraining}}}
+    tracker = PerformanceTracker(config)
+    for _ in range(10):
+        tracker.update('prophet', 100.0, 50.0)
+    return tracker
+
+
+def test_cooldown_does_not_follow_save_interval():
+    tracker = PerformanceTracker({'model_registry': {'performance_tracking': {'save_interval': 5}}})
+    assert tracker.cooldown_seconds != tracker.save_interval
+
+
+def test_retrain_triggers_once_until_cooldown():
+    tracker = _tracker(cooldown_seconds=60, timeout_seconds=600)
+    assert tracker.should_retrain('prophet', now=0.0)
+    tracker.mark_retraining('prophet', now=0.0)
+    tracker.mark_retrained('prophet')
+    for _ in range(10):
+        tracker.update('prophet', 100.0, 50.0)
+    assert not tracker.should_retrain('prophet', now=30.0)
+    assert tracker.should_retrain('prophet', now=61.0)
+
+
+def test_failed_retrain_clears_in_progress():
+    tracker = _tracker(cooldown_seconds=60)
+    tracker.mark_retraining('prophet', now=0.0)
+    assert not tracker.should_retrain('prophet', now=120.0)
+    tracker.mark_retrain_failed('prophet')
+    assert tracker.should_retrain('prophet', now=120.0)
+
+
+def test_stuck_retrain_times_out():
+    tracker = _tracker(cooldown_seconds=60, timeout_seconds=600)
+    tracker.mark_retraining('prophet', now=0.0)
+    assert not tracker.should_retrain('prophet', now=300.0)
+    assert tracker.should_retrain('prophet', now=601.0)
+    assert not tracker.retraining_in_progress['prophet']
+
+
+def test_samples_since_retrain_survive_a_restart(tmp_path):
+    config = {'performance_monitoring': {'retraining': {'min_samples': 5}}}
+    state_file = str(tmp_path / 'performance.json')
+    tracker = PerformanceTracker(config, state_file)
+    for _ in range(10):
+        tracker.update('prophet', 100.0, 50.0)
+    tracker.mark_retraining('prophet', now=0.0)
+    tracker.mark_retrained('prophet')
+    for _ in range(3):
+        tracker.update('prophet', 100.0, 50.0)
+    tracker.save()
+
+    restored = PerformanceTracker(config, state_file)
+    assert restored.stats['prophet'].samples_since_retrain == 3
+    assert restored.stats['prophet'].total_count == 13
+    assert not restored.should_retrain('prophet', now=0.0)
+
+
+def test_retraining_queue_is_drained_on_completion_and_failure():
+    monitor = ModelPerformanceMonitor(
+        ModelRegistry(), {'performance_monitoring': {'retraining': {'min_samples': 5}}}
+    )
+    for _ in range(10):
+        monitor.update_model_performance('prophet', 100.0, 50.0)
+        monitor.update_model_performance('arima', 100.0, 50.0)
+    assert monitor.retraining_queue == ['prophet', 'arima']
+
+    monitor.complete_model_retraining('prophet')
+    monitor.fail_model_retraining('arima')
+    assert monitor.retraining_queue == []
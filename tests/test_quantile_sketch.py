@@ -0,0 +1,64 @@
+# tests/test_quantile_sketch.py
+
+import numpy as np
+import pytest
+from core.calculators.quantile_sketch import QuantileSketch
+
+QS = [0.0, 0.01, 0.25, 0.5, 0.9, 0.95, 0.99, 0.999, 1.0]
+
+
+def _within_accuracy(sketch: QuantileSketch, values: np.ndarray):
+    # The sketch ranks like numpy's 'lower' method: the value at floor(q * (n - 1))
+    expected = np.percentile(values, np.array(QS) * 100, method='lower')
+    estimates = np.array(sketch.quantiles(QS))
+    np.testing.assert_array_less(np.abs(estimates - expected),
+                                 sketch.relative_accuracy * expected + 1e-12)
+
+
+@pytest.mark.parametrize('relative_accuracy', [0.01, 0.05])
+def test_quantiles_stay_within_relative_accuracy(relative_accuracy):
+    rng = np.random.default_rng(11)
+    values = np.concatenate([rng.lognormal(4, 1.5, 20_000), rng.pareto(1.5, 5_000) * 50 + 1])
+    vectorized = QuantileSketch(relative_accuracy)
+    vectorized.add_values(values)
+    one_by_one = QuantileSketch(relative_accuracy)
+    for value in values[:5_000].tolist():
+        one_by_one.add(value)
+
+    _within_accuracy(vectorized, values)
+    _within_accuracy(one_by_one, values[:5_000])
+
+
+def test_merge_matches_a_single_sketch():
+    rng = np.random.default_rng(12)
+    values = rng.gamma(2.0, 40.0, 10_000)
+    values[:100] = 0.0
+    whole = QuantileSketch()
+    whole.add_values(values)
+    left, right = QuantileSketch(), QuantileSketch()
+    left.add_values(values[:3_000])
+    right.add_values(values[3_000:])
+    left.merge(right)
+
+    assert left.bins == whole.bins
+    assert (left.count, left.zero_count, left.min, left.max) == \
+        (whole.count, whole.zero_count, whole.min, whole.max)
+    assert left.quantiles(QS) == whole.quantiles(QS)
+    _within_accuracy(left, values)
+
+    with pytest.raises(ValueError):
+        left.merge(QuantileSketch(0.05))
+
+
+def test_scale_down_weights_old_values():
+    sketch = QuantileSketch()
+    sketch.add_values(np.full(900, 10.0))
+    before = sketch.quantiles(QS)
+    sketch.scale(0.5)
+    assert sketch.count == 450
+    assert sketch.quantiles(QS) == before
+
+    # 450 weighted old values against 550 new ones: the median moves to the new level
+    sketch.add_values(np.full(550, 1000.0))
+    assert sketch.quantile(0.5) == pytest.approx(1000.0, rel=sketch.relative_accuracy)
+    assert sketch.quantile(0.4) == pytest.approx(10.0, rel=sketch.relative_accuracy)
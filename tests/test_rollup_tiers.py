@@ -0,0 +1,63 @@
+# tests/test_rollup_tiers.py
+
+from datetime import datetime, timedelta
+import asyncio
+import numpy as np
+from core.storage.rollup_tiers import RollupTier, TieredMetricStore, series_key
+from core.storage.time_series_data_mgmt import TimeSeriesManager
+from integration.visualizations.dashboard_client import DashboardClient
+
+TIERS = [
+    RollupTier('1m', 60, timedelta(hours=2)),
+    RollupTier('5m', 300, timedelta(hours=12)),
+    RollupTier('1h', 3600, timedelta(days=7))
+]
+
+
+def _store(now: datetime, hours: int = 48) -> TieredMetricStore:
+    store = TieredMetricStore(TIERS)
+    epoch = now.timestamp() - np.arange(hours * 60)[::-1] * 60.0
+    store.add_points('payments.latency', epoch, np.full(epoch.size, 100.0))
+    return store
+
+
+def test_query_routes_to_coarsest_fitting_tier():
+    now = datetime(2024, 1, 8, 12)
+    store = _store(now)
+    assert store.query('payments.latency', now - timedelta(hours=1), now)['tier'] == '1m'
+    assert store.query('payments.latency', now - timedelta(hours=10), now)['tier'] == '5m'
+    day = store.query('payments.latency', now - timedelta(days=2), now)
+    assert day['tier'] == '1h'
+    assert day['resolution_seconds'] == 3600
+    assert (day['mean'] == 100.0).all()
+    fine = store.query('payments.latency', now - timedelta(hours=10), now, resolution_seconds=60)
+    assert fine['tier'] == '5m'
+
+
+def test_late_points_past_retention_are_evicted():
+    now = datetime(2024, 1, 8, 12)
+    store = _store(now, hours=1)
+    late = now.timestamp() - 3 * 3600
+    store.add_points('payments.latency', np.array([late]), np.array([500.0]))
+    assert store.bucket_counts('payments.latency')['1m'] == 60
+
+    # A late point still inside retention, then enough new data to expire it
+    store.add_points('payments.latency', np.array([now.timestamp() - 90 * 60]), np.array([1.0]))
+    store.add_points('payments.latency', np.array([now.timestamp() + 3600]), np.array([1.0]))
+    assert min(store.buckets['payments.latency'][0]) > now.timestamp() + 3600 - 2 * 3600 - 60
+
+
+def test_ingest_and_dashboard_share_series_keys():
+    store = TieredMetricStore(TIERS)
+    manager = TimeSeriesManager(rollups=store, metric_type='latency')
+    now = datetime.now().replace(microsecond=0)
+    for minute in range(30):
+        manager.add_point('payments', now - timedelta(minutes=minute), 120.0)
+    store.add_metrics('payments', now, {'error_rate': 0.02, 'traffic': None})
+
+    client = DashboardClient({}, store)
+    frame = asyncio.run(client.get_metrics_data('payments', 'latency', timedelta(hours=1)))
+    assert frame['count'].sum() == 30
+    errors = asyncio.run(client.get_metrics_data('payments', 'error_rate', timedelta(hours=1)))
+    assert errors['count'].sum() == 1
+    assert series_key('payments', 'traffic') not in store.buckets
@@ -0,0 +1,71 @@
+# tests/test_seasonal_profile.py
+
+from datetime import datetime, timedelta
+import asyncio
+import numpy as np
+import pytest
+from analysis.ml_models.seasonality_analyzer import SeasonalityAnalyzer
+from core.calculators.seasonal_profile import HOURS_PER_WEEK, SeasonalProfile, hour_of_week
+from core.processors.threshold_processor import SeasonalBaseline
+
+WEEK_SECONDS = 7 * 86400
+# Monday 2024-01-01 00:00, as wall-clock epoch seconds
+MONDAY = 1704067200
+
+
+def _weeks(profile, levels):
+    for week, level in enumerate(levels):
+        epoch = MONDAY + week * WEEK_SECONDS + np.arange(0, WEEK_SECONDS, 600)
+        profile.add_points(np.full(epoch.size, float(level)), epoch)
+
+
+def test_hour_of_week_starts_monday():
+    epoch = np.array([MONDAY, MONDAY + 3600, MONDAY + WEEK_SECONDS - 1])
+    assert hour_of_week(epoch).tolist() == [0, 1, HOURS_PER_WEEK - 1]
+
+
+def test_profile_without_decay_averages_all_weeks():
+    profile = SeasonalProfile()
+    _weeks(profile, [100] * 4 + [200] * 4)
+    np.testing.assert_allclose(profile.means, 150.0)
+
+
+def test_profile_decay_follows_level_shift():
+    profile = SeasonalProfile(half_life_weeks=1)
+    _weeks(profile, [100] * 4 + [200] * 4)
+    assert (profile.means > 190).all()
+
+
+def test_baseline_sketches_decay_with_moments():
+    baseline = SeasonalBaseline(half_life_weeks=1)
+    _weeks(baseline, [100] * 4 + [200] * 4)
+    stats = baseline.get_slot_statistics(datetime(2024, 2, 19, 10) + timedelta(minutes=5))
+    assert stats['mean'] > 190
+    assert abs(stats['p95'] - 200) < 200 * 0.02
+    assert baseline.get_overall_statistics()['count'] < 8 * 1008
+
+
+def test_overlapping_analysis_windows_count_points_once():
+    rng = np.random.default_rng(3)
+    epoch = MONDAY + np.arange(0, 4 * WEEK_SECONDS, 3600)
+    values = 100 + 20 * np.sin(2 * np.pi * (epoch % 86400) / 86400) + rng.normal(0, 1, epoch.size)
+    config = {'min_pattern_confidence': 0.0}
+
+    async def analyze(windows):
+        analyzer = SeasonalityAnalyzer(config)
+        for start, end in windows:
+            result = await analyzer.analyze_seasonality(values[start:end], epoch[start:end])
+        return analyzer, result
+
+    # Three-week windows sliding by one week, against one pass over all four weeks
+    week = WEEK_SECONDS // 3600
+    sliding, sliding_result = asyncio.run(analyze([(0, 3 * week), (week, 4 * week)]))
+    single, single_result = asyncio.run(analyze([(0, 4 * week)]))
+    np.testing.assert_allclose(sliding.profile.counts, single.profile.counts)
+    np.testing.assert_allclose(sliding.profile.means, single.profile.means)
+    assert sliding_result['patterns']['weekly'] == single_result['patterns']['weekly']
+    for period, unit in [('hourly', 'hour'), ('daily', 'day')]:
+        pattern, expected = sliding_result['patterns'][period], single_result['patterns'][period]
+        assert pattern['means'] == pytest.approx(expected['means'])
+        assert pattern[f'peak_{unit}'] == expected[f'peak_{unit}']
+    assert sliding_result['confidences'] == pytest.approx(single_result['confidences'])
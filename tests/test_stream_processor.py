@@ -0,0 +1,66 @@
+# tests/test_stream_processor.py
+
+import asyncio
+from datetime import datetime, timedelta
+import numpy as np
+from core.processors.stream_processor import StreamProcessor
+from core.storage.metric_buffer_mgmt import MetricBuffer
+from core.system.broadcast_hub import BroadcastHub
+
+
+def _event(timestamp, traffic, latency=100.0, error_rate=0.001):
+    return {
+        'timestamp': timestamp,
+        'metrics': {'latency': latency, 'error_rate': error_rate, 'traffic': traffic}
+    }
+
+
+def test_scores_health_and_flags_traffic_spikes():
+    processor = StreamProcessor({
+        'default_contexts': {
+            'payments': {'criticality': 1.0, 'business_impact': 1.0, 'baseline_traffic': 100.0,
+                         'expected_latency': 200.0, 'error_threshold': 0.01}
+        }
+    })
+    rng = np.random.default_rng(5)
+    start = datetime(2024, 1, 1)
+
+    async def run():
+        results = [
+            await processor.process_metric('payments', _event(start + timedelta(seconds=i), traffic))
+            for i, traffic in enumerate(rng.normal(100, 5, 40))
+        ]
+        results.append(await processor.process_metric(
+            'payments', _event(start + timedelta(seconds=40), 500.0, latency=800.0)
+        ))
+        return results
+
+    results = asyncio.run(run())
+    assert not any(result['is_spike'] for result in results[:-1])
+    assert results[-1]['is_spike']
+    assert results[-1]['health_score'] < results[0]['health_score']
+    assert processor.metric_buffer.get_statistics('payments', 'health_score')['count'] == 41
+
+
+def test_health_without_context_uses_error_rate_only():
+    processor = StreamProcessor({})
+    assert processor.calculate_health_score('orders', {'latency': 50.0, 'error_rate': 0.0, 'traffic': 9.0}) == 100.0
+    assert processor.calculate_health_score('orders', {'latency': 50.0, 'error_rate': 0.02, 'traffic': 9.0}) == 50.0
+    assert not processor.detect_spike('orders', {'traffic': 1e9})
+
+
+def test_shares_buffer_and_streams_spikes_only():
+    hub = BroadcastHub()
+    buffer = MetricBuffer(max_size=100, initial_apis=1)
+    processor = StreamProcessor({'spike_detection': {'window_size': 5, 'threshold_multiplier': 2.0}},
+                                hub=hub, metric_buffer=buffer)
+    start = datetime(2024, 1, 1)
+
+    async def run():
+        for i, traffic in enumerate([10.0, 11.0, 9.0, 10.0, 10.0, 50.0]):
+            await processor.process_metric('orders', _event(start + timedelta(seconds=i), traffic))
+
+    asyncio.run(run())
+    assert buffer.get_statistics('orders', 'traffic')['count'] == 6
+    assert hub.state == {'orders': {'is_spike': True}}
+    assert not processor.processing_queues
@@ -0,0 +1,46 @@
+# tests/test_threshold_processor.py
+
+import numpy as np
+from datetime import datetime, timedelta
+from core.processors.threshold_processor import RealTimeMonitor, threshold_key
+from core.system.broadcast_hub import BroadcastHub
+
+
+def test_log_batch_records_trend():
+    monitor = RealTimeMonitor()
+    epoch = 1704067200 + np.arange(120, dtype=np.float64) * 30
+    monitor.process_log_batch(epoch, {'response_time': 100 + (epoch - epoch[0]) / 3600 * 2})
+    trend = monitor.trends['response_time']
+    assert trend['points'] == 120
+    assert abs(trend['slope_per_hour'] - 2.0) < 1e-9
+    assert trend['end_time'] == datetime(2024, 1, 1) + timedelta(seconds=119 * 30)
+
+
+def test_buffered_entries_record_trend():
+    monitor = RealTimeMonitor()
+    start = datetime(2024, 1, 1, 12)
+    for i in range(100):
+        timestamp = start + timedelta(minutes=i)
+        monitor.process_log_entry({
+            'timestamp': timestamp.timestamp(),
+            'response_time': 100.0 + i,
+            'error_rate': 0.01,
+            'event_count': 10
+        })
+    assert not monitor.metric_buffers['response_time']
+    assert abs(monitor.trends['response_time']['slope_per_hour'] - 60.0) < 1e-6
+    assert monitor.trends['response_time']['end_time'] == start + timedelta(minutes=99)
+
+
+def test_api_metrics_publish_thresholds_per_api():
+    hub = BroadcastHub()
+    monitor = RealTimeMonitor(hub=hub)
+    start = datetime(2024, 1, 1, 12)
+    for i in range(100):
+        thresholds = monitor.process_api_metrics('payments', start + timedelta(seconds=i), {
+            'latency': 100.0 + i % 10, 'error_rate': None
+        })
+    assert set(thresholds) == {'latency'}
+    assert thresholds['latency'] > 0
+    assert hub.state[threshold_key('payments.latency')] == {'threshold': thresholds['latency']}
+    assert threshold_key('orders.latency') not in hub.state